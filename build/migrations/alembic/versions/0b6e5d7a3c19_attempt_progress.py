@@ -0,0 +1,33 @@
+"""attempt progress
+
+Revision ID: 0b6e5d7a3c19
+Revises: 7f4d2c81b9a5
+Create Date: 2026-10-17 03:12:26.730418
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0b6e5d7a3c19'
+down_revision: Union[str, Sequence[str], None] = '7f4d2c81b9a5'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('attempts', sa.Column('passed_count', sa.Integer(), server_default='0', nullable=False))
+    op.add_column('attempts', sa.Column('mismatched', postgresql.ARRAY(sa.Integer()), server_default='{}', nullable=False))
+    op.add_column('attempts', sa.Column('missing', postgresql.ARRAY(sa.Integer()), server_default='{}', nullable=False))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('attempts', 'missing')
+    op.drop_column('attempts', 'mismatched')
+    op.drop_column('attempts', 'passed_count')
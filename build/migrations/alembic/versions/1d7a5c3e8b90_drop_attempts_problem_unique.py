@@ -0,0 +1,27 @@
+"""drop attempts problem unique
+
+Revision ID: 1d7a5c3e8b90
+Revises: 9bdc326ee4c2
+Create Date: 2026-10-17 03:01:48.305917
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '1d7a5c3e8b90'
+down_revision: Union[str, Sequence[str], None] = '9bdc326ee4c2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.drop_constraint('attempts_problem_id_key', 'attempts', type_='unique')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.create_unique_constraint('attempts_problem_id_key', 'attempts', ['problem_id'])
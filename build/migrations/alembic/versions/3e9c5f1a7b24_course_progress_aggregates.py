@@ -0,0 +1,59 @@
+"""course progress aggregates
+
+Revision ID: 3e9c5f1a7b24
+Revises: f2b8d41c7e63
+Create Date: 2026-10-17 05:11:48.203617
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3e9c5f1a7b24'
+down_revision: Union[str, Sequence[str], None] = 'f2b8d41c7e63'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('attempts', sa.Column('solved', sa.Boolean(), server_default=sa.false(), nullable=False))
+    op.create_table(
+        'course_student_progress',
+        sa.Column('course_id', sa.Integer(), nullable=False),
+        sa.Column('student_id', sa.Integer(), nullable=False),
+        sa.Column('solved', sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(['course_id'], ['courses.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['student_id'], ['users.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('course_id', 'student_id')
+    )
+    op.create_table(
+        'problem_progress',
+        sa.Column('problem_id', sa.Integer(), nullable=False),
+        sa.Column('attempted', sa.Integer(), nullable=False),
+        sa.Column('solved', sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(['problem_id'], ['problems.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('problem_id')
+    )
+    op.execute("UPDATE attempts SET solved = passed")
+    op.execute(
+        "INSERT INTO problem_progress (problem_id, attempted, solved) "
+        "SELECT problem_id, count(*), count(*) FILTER (WHERE solved) FROM attempts GROUP BY problem_id"
+    )
+    op.execute(
+        "INSERT INTO course_student_progress (course_id, student_id, solved) "
+        "SELECT modules.course_id, attempts.user_id, count(*) FROM attempts "
+        "JOIN problems ON problems.id = attempts.problem_id "
+        "JOIN modules ON modules.id = problems.module_id "
+        "WHERE attempts.solved GROUP BY modules.course_id, attempts.user_id"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('problem_progress')
+    op.drop_table('course_student_progress')
+    op.drop_column('attempts', 'solved')
@@ -0,0 +1,28 @@
+"""problem ignore whitespace
+
+Revision ID: 5a8c0e9f2d47
+Revises: 0b6e5d7a3c19
+Create Date: 2026-10-17 03:16:03.581944
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5a8c0e9f2d47'
+down_revision: Union[str, Sequence[str], None] = '0b6e5d7a3c19'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('problems', sa.Column('ignore_whitespace', sa.Boolean(), server_default=sa.false(), nullable=False))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('problems', 'ignore_whitespace')
@@ -0,0 +1,33 @@
+"""attempt runner
+
+Revision ID: 6e1c9a3d7f52
+Revises: d58b2f0e6a19
+Create Date: 2026-10-17 11:42:08.304915
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '6e1c9a3d7f52'
+down_revision: Union[str, Sequence[str], None] = 'd58b2f0e6a19'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('attempts', sa.Column('runner', sa.String(length=255), nullable=True))
+    op.add_column('attempts', sa.Column('started_at', sa.DateTime(timezone=True), nullable=True))
+    op.create_index('ix_attempts_pending_runner', 'attempts', ['runner', 'started_at'], unique=False,
+                    postgresql_where=sa.text("status = 'pending'"))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_attempts_pending_runner', table_name='attempts', postgresql_where=sa.text("status = 'pending'"))
+    op.drop_column('attempts', 'started_at')
+    op.drop_column('attempts', 'runner')
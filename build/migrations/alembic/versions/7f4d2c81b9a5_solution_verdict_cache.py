@@ -0,0 +1,30 @@
+"""solution verdict cache
+
+Revision ID: 7f4d2c81b9a5
+Revises: e3a91f6c0d2b
+Create Date: 2026-10-17 03:09:41.027315
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7f4d2c81b9a5'
+down_revision: Union[str, Sequence[str], None] = 'e3a91f6c0d2b'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('problems', sa.Column('test_cases_version', sa.Integer(), server_default='1', nullable=False))
+    op.add_column('attempts', sa.Column('solution_hash', sa.String(length=64), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('attempts', 'solution_hash')
+    op.drop_column('problems', 'test_cases_version')
@@ -0,0 +1,89 @@
+"""problem test cases table
+
+Revision ID: 8d1f3b6a2e70
+Revises: 5a8c0e9f2d47
+Create Date: 2026-10-17 03:20:41.216730
+
+"""
+import json
+import zlib
+
+from hashlib import sha256
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8d1f3b6a2e70'
+down_revision: Union[str, Sequence[str], None] = '5a8c0e9f2d47'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+COMPRESS_THRESHOLD = 1024
+
+
+def _digest(output: str) -> str:
+    return sha256(output.encode()).hexdigest()
+
+
+def _pack(problem_id: int, num: str, case: dict) -> dict:
+    input_, output = case["input"], case.get("output", "")
+    packed_input, packed_output = input_.encode(), output.encode()
+    compressed = len(packed_input) + len(packed_output) >= COMPRESS_THRESHOLD
+    if compressed:
+        packed_input, packed_output = zlib.compress(packed_input), zlib.compress(packed_output)
+    return {
+        "problem_id": problem_id,
+        "num": int(num),
+        "input": packed_input,
+        "output": packed_output,
+        "compressed": compressed,
+        "digest": case.get("digest") or _digest(output),
+        "normalized_digest": case.get("normalized_digest") or _digest(" ".join(output.split()))
+    }
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    table = op.create_table(
+        'problem_test_cases',
+        sa.Column('problem_id', sa.Integer(), nullable=False),
+        sa.Column('num', sa.Integer(), nullable=False),
+        sa.Column('input', sa.LargeBinary(), nullable=False),
+        sa.Column('output', sa.LargeBinary(), nullable=False),
+        sa.Column('compressed', sa.Boolean(), nullable=False),
+        sa.Column('digest', sa.String(length=64), nullable=False),
+        sa.Column('normalized_digest', sa.String(length=64), nullable=False),
+        sa.ForeignKeyConstraint(['problem_id'], ['problems.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('problem_id', 'num')
+    )
+    bind = op.get_bind()
+    for problem_id, data in bind.execute(sa.text("SELECT id, test_cases FROM problems WHERE test_cases IS NOT NULL")):
+        if isinstance(data, str):
+            data = json.loads(data)
+        rows = [_pack(problem_id, num, case) for num, case in data.items()]
+        if rows:
+            op.bulk_insert(table, rows)
+    op.drop_column('problems', 'test_cases')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.add_column('problems', sa.Column('test_cases', postgresql.JSONB(astext_type=sa.Text()), nullable=True))
+    bind = op.get_bind()
+    suites: dict[int, dict] = {}
+    for problem_id, num, input_, output, compressed in bind.execute(sa.text(
+        "SELECT problem_id, num, input, output, compressed FROM problem_test_cases"
+    )):
+        input_, output = (zlib.decompress(input_), zlib.decompress(output)) if compressed else (input_, output)
+        suites.setdefault(problem_id, {})[str(num)] = {"input": bytes(input_).decode(), "output": bytes(output).decode()}
+    for problem_id, data in suites.items():
+        bind.execute(
+            sa.text("UPDATE problems SET test_cases = CAST(:data AS JSONB) WHERE id = :id"),
+            {"data": json.dumps(data), "id": problem_id}
+        )
+    op.drop_table('problem_test_cases')
@@ -0,0 +1,28 @@
+"""problem bundles
+
+Revision ID: c47e2a9d5b18
+Revises: 8d1f3b6a2e70
+Create Date: 2026-10-17 03:41:12.804417
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c47e2a9d5b18'
+down_revision: Union[str, Sequence[str], None] = '8d1f3b6a2e70'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('problems', sa.Column('bundle_version', sa.String(length=64), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('problems', 'bundle_version')
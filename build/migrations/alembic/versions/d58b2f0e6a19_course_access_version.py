@@ -0,0 +1,28 @@
+"""course access version
+
+Revision ID: d58b2f0e6a19
+Revises: a71d4e2c9f03
+Create Date: 2026-10-17 07:03:52.118470
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd58b2f0e6a19'
+down_revision: Union[str, Sequence[str], None] = 'a71d4e2c9f03'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('users', sa.Column('course_access_version', sa.Integer(), server_default='0', nullable=False))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('users', 'course_access_version')
@@ -0,0 +1,35 @@
+"""attempt run jobs
+
+Revision ID: e3a91f6c0d2b
+Revises: 1d7a5c3e8b90
+Create Date: 2026-10-17 03:05:12.418230
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e3a91f6c0d2b'
+down_revision: Union[str, Sequence[str], None] = '1d7a5c3e8b90'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+attempt_status = sa.Enum('pending', 'passed', 'failed', name='attempt_status')
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    attempt_status.create(op.get_bind(), checkfirst=True)
+    op.add_column('attempts', sa.Column('job_id', sa.String(length=36), nullable=True))
+    op.add_column('attempts', sa.Column('status', attempt_status, server_default='pending', nullable=False))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('attempts', 'status')
+    op.drop_column('attempts', 'job_id')
+    attempt_status.drop(op.get_bind(), checkfirst=True)
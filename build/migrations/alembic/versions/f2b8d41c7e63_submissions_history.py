@@ -0,0 +1,50 @@
+"""submissions history
+
+Revision ID: f2b8d41c7e63
+Revises: c47e2a9d5b18
+Create Date: 2026-10-17 04:02:37.519204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f2b8d41c7e63'
+down_revision: Union[str, Sequence[str], None] = 'c47e2a9d5b18'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'submissions',
+        sa.Column('id', sa.BigInteger(), autoincrement=True, nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('problem_id', sa.Integer(), nullable=False),
+        sa.Column('job_id', sa.String(length=36), nullable=False),
+        sa.Column('lang', sa.String(length=32), nullable=False),
+        sa.Column('code', sa.Text(), nullable=False),
+        sa.Column('solution_hash', sa.String(length=64), nullable=True),
+        sa.Column('status', postgresql.ENUM(name='attempt_status', create_type=False), nullable=False),
+        sa.Column('passed_count', sa.Integer(), nullable=False),
+        sa.Column('total', sa.Integer(), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('finished_at', sa.DateTime(timezone=True), nullable=True),
+        sa.ForeignKeyConstraint(['problem_id'], ['problems.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('job_id')
+    )
+    op.create_index('ix_submissions_user_problem_created', 'submissions',
+                    ['user_id', 'problem_id', 'created_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_submissions_user_problem_created', table_name='submissions')
+    op.drop_table('submissions')
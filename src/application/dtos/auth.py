@@ -11,3 +11,14 @@ class RegisterUserRequestDTO(BaseModel):
     email: EmailStr
     first_password: str = Field(min_length=8)
     second_password: str = Field(min_length=8)
+
+
+class CourseAccessClaimsDTO(BaseModel):
+    """
+    Courses available to user at the moment claims were issued.
+    Version is version of course access of user, claims of older version are not trusted
+    """
+    user_id: int
+    version: int
+    student_courses: list[int]
+    teacher_courses: list[int]
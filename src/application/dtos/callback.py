@@ -1,5 +1,30 @@
-from pydantic import BaseModel
+from typing import Optional
+
+from pydantic import BaseModel, model_validator
+
+from src.domain.value_objects import TestResult
 
 
 class CodeRunCallbackDTO(BaseModel):
+    """
+    Result of solution on one test case. Runners send digest of output and full output only if job requires it.
+    Output without digest is accepted from runners that do not compute digests
+    """
+    job_id: str
+    user_id: int
+    problem_id: int
     test_num: int
+    digest: Optional[str] = None
+    normalized_digest: Optional[str] = None
+    output: Optional[str] = None
+
+    @model_validator(mode="after")
+    def check_result(self):
+        if self.digest is None and self.output is None:
+            raise ValueError("Either digest or output should be provided")
+        return self
+
+    def to_result(self) -> TestResult:
+        if self.digest is None:
+            return TestResult.from_output(self.output)  # type: ignore
+        return TestResult(self.digest, self.normalized_digest, self.output)
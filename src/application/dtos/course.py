@@ -1,8 +1,10 @@
+from typing import Optional
+
 from pydantic import BaseModel, Field
 
-from .module import ModuleG1, ModuleG2
-from .tag import TagG2
-from .user import UserG1
+from .module import ModuleG1, ModuleG2, ModuleG3
+from .tag import TagG3
+from .user import UserG4
 
 
 class CourseG1(BaseModel):
@@ -19,14 +21,16 @@ class CourseG2(BaseModel):
 class CourseG3(BaseModel):
     id: int
     name: str
-    modules: list[ModuleG1]
+    students_count: int = 0
+    modules: list[ModuleG3]
 
 
 class CourseG4(BaseModel):
     id: int
     name: str
-    students: list[UserG1]
-    tags: list[TagG2]
+    problems_count: int = 0
+    students: list[UserG4]
+    tags: list[TagG3]
 
 
 class CourseG5(BaseModel):
@@ -34,6 +38,7 @@ class CourseG5(BaseModel):
     page: int
     size: int
     total: int
+    next: Optional[str] = None
 
 
 class CourseG6(BaseModel):
@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field
-from .problem import ProblemG1, ProblemG2
+from .problem import ProblemG1, ProblemG2, ProblemG3
 
 
 class ModuleG1(BaseModel):
@@ -11,3 +11,8 @@ class ModuleG2(BaseModel):
     id: int
     name: str
     problems: list[ProblemG2]
+
+
+class ModuleG3(BaseModel):
+    name: str
+    problems: list[ProblemG3]
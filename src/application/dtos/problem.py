@@ -18,9 +18,22 @@ class ProblemG2(BaseModel):
     description: str
 
 
+class ProblemG3(ProblemG1):
+    attempted: int = 0
+    solved: int = 0
+    solve_rate: float = 0.0
+    """Share of students of course who solved problem"""
+
+
 class ProblemC1(BaseModel):
     name: str = Field(max_length=100)
     description: str = Field(max_length=1024)
     auto_pass: bool = False
     test_cases: list[TestCaseDTO]
     show_test_cases: bool = False
+    ignore_whitespace: bool = False
+
+
+class UploadedTestCasesDTO(BaseModel):
+    count: int
+    test_cases_version: int
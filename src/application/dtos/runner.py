@@ -0,0 +1,40 @@
+from typing import Optional
+
+from pydantic import BaseModel
+
+
+class ProblemBundleDTO(BaseModel):
+    """
+    Reference to bundle of inputs of problem test cases. Runners download bundle once and cache it by version
+    """
+    id: int
+    """Id of problem"""
+    version: str
+
+
+class CodeRunJobDTO(BaseModel):
+    """
+    Message sent to runners to execute solution on inputs of problem test cases.
+    Inputs are taken from bundle if it is provided, otherwise they are sent in message
+    """
+    job_id: str
+    user_id: int
+    problem_id: int
+    lang: str
+    code: str
+    bundle: Optional[ProblemBundleDTO] = None
+    test_cases: dict[int, str] = {}
+    """Inputs of part of problem test cases if bundle is not built. Large suites are sent as several messages with the same job_id"""
+    total_tests: int = 0
+    """Count of test cases in all parts of job"""
+    return_outputs: bool = False
+    """Whether full outputs should be sent with digests. Outputs are kept only for incorrect results"""
+    normalize_whitespace: bool = False
+    """Whether digests of outputs with normalized whitespaces should be sent"""
+
+
+class CancelCodeRunDTO(BaseModel):
+    """
+    Message broadcasted to runners to stop execution of job which verdict is already known
+    """
+    job_id: str
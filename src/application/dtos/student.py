@@ -1,6 +1,31 @@
+from datetime import datetime
+from typing import Optional
+
 from pydantic import BaseModel
 
 
 class SendProblemSolutionDTO(BaseModel):
     code: str
     lang: str
+
+
+class SolutionJobDTO(BaseModel):
+    job_id: str
+
+
+class AttemptProgressDTO(BaseModel):
+    job_id: Optional[str]
+    status: str
+    passed_count: int
+    total: int
+    progress: str
+
+
+class SubmissionDTO(BaseModel):
+    job_id: str
+    lang: str
+    status: str
+    passed_count: int
+    total: int
+    created_at: datetime
+    finished_at: Optional[datetime]
@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field
-from .user import UserG3, UserG1
+from .user import UserG3, UserG1, UserG4
 
 
 class TagG1(BaseModel):
@@ -13,6 +13,14 @@ class TagG2(BaseModel):
     students: list[UserG1]
 
 
+class TagG3(BaseModel):
+    name: str
+    students: list[UserG4]
+    solved: int = 0
+    solve_rate: float = 0.0
+    """Share of solved problems of course among all pairs of tag student and problem"""
+
+
 class TagC1(BaseModel):
     name: str = Field(max_length=100)
     students_ids: list[int] = []
@@ -8,6 +8,11 @@ class UserG1(BaseModel):
     name: str
 
 
+class UserG4(UserG1):
+    solved: int = 0
+    """Count of problems of course solved by student"""
+
+
 class UserG2(BaseModel):
     name: str
     email: str
@@ -0,0 +1 @@
+from .course import CourseQueriesInterface
@@ -0,0 +1,16 @@
+from typing import Protocol, Optional
+
+from src.application.dtos.course import CourseG3, CourseG4, CourseG6, CourseG7
+
+
+class CourseQueriesInterface(Protocol):
+    """
+    Read side of courses. Methods select only data needed to show course and build response models directly
+    without loading domain entities. Progress of students is taken from aggregates,
+    so course of any size is shown in constant number of queries
+    """
+
+    async def get_student_course(self, course_id: int) -> Optional[CourseG7]: ...
+    async def get_course_problems(self, course_id: int) -> Optional[CourseG6]: ...
+    async def get_course_problems_progress(self, course_id: int) -> Optional[CourseG3]: ...
+    async def get_course_students(self, course_id: int) -> Optional[CourseG4]: ...
@@ -1,3 +1,7 @@
 from .user import UserRepositoryInterface
 from .course import CourseRepositoryInterface
 from .problem import ProblemRepositoryInterface
+from .attempt import AttemptRepositoryInterface
+from .test_case import TestCaseRepositoryInterface
+from .submission import SubmissionRepositoryInterface
+from .progress import CourseProgressRepositoryInterface
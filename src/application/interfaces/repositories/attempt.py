@@ -0,0 +1,37 @@
+from datetime import datetime
+from typing import Protocol, Optional
+
+from src.domain.entities import Attempt
+
+
+class AttemptRepositoryInterface(Protocol):
+    async def get(self, user_id: int, problem_id: int) -> Optional[Attempt]: ...
+
+    async def save_started(self, attempt: Attempt) -> None:
+        """
+        Inserts summary of just started attempt or replaces summary of previous run of the same student on problem
+        without reading it. Amount of runs is incremented by storage and set to attempt
+        """
+        ...
+
+    async def mark_solved(self, user_id: int, problem_id: int) -> bool:
+        """
+        Marks that student solved problem. Returns True only for the first solve of problem by student
+        """
+        ...
+
+    async def get_with_results_for_update(self, user_id: int, problem_id: int) -> Optional[Attempt]:
+        """
+        Returns attempt locked until the end of transaction with loaded results and problem.
+        Test cases of problem are not loaded and should be got from TestCaseRepositoryInterface
+        """
+        ...
+
+    async def count_running(self, started_after: datetime) -> dict[str, int]:
+        """
+        Counts pending runs sent to runners after provided time by every app instance
+
+        :return: Map of runner queue to count of its pending runs
+        :rtype: dict[str, int]
+        """
+        ...
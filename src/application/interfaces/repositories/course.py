@@ -1,17 +1,41 @@
 from typing import Protocol, Optional, Any, Sequence
 
 from src.domain.entities import Course, Module
+from src.application.dtos.course import CourseG1
 
 
 class CourseRepositoryInterface(Protocol):
     async def get_by_id(self, course_id: int) -> Optional[Course]: ...
-    async def get_all_paginated(
-        self, page: int = 0, size: int = 10) -> tuple[list[Course], int, int, int]: ...
+
+    async def get_main_page(
+        self,
+        user_id: Optional[int],
+        size: int,
+        page: int = 1,
+        after_id: Optional[int] = None
+    ) -> tuple[list[CourseG1], list[CourseG1], list[CourseG1], int]:
+        """
+        Returns courses where user is teacher, courses where user is student, page of all courses and count of all courses
+        in one round-trip. If after_id provided page is selected after this course id and count may be approximate
+        """
+        ...
 
     async def get_student_courses(self, student_id: int) -> list[Course]: ...
-    async def get_teacher_courses(self, teacher_id: int) -> list[Course]: ...
 
     async def get_by_id_with_rels(self, course_id: int, *
                                   rels_chains: Sequence[Any]) -> Optional[Course]: ...
 
     async def check_user_in_course(self, user_id: int, course_id: int) -> bool: ...
+
+    async def get_user_access(self, user_id: int, course_id: int) -> Optional[tuple[Optional[int], bool]]:
+        """
+        Returns pair of course teacher id and flag whether user is student of course or None if course does not exist
+        """
+        ...
+
+    async def get_user_courses_access(self, user_id: int) -> Optional[tuple[list[int], list[int], int]]:
+        """
+        Returns ids of courses where user is student, ids of courses user teaches and version of course access of user
+        or None if user does not exist
+        """
+        ...
@@ -4,6 +4,20 @@ from src.domain.entities import Problem
 
 
 class ProblemRepositoryInterface(Protocol):
-    async def get_by_id(self, problem_id: int) -> Optional[Problem]: ...
+    """
+    Test cases of problems are not loaded unless explicitly requested. Loading of test cases materializes
+    whole suites, TestCaseRepositoryInterface should be used to get part of cases
+    """
+
+    async def get_by_id(self, problem_id: int, with_test_cases: bool = False) -> Optional[Problem]: ...
+    async def get_course_problem(
+        self, course_id: int, problem_id: int, with_test_cases: bool = False) -> Optional[Problem]: ...
+
+    async def get_by_bundle_version(self, bundle_version: str) -> Optional[Problem]:
+        """
+        Returns any problem which current test cases are packed into bundle of provided version
+        """
+        ...
+
     async def get_course_problems(self, course_id: int) -> list[Problem]: ...
     async def get_course_problems_with_testcases(self, course_id: int) -> list[Problem]: ...
@@ -0,0 +1,27 @@
+from typing import Protocol
+
+
+class CourseProgressRepositoryInterface(Protocol):
+    """
+    Aggregates of progress of students in courses updated incrementally on every attempt and verdict,
+    so dashboards of courses are read without scanning attempts
+    """
+
+    async def add_attempted(self, problem_id: int) -> None:
+        """
+        Counts student who sent the first solution of problem
+        """
+        ...
+
+    async def add_solved(self, user_id: int, problem_id: int) -> None:
+        """
+        Counts the first solve of problem by student
+        """
+        ...
+
+    async def recount(self, course_id: int) -> None:
+        """
+        Recounts solved problems of every student of course and attempts and solves of every problem of course
+        by students enrolled now. Used when problems or students of course are deleted
+        """
+        ...
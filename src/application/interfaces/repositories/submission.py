@@ -0,0 +1,23 @@
+from typing import Protocol
+
+from src.domain.entities import Submission, Attempt
+
+
+class SubmissionRepositoryInterface(Protocol):
+    """
+    Append-only history of solutions. Entries are never replaced, so writes of different students never contend
+    """
+
+    async def add(self, submission: Submission) -> None: ...
+
+    async def complete(self, attempt: Attempt) -> None:
+        """
+        Records verdict of finished attempt in entry of its current run
+        """
+        ...
+
+    async def get_history(self, user_id: int, problem_id: int, limit: int = 20) -> list[Submission]:
+        """
+        Returns latest entries of student on problem starting from the newest one
+        """
+        ...
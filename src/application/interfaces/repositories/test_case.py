@@ -0,0 +1,42 @@
+from typing import Protocol, Optional, Iterable, AsyncIterator
+
+from src.domain.value_objects import TestCase, TestCases
+
+
+class TestCaseRepositoryInterface(Protocol):
+    """
+    Storage of problems test cases. Every case is stored separately, so single cases and pages of cases
+    may be got without loading the whole suite of problem.
+    Cases loaded with with_output=False contain input and digests of expected output only
+    """
+
+    async def get_case(self, problem_id: int, num: int) -> Optional[TestCase]: ...
+
+    async def get_cases(
+        self, problem_id: int, nums: Iterable[int], with_output: bool = True) -> TestCases: ...
+
+    async def get_page(
+        self, problem_id: int, after: int = 0, size: int = 100, with_output: bool = True) -> TestCases:
+        """
+        Returns up to size cases which numbers are greater than after ordered by number
+        """
+        ...
+
+    def stream(
+        self, problem_id: int, page_size: int = 500, with_output: bool = True) -> AsyncIterator[TestCases]:
+        """
+        Yields all cases of problem page by page, so at most page_size cases are kept in memory at once
+        """
+        ...
+
+    async def get_nums(self, problem_id: int) -> list[int]: ...
+    async def count(self, problem_id: int) -> int: ...
+
+    async def save(self, problem_id: int, test_cases: TestCases) -> None:
+        """
+        Adds provided cases and replaces stored ones with the same numbers
+        """
+        ...
+
+    async def delete(self, problem_id: int, nums: Iterable[int]) -> None: ...
+    async def clear(self, problem_id: int) -> None: ...
@@ -1,3 +1,6 @@
 from .auth import AuthenticationServiceInterface
 from .password import PasswordServiceInterface
 from .email import EmailServiceInterface, EmailMessageTextTemplate
+from .cache import UserStatusCacheInterface, CourseAccessCacheInterface, VerdictCacheInterface
+from .runner import CodeRunQueueInterface, RunnerRegistryInterface
+from .bundle import ProblemBundleStorageInterface
@@ -1,8 +1,22 @@
 from typing import Protocol, Optional
 
+from src.application.dtos.auth import CourseAccessClaimsDTO
+
 
 class AuthenticationServiceInterface(Protocol):
     def generate_token(self, user_id: int, exp: Optional[int] = None) -> str: ...
     def get_user_id_from_token(self, token: str) -> Optional[int]: ...
     def decode(self, token: str) -> dict: ...
     def encode(self, payload: dict, exp: Optional[int] = None) -> str: ...
+
+    def generate_course_access_token(self, claims: CourseAccessClaimsDTO) -> str:
+        """
+        Issues signed short-lived token with claims of course access
+        """
+        ...
+
+    def get_course_access_claims(self, token: str) -> Optional[CourseAccessClaimsDTO]:
+        """
+        Returns claims of course access token or None if token is invalid, expired or is not course access token
+        """
+        ...
@@ -0,0 +1,29 @@
+from typing import Protocol, Optional, AsyncIterable
+
+from src.domain.value_objects import TestCases
+
+
+class ProblemBundleStorageInterface(Protocol):
+    """
+    Storage of problem bundles: compressed archives of inputs of problem test cases fetched and cached by runners.
+    Bundles are content-addressed, version of bundle is hash of its content, so identical suites share one bundle
+    and stored bundle never changes
+    """
+
+    async def build(self, test_cases: AsyncIterable[TestCases]) -> str:
+        """
+        Builds bundle of cases got by parts and returns its version
+        """
+        ...
+
+    def locate(self, version: str) -> Optional[str]:
+        """
+        Returns path of bundle file or None if bundle of this version does not exist
+        """
+        ...
+
+    def discard(self, version: str) -> None:
+        """
+        Removes bundle which was built but not attached to problem
+        """
+        ...
@@ -0,0 +1,41 @@
+from typing import Protocol, Optional
+
+
+class UserStatusCacheInterface(Protocol):
+    """
+    Cache of users activity status used to authenticate requests without querying storage each time.
+    Every use case that changes user activity must invalidate cached status of this user
+    """
+
+    def get(self, user_id: int) -> Optional[bool]: ...
+    def set(self, user_id: int, is_active: bool) -> None: ...
+    def invalidate(self, user_id: int) -> None: ...
+
+
+class CourseAccessCacheInterface(Protocol):
+    """
+    Cache of granted access of users to courses. Contains pair of course teacher id and flag whether user is student of course.
+    Every use case that revokes access of user to course must invalidate cached access and revoke claims of course access
+    issued before new version of course access of user
+    """
+
+    def get(self, user_id: int, course_id: int) -> Optional[tuple[Optional[int], bool]]: ...
+    def set(self, user_id: int, course_id: int, access: tuple[Optional[int], bool]) -> None: ...
+    def invalidate(self, user_id: int, course_id: int) -> None: ...
+    def revoke_claims(self, user_id: int, version: int) -> None: ...
+    def get_claims_version(self, user_id: int) -> int:
+        """
+        Returns the least version of claims of course access of user which is trusted
+        """
+        ...
+
+
+class VerdictCacheInterface(Protocol):
+    """
+    Content-addressed cache of verdicts of solutions on problem test cases. Key identifies problem, version of its test cases,
+    language and normalized code, so changing of test cases makes previous results unreachable.
+    Verdict is map of numbers of failed tests to kept outputs of solution, all other tests are passed
+    """
+
+    def get(self, key: str) -> Optional[dict[int, Optional[str]]]: ...
+    def set(self, key: str, failed: dict[int, Optional[str]]) -> None: ...
@@ -1,4 +1,4 @@
-from typing import Protocol
+from typing import Protocol, Optional, Sequence
 
 
 class EmailMessageTextTemplate:
@@ -17,6 +17,10 @@ class EmailMessageTextTemplate:
     def notify_teacher_requested_subscribe(cls, requestor: str, course_name: str):
         return "Request for subscribe on your course!", f"{requestor} wants to subscribe on your course '{course_name}'. Accept or reject request on Runlet\n"
 
+    @classmethod
+    def notify_students_added(cls, course_name: str):
+        return "Added to course!", f"Teacher added you to course '{course_name}'. Start learning right now on Runlet\n"
+
     @classmethod
     def registration(self, confirm_url: str):
         return "Registration confirm", f"Hello! Confirm your registration on Runlet following by link:\n{confirm_url}"
@@ -24,3 +28,10 @@ class EmailMessageTextTemplate:
 
 class EmailServiceInterface(Protocol):
     async def send_mail(self, to: str, topic: str, text: str): ...
+
+    async def send_bulk(self, recipients: Sequence[str], topic: str, text: str) -> dict[str, Optional[str]]:
+        """
+        Sends the same email to all recipients and waits for result.
+        Returns error for every recipient, None if email was accepted by server
+        """
+        ...
@@ -2,5 +2,9 @@ from typing import Protocol
 
 
 class PasswordServiceInterface(Protocol):
-    def hash_password(self, raw_password: str) -> str: ...
-    def check_password(self, hashed: str, checking: str) -> bool: ...
+    """
+    Hashing is CPU-bound, so implementations should not block event loop while hashing or verifying
+    """
+
+    async def hash_password(self, raw_password: str) -> str: ...
+    async def check_password(self, hashed: str, checking: str) -> bool: ...
@@ -0,0 +1,57 @@
+from typing import Protocol, Optional, Mapping
+
+from src.application.dtos.runner import CodeRunJobDTO
+
+
+class CodeRunQueueInterface(Protocol):
+    """
+    Queues of jobs consumed by runners. Results of jobs are delivered asynchronously as callbacks
+    """
+
+    async def enqueue(self, job: CodeRunJobDTO, queue: str) -> None: ...
+
+    async def cancel(self, job_id: str) -> None:
+        """
+        Asks runners to stop execution of job. Results sent by runner before cancellation may still be delivered
+        """
+        ...
+
+
+class RunnerRegistryInterface(Protocol):
+    """
+    Registry of runner nodes tracking their load to dispatch every job to the least loaded healthy runner
+    """
+
+    def supports(self, lang: str) -> bool: ...
+
+    def acquire(self, lang: str, job_id: str, in_flight: Optional[Mapping[str, int]] = None) -> Optional[str]:
+        """
+        Reserves the least loaded healthy runner supporting language for the job
+
+        :param in_flight: Count of unfinished jobs of every runner queue shared by all app instances.
+            If it is not passed, only jobs reserved by this instance are counted
+        :type in_flight: Mapping[str, int] | None
+
+        :return: Name of queue of reserved runner or None if there is no available runner
+        :rtype: str | None
+        """
+        ...
+
+    def complete(self, job_id: str, queue: Optional[str] = None, duration: Optional[float] = None) -> None:
+        """
+        Releases runner of finished job taking into account duration of the job.
+        Job reserved by other app instance is identified by queue of runner and duration of job
+        """
+        ...
+
+    def release(self, job_id: str) -> None:
+        """
+        Releases runner of job that was not sent without affecting statistics of runner
+        """
+        ...
+
+    def fail(self, job_id: str) -> None:
+        """
+        Releases runner of job that could not be sent and marks runner as unhealthy
+        """
+        ...
@@ -2,3 +2,5 @@ from .auth import *
 from .student import *
 from .teacher import *
 from .user import *
+from .callback import *
+from .runner import *
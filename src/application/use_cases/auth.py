@@ -1,3 +1,5 @@
+import hmac
+
 from typing import Optional
 
 from src.application.interfaces.uow import UoWInterface
@@ -5,9 +7,11 @@ from src.application.interfaces.services import (
     AuthenticationServiceInterface,
     PasswordServiceInterface,
     EmailServiceInterface,
-    EmailMessageTextTemplate
+    EmailMessageTextTemplate,
+    UserStatusCacheInterface,
+    CourseAccessCacheInterface
 )
-from src.application.dtos.auth import LoginUserDTO, RegisterUserRequestDTO
+from src.application.dtos.auth import LoginUserDTO, RegisterUserRequestDTO, CourseAccessClaimsDTO
 from src.application.interfaces.repositories import UserRepositoryInterface, CourseRepositoryInterface
 from .exceptions import (
     UndefinedUserError,
@@ -16,7 +20,8 @@ from .exceptions import (
     EmailExistsError,
     InactiveUserError,
     UndefinedCourseError,
-    HasNoAccessError
+    HasNoAccessError,
+    UndefinedRunnerError
 )
 from src.domain.entities import User
 from src.logger import logger
@@ -28,7 +33,9 @@ __all__ = [
     "RegisterUserConfirm",
     "AuthenticateUserAsTeacher",
     "AuthenticateUserAsStudent",
-    "OptionalAuthenticateUser"
+    "OptionalAuthenticateUser",
+    "IssueCourseAccessToken",
+    "AuthenticateRunner"
 ]
 
 
@@ -38,35 +45,31 @@ class BaseAuthUseCase:
         uow: UoWInterface,
         user_repo: UserRepositoryInterface,
         auth_service: AuthenticationServiceInterface,
+        user_status_cache: UserStatusCacheInterface
     ):
         self._uow = uow
         self._auth_service = auth_service
         self._user_repo = user_repo
+        self._user_status_cache = user_status_cache
 
     async def execute(self, token: str):
         user_id = self._auth_service.get_user_id_from_token(token)
         if not user_id:
             raise UndefinedUserError("User was not identify", status=401)
-        async with self._uow:
-            user = await self._user_repo.get_by_id(user_id)
-            if not user:
-                raise UndefinedUserError("User was not identify", status=401)
-            if not user.is_active:
-                raise InactiveUserError("Current user is inactive", status=403)
+        is_active = self._user_status_cache.get(user_id)
+        if is_active is None:
+            async with self._uow:
+                user = await self._user_repo.get_by_id(user_id)
+                if not user:
+                    raise UndefinedUserError("User was not identify", status=401)
+                is_active = user.is_active
+                self._user_status_cache.set(user_id, is_active)
+        if not is_active:
+            raise InactiveUserError("Current user is inactive", status=403)
         return user_id
 
 
 class AuthenticateUser(BaseAuthUseCase):
-    def __init__(
-        self,
-        uow: UoWInterface,
-        user_repo: UserRepositoryInterface,
-        auth_service: AuthenticationServiceInterface,
-    ):
-        self._uow = uow
-        self._auth_service = auth_service
-        self._user_repo = user_repo
-
     async def execute(self, token: str | None) -> int:
         if not token:
             raise UndefinedUserError("Unauthorized", status=401)
@@ -83,45 +86,93 @@ class OptionalAuthenticateUser(BaseAuthUseCase):
             return None
 
 
-class AuthenticateUserAsStudent:
+class BaseCourseAuthUseCase:
+    """
+    Access is granted by signed claims of course access without querying storage if claims are given, belong to user
+    and are not revoked. Otherwise access is checked in cache and then in storage
+    """
+
     def __init__(
         self,
         uow: UoWInterface,
-        course_repo: CourseRepositoryInterface
+        course_repo: CourseRepositoryInterface,
+        access_cache: CourseAccessCacheInterface,
+        auth_service: AuthenticationServiceInterface
     ):
         self._course_repo = course_repo
         self._uow = uow
+        self._access_cache = access_cache
+        self._auth_service = auth_service
+
+    def _get_claims(self, user_id: int, claims_token: Optional[str]) -> Optional[CourseAccessClaimsDTO]:
+        if not claims_token:
+            return None
+        claims = self._auth_service.get_course_access_claims(claims_token)
+        if not claims or claims.user_id != user_id or claims.version < self._access_cache.get_claims_version(user_id):
+            return None
+        return claims
 
-    async def execute(self, user_id: int, course_id: int) -> int:
+    async def _get_access(self, user_id: int, course_id: int) -> tuple[Optional[int], bool]:
         async with self._uow:
-            course = await self._course_repo.get_by_id(course_id)
-            if not course:
-                raise UndefinedCourseError("Course does not exist")
-            subscribed = await self._course_repo.check_user_in_course(user_id, course_id)
-            if not subscribed:
-                raise HasNoAccessError("User not subscribed on course", status=403)
-        return user_id
+            access = await self._course_repo.get_user_access(user_id, course_id)
+        if not access:
+            raise UndefinedCourseError("Course does not exist")
+        return access
 
 
-class AuthenticateUserAsTeacher:
-    def __init__(
-        self,
-        uow: UoWInterface,
-        course_repo: CourseRepositoryInterface
-    ):
-        self._course_repo = course_repo
-        self._uow = uow
+class AuthenticateUserAsStudent(BaseCourseAuthUseCase):
+    async def execute(self, user_id: int, course_id: int, claims_token: Optional[str] = None) -> int:
+        claims = self._get_claims(user_id, claims_token)
+        if claims and course_id in claims.student_courses:
+            return user_id
+        cached = self._access_cache.get(user_id, course_id)
+        if cached and cached[1]:
+            return user_id
+        access = await self._get_access(user_id, course_id)
+        if not access[1]:
+            raise HasNoAccessError("User not subscribed on course", status=403)
+        self._access_cache.set(user_id, course_id, access)
+        return user_id
 
-    async def execute(self, user_id: int, course_id: int) -> int:
-        async with self._uow:
-            course = await self._course_repo.get_by_id(course_id)
-        if not course:
-            raise UndefinedCourseError("Course does not exist")
-        if course.teacher_id != user_id:
+
+class AuthenticateUserAsTeacher(BaseCourseAuthUseCase):
+    async def execute(self, user_id: int, course_id: int, claims_token: Optional[str] = None) -> int:
+        claims = self._get_claims(user_id, claims_token)
+        if claims and course_id in claims.teacher_courses:
+            return user_id
+        cached = self._access_cache.get(user_id, course_id)
+        if cached and cached[0] == user_id:
+            return user_id
+        access = await self._get_access(user_id, course_id)
+        if access[0] != user_id:
             raise HasNoAccessError("User cannot manage course", status=403)
+        self._access_cache.set(user_id, course_id, access)
         return user_id
 
 
+class IssueCourseAccessToken(BaseCourseAuthUseCase):
+    """
+    Called after access of user to course is granted. Returns new token of course access claims
+    if current token is absent, outdated or does not contain course, otherwise None
+    """
+
+    async def execute(self, user_id: int, course_id: int, claims_token: Optional[str] = None) -> Optional[str]:
+        claims = self._get_claims(user_id, claims_token)
+        if claims and (course_id in claims.student_courses or course_id in claims.teacher_courses):
+            return None
+        async with self._uow:
+            access = await self._course_repo.get_user_courses_access(user_id)
+        if not access:
+            return None
+        student_courses, teacher_courses, version = access
+        return self._auth_service.generate_course_access_token(CourseAccessClaimsDTO(
+            user_id=user_id,
+            version=version,
+            student_courses=student_courses,
+            teacher_courses=teacher_courses
+        ))
+
+
 class LoginUser:
     def __init__(
         self,
@@ -149,7 +200,7 @@ class LoginUser:
             topic, message = EmailMessageTextTemplate.registration(f"{self._reg_confirm_url}/{token}")
             await self._email_service.send_mail(user.email, topic, message)
             raise InactiveUserError("Now user is inactive. Email with instructions sent", status=403)
-        if not self._password_service.check_password(user.password, dto.password):
+        if not await self._password_service.check_password(user.password, dto.password):
             raise InvalidUserPasswordError("Incorrect password")
         return self._auth_service.generate_token(user.id)
 
@@ -177,7 +228,7 @@ class RegisterUserRequest:
         async with self._uow as uow:
             if await self._user_repo.count_by_email(dto.email):
                 raise EmailExistsError(f"User with email {dto.email} already exists")
-            registered = User(dto.email, self._password_service.hash_password(
+            registered = User(dto.email, await self._password_service.hash_password(
                 dto.first_password), dto.name)
             uow.save(registered)
             await uow.flush()
@@ -192,10 +243,12 @@ class RegisterUserConfirm:
         uow: UoWInterface,
         user_repo: UserRepositoryInterface,
         auth_service: AuthenticationServiceInterface,
+        user_status_cache: UserStatusCacheInterface
     ):
         self._uow = uow
         self._user_repo = user_repo
         self._auth_service = auth_service
+        self._user_status_cache = user_status_cache
 
     async def execute(self, token: str):
         user_id = self._auth_service.get_user_id_from_token(token)
@@ -206,3 +259,19 @@ class RegisterUserConfirm:
             if not confirmed:
                 raise UndefinedUserError("Try to confirm registration of user that does not exist")
             confirmed.is_active = True
+        self._user_status_cache.invalidate(user_id)
+
+
+class AuthenticateRunner:
+    """
+    Runners are not users, they share one secret token set in config of app and runners
+    """
+
+    def __init__(self, runner_token: str):
+        self._runner_token = runner_token
+
+    async def execute(self, token: Optional[str]) -> None:
+        if not token:
+            raise UndefinedRunnerError("Unauthorized", status=401)
+        if not hmac.compare_digest(token.encode(), self._runner_token.encode()):
+            raise UndefinedRunnerError("Runner was not identify", status=403)
@@ -1,9 +1,116 @@
+from datetime import datetime, timezone
+from typing import Sequence, Optional
+
+from src.domain.entities import Attempt
+from src.domain.exc import DomainError
+from src.domain.entities.exceptions import MismatchTestOutputsError
+from src.application.interfaces.uow import UoWInterface
+from src.application.interfaces.repositories import (
+    AttemptRepositoryInterface,
+    TestCaseRepositoryInterface,
+    SubmissionRepositoryInterface,
+    CourseProgressRepositoryInterface
+)
+from src.application.interfaces.services import (
+    RunnerRegistryInterface,
+    VerdictCacheInterface,
+    CodeRunQueueInterface
+)
 from src.application.dtos.callback import CodeRunCallbackDTO
+from src.logger import logger
+
+__all__ = [
+    "CodeRunCallbackUseCase"
+]
 
 
 class CodeRunCallbackUseCase:
-    def __init__(self, problem_repo):
-        self._problem_repo = problem_repo
+    """
+    Saves results of solution run on batch of test cases of one attempt and sets verdict of attempt
+    when results of all test cases are got. Attempt is updated once per batch and only cases of batch are loaded.
+    Results of tests problem does not contain are skipped, so one bad result does not reject the whole batch.
+    Verdict is recorded in history of submissions too. The first solve of problem by student is counted in
+    progress aggregates of course.
+    In fail fast mode attempt fails on the first incorrect output and runner is asked to stop the job
+    """
+
+    def __init__(
+        self,
+        uow: UoWInterface,
+        attempt_repo: AttemptRepositoryInterface,
+        test_case_repo: TestCaseRepositoryInterface,
+        submission_repo: SubmissionRepositoryInterface,
+        progress_repo: CourseProgressRepositoryInterface,
+        runners: RunnerRegistryInterface,
+        verdict_cache: VerdictCacheInterface,
+        run_queue: CodeRunQueueInterface,
+        fail_fast: bool = False
+    ):
+        self._uow = uow
+        self._attempt_repo = attempt_repo
+        self._test_case_repo = test_case_repo
+        self._submission_repo = submission_repo
+        self._progress_repo = progress_repo
+        self._runners = runners
+        self._verdict_cache = verdict_cache
+        self._run_queue = run_queue
+        self._fail_fast = fail_fast
+
+    async def execute(self, user_id: int, problem_id: int, results: Sequence[CodeRunCallbackDTO]):
+        to_cancel: Optional[str] = None
+        async with self._uow:
+            attempt = await self._attempt_repo.get_with_results_for_update(user_id, problem_id)
+            if not attempt:
+                logger.warning(f"Attempt of user {user_id} on problem {problem_id} does not exist. Results skipped")
+                return
+            actual = {dto.test_num: dto.to_result() for dto in results if dto.job_id == attempt.job_id}
+            if len(actual) != len(results):
+                logger.warning(f"{len(results) - len(actual)} outdated results of problem {problem_id} skipped")
+            if not actual or attempt.is_finished:
+                return
+            attempt.problem.test_cases = await self._test_case_repo.get_cases(
+                problem_id, actual, with_output=False
+            )
+            unknown = [num for num in actual if not attempt.problem.test_cases.get_case(num)]
+            if unknown:
+                logger.warning(f"Results of unknown tests {unknown} of problem {problem_id} skipped")
+                actual = {num: result for num, result in actual.items() if num not in unknown}
+                if not actual:
+                    return
+            try:
+                attempt.add_results(actual, fail_fast=self._fail_fast)
+            except MismatchTestOutputsError as e:
+                logger.info(f"Attempt of user {user_id} on problem {problem_id} failed early: {e}")
+                self._complete(attempt)
+                to_cancel = attempt.job_id
+                await self._submission_repo.complete(attempt)
+            else:
+                if not attempt.is_complete:
+                    return
+                self._complete(attempt)
+                if attempt.solution_hash:
+                    self._verdict_cache.set(attempt.solution_hash, attempt.failed_results)
+                try:
+                    attempt.finish()
+                except DomainError as e:
+                    logger.info(f"Attempt of user {user_id} on problem {problem_id} failed: {e}")
+                await self._submission_repo.complete(attempt)
+                if attempt.passed and await self._attempt_repo.mark_solved(user_id, problem_id):
+                    await self._progress_repo.add_solved(user_id, problem_id)
+        if to_cancel:
+            await self._cancel(to_cancel)
+
+    def _complete(self, attempt: Attempt):
+        """
+        Job may be sent by other app instance, so runner and duration of job are taken from attempt
+        """
+        duration = None
+        if attempt.started_at:
+            duration = (datetime.now(timezone.utc) - attempt.started_at).total_seconds()
+        self._runners.complete(attempt.job_id, attempt.runner, duration)  # type: ignore
 
-    async def execute(self, dto: CodeRunCallbackDTO):
-        pass
+    async def _cancel(self, job_id: str):
+        try:
+            await self._run_queue.cancel(job_id)
+        except Exception as e:
+            logger.warning(f"Could not cancel job '{job_id}': {e}")
@@ -47,3 +47,27 @@ class ImpossibleOperationError(ApplicationError):
 
 class CoursePrivacyError(ApplicationError):
     pass
+
+
+class InvalidCursorError(ApplicationError):
+    pass
+
+
+class UndefinedProblemError(ApplicationError):
+    pass
+
+
+class UnsupportedLangError(ApplicationError):
+    pass
+
+
+class NoAvailableRunnerError(ApplicationError):
+    pass
+
+
+class UndefinedRunnerError(ApplicationError):
+    pass
+
+
+class UndefinedBundleError(ApplicationError):
+    pass
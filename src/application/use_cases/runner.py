@@ -0,0 +1,47 @@
+from src.application.interfaces.uow import UoWInterface
+from src.application.interfaces.repositories import ProblemRepositoryInterface, TestCaseRepositoryInterface
+from src.application.interfaces.services import ProblemBundleStorageInterface
+from src.application.use_cases.exceptions import UndefinedBundleError
+from src.logger import logger
+
+__all__ = [
+    "GetProblemBundle"
+]
+
+
+class GetProblemBundle:
+    """
+    Returns path of bundle requested by runner. Bundle is kept in storage of app instance which built it,
+    so bundle missing in storage is rebuilt from stored test cases of problem it is attached to
+    """
+
+    def __init__(
+        self,
+        uow: UoWInterface,
+        problem_repo: ProblemRepositoryInterface,
+        test_case_repo: TestCaseRepositoryInterface,
+        bundles: ProblemBundleStorageInterface
+    ):
+        self._uow = uow
+        self._problem_repo = problem_repo
+        self._test_case_repo = test_case_repo
+        self._bundles = bundles
+
+    async def execute(self, version: str) -> str:
+        path = self._bundles.locate(version)
+        if path:
+            return path
+        async with self._uow:
+            problem = await self._problem_repo.get_by_bundle_version(version)
+            if not problem:
+                raise UndefinedBundleError("Bundle does not exist", status=404)
+            problem_id = problem.id
+            built = await self._bundles.build(self._test_case_repo.stream(problem_id, with_output=False))
+        path = self._bundles.locate(version)
+        if built != version:
+            logger.error(f"Bundle of problem {problem_id} is rebuilt as '{built}' instead of '{version}'")
+            self._bundles.discard(built)
+        if not path:
+            raise UndefinedBundleError("Bundle does not exist", status=404)
+        logger.info(f"Bundle '{version}' of problem {problem_id} is rebuilt")
+        return path
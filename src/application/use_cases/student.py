@@ -1,9 +1,39 @@
-from src.domain.entities import Course, Module
-from src.application.interfaces.repositories import CourseRepositoryInterface
+from datetime import timedelta
+from hashlib import sha256
+from typing import Optional
+from uuid import uuid4
+
+from src.domain.entities import Attempt, Submission, Problem
+from src.domain.exc import DomainError
+from src.application.interfaces.repositories import (
+    CourseRepositoryInterface,
+    ProblemRepositoryInterface,
+    AttemptRepositoryInterface,
+    TestCaseRepositoryInterface,
+    SubmissionRepositoryInterface,
+    CourseProgressRepositoryInterface
+)
+from src.application.interfaces.queries import CourseQueriesInterface
+from src.application.interfaces.services import (
+    CodeRunQueueInterface,
+    RunnerRegistryInterface,
+    VerdictCacheInterface
+)
 from src.application.interfaces.uow import UoWInterface
+from src.application.dtos.student import SendProblemSolutionDTO, AttemptProgressDTO, SubmissionDTO
+from src.application.dtos.runner import CodeRunJobDTO, ProblemBundleDTO
+from src.application.use_cases.exceptions import (
+    UndefinedProblemError,
+    UnsupportedLangError,
+    NoAvailableRunnerError
+)
+from src.logger import logger
 __all__ = [
     "ShowStudentCourses",
     "ShowStudentCourse",
+    "SendProblemSolution",
+    "ShowAttemptProgress",
+    "ShowSubmissions",
 ]
 
 
@@ -26,12 +56,198 @@ class ShowStudentCourse:
     def __init__(
         self,
         uow: UoWInterface,
-        course_repo: CourseRepositoryInterface
+        course_queries: CourseQueriesInterface
     ):
         self._uow = uow
-        self._course_repo = course_repo
+        self._course_queries = course_queries
 
     async def execute(self, course_id: int):
         async with self._uow:
-            course = await self._course_repo.get_by_id_with_rels(course_id, [Course._modules, Module._problems])
+            course = await self._course_queries.get_student_course(course_id)
         return course
+
+
+def make_solution_hash(problem_id: int, test_cases_version: int, lang: str, code: str) -> str:
+    """
+    Identifies solution content on version of problem test cases. Only line endings are normalized,
+    any other whitespace may be meaningful for the language or the output of solution
+    """
+    normalized = code.replace("\r\n", "\n").replace("\r", "\n")
+    return sha256(f"{problem_id}:{test_cases_version}:{lang}\n{normalized}".encode()).hexdigest()
+
+
+class SendProblemSolution:
+    """
+    Records solution in history of submissions, saves attempt as pending and sends solution
+    to the least loaded runner supporting language of solution. Load of runners is counted by pending runs
+    started by every app instance within job_timeout. Both writes are inserts or upserts without reading.
+    Identical solution already checked on the same test cases gets verdict from cache without running.
+    The first attempt of student and the first solve are counted in progress aggregates of course.
+    Job refers to bundle of problem test cases cached by runners, so message contains only solution.
+    If bundle is not built inputs are streamed to runner by parts of job_part_size cases, so whole suite is never loaded.
+    Returns id of job which results will be got by callbacks
+    """
+    job_part_size = 500
+
+    def __init__(
+        self,
+        uow: UoWInterface,
+        problem_repo: ProblemRepositoryInterface,
+        attempt_repo: AttemptRepositoryInterface,
+        test_case_repo: TestCaseRepositoryInterface,
+        submission_repo: SubmissionRepositoryInterface,
+        progress_repo: CourseProgressRepositoryInterface,
+        run_queue: CodeRunQueueInterface,
+        runners: RunnerRegistryInterface,
+        verdict_cache: VerdictCacheInterface,
+        job_timeout: float = 60
+    ):
+        self._uow = uow
+        self._problem_repo = problem_repo
+        self._attempt_repo = attempt_repo
+        self._test_case_repo = test_case_repo
+        self._submission_repo = submission_repo
+        self._progress_repo = progress_repo
+        self._run_queue = run_queue
+        self._runners = runners
+        self._verdict_cache = verdict_cache
+        self._job_timeout = job_timeout
+
+    async def execute(self, user_id: int, course_id: int, problem_id: int, dto: SendProblemSolutionDTO) -> str:
+        if not self._runners.supports(dto.lang):
+            raise UnsupportedLangError(f"Language '{dto.lang}' is not supported")
+        job_id = str(uuid4())
+        queue: Optional[str] = None
+        try:
+            async with self._uow:
+                problem = await self._get_problem(course_id, problem_id)
+                solution_hash = make_solution_hash(problem.id, problem.test_cases_version, dto.lang, dto.code)
+                test_nums = await self._test_case_repo.get_nums(problem_id)
+                attempt = Attempt(user_id, problem_id)
+                attempt.problem = problem
+                attempt.start(job_id, solution_hash, test_nums)
+                failed = self._verdict_cache.get(solution_hash)
+                if failed is not None:
+                    problem.test_cases = await self._test_case_repo.get_cases(problem_id, failed, with_output=False)
+                    self._apply_cached_verdict(attempt, failed)
+                else:
+                    in_flight = await self._attempt_repo.count_running(
+                        attempt.started_at - timedelta(seconds=self._job_timeout)  # type: ignore
+                    )
+                    queue = self._runners.acquire(dto.lang, job_id, in_flight)
+                    if not queue:
+                        raise NoAvailableRunnerError("All runners are busy. Try later", status=503)
+                    attempt.runner = queue
+                await self._submission_repo.add(Submission.of_attempt(attempt, dto.lang, dto.code))
+                await self._attempt_repo.save_started(attempt)
+                if attempt.amount == 1:
+                    await self._progress_repo.add_attempted(problem_id)
+                if attempt.passed and await self._attempt_repo.mark_solved(user_id, problem_id):
+                    await self._progress_repo.add_solved(user_id, problem_id)
+        except Exception:
+            if queue:
+                self._runners.release(job_id)
+            raise
+        if not queue:  # verdict is got from cache
+            return job_id
+        job = CodeRunJobDTO(
+            job_id=job_id,
+            user_id=user_id,
+            problem_id=problem_id,
+            lang=dto.lang,
+            code=dto.code,
+            total_tests=len(test_nums),
+            return_outputs=problem.show_test_cases,
+            normalize_whitespace=problem.ignore_whitespace
+        )
+        try:
+            if problem.bundle_version:
+                job.bundle = ProblemBundleDTO(id=problem_id, version=problem.bundle_version)
+                await self._run_queue.enqueue(job, queue)
+            else:
+                await self._enqueue_inline(job, queue)
+        except Exception:
+            self._runners.fail(job_id)
+            await self._abort(user_id, problem_id, job_id)
+            raise
+        return job_id
+
+    async def _abort(self, user_id: int, problem_id: int, job_id: str):
+        """
+        Attempt and submission are committed as pending before job is sent. If job was not sent
+        they would never be finished, so the run is failed
+        """
+        try:
+            async with self._uow:
+                attempt = await self._attempt_repo.get_with_results_for_update(user_id, problem_id)
+                if attempt and attempt.job_id == job_id and not attempt.is_finished:
+                    attempt.abort()
+                    await self._submission_repo.complete(attempt)
+        except Exception as e:
+            logger.error(f"Could not abort run '{job_id}' of user {user_id} on problem {problem_id}: {e}")
+
+    async def _get_problem(self, course_id: int, problem_id: int) -> Problem:
+        problem = await self._problem_repo.get_course_problem(course_id, problem_id)
+        if not problem:
+            raise UndefinedProblemError("Problem does not exist", status=404)
+        return problem
+
+    async def _enqueue_inline(self, job: CodeRunJobDTO, queue: str):
+        """
+        Sends inputs of test cases in job messages when bundle of problem is not built
+        """
+        sent = False
+        async with self._uow:
+            async for test_cases in self._test_case_repo.stream(job.problem_id, self.job_part_size, with_output=False):
+                part = job.model_copy(update={"test_cases": {num: case.input for num, case in test_cases}})
+                await self._run_queue.enqueue(part, queue)
+                sent = True
+        if not sent:
+            await self._run_queue.enqueue(job, queue)
+
+    def _apply_cached_verdict(self, attempt: Attempt, failed: dict[int, Optional[str]]):
+        attempt.add_cached_results(failed)
+        try:
+            attempt.finish()
+        except DomainError as e:
+            logger.info(f"Attempt of user {attempt.user_id} on problem {attempt.problem_id} failed: {e}")
+
+
+class ShowAttemptProgress:
+    def __init__(self, uow: UoWInterface, attempt_repo: AttemptRepositoryInterface):
+        self._uow = uow
+        self._attempt_repo = attempt_repo
+
+    async def execute(self, user_id: int, problem_id: int) -> Optional[AttemptProgressDTO]:
+        async with self._uow:
+            attempt = await self._attempt_repo.get(user_id, problem_id)
+        if not attempt:
+            return None
+        return AttemptProgressDTO(
+            job_id=attempt.job_id,
+            status=attempt.status.value,
+            passed_count=attempt.passed_count,
+            total=attempt.total,
+            progress=attempt.progress
+        )
+
+
+class ShowSubmissions:
+    def __init__(self, uow: UoWInterface, submission_repo: SubmissionRepositoryInterface):
+        self._uow = uow
+        self._submission_repo = submission_repo
+
+    async def execute(self, user_id: int, problem_id: int, limit: int = 20) -> list[SubmissionDTO]:
+        async with self._uow:
+            history = await self._submission_repo.get_history(user_id, problem_id, limit)
+        return [
+            SubmissionDTO(
+                job_id=submission.job_id,
+                lang=submission.lang,
+                status=submission.status.value,
+                passed_count=submission.passed_count,
+                total=submission.total,
+                created_at=submission.created_at,
+                finished_at=submission.finished_at
+            ) for submission in history
+        ]
@@ -1,5 +1,11 @@
+import pickle
+
+from tempfile import SpooledTemporaryFile
+from typing import AsyncIterable, AsyncIterator, IO, Iterator
+
 from src.domain.entities import Course, Problem, Module, Tag, DefautTagType
-from src.domain.value_objects import TestCases, TestCase
+from src.domain.value_objects import TestCases, TestCase, TestCasesDigestIndex
+from src.domain.value_objects.test_case import TestCasesDataType
 from src.domain.services.course import (
     CourseTagManagerService,
     CourseStudentsManagerService,
@@ -7,12 +13,26 @@ from src.domain.services.course import (
     CourseProblemManagerService
 )
 from src.application.interfaces.uow import UoWInterface
-from src.application.interfaces.services import AuthenticationServiceInterface
-from src.application.interfaces.repositories import CourseRepositoryInterface, UserRepositoryInterface
+from src.application.interfaces.services import (
+    AuthenticationServiceInterface,
+    CourseAccessCacheInterface,
+    ProblemBundleStorageInterface,
+    EmailServiceInterface,
+    EmailMessageTextTemplate
+)
+from src.application.interfaces.repositories import (
+    CourseRepositoryInterface,
+    UserRepositoryInterface,
+    ProblemRepositoryInterface,
+    TestCaseRepositoryInterface,
+    CourseProgressRepositoryInterface
+)
+from src.application.interfaces.queries import CourseQueriesInterface
 from src.application.use_cases.exceptions import (
     UndefinedCourseError,
     ImpossibleOperationError,
-    undefinedStudentError
+    undefinedStudentError,
+    UndefinedProblemError
 )
 from src.application.dtos.teacher import (
     AddTagsDTO,
@@ -25,15 +45,18 @@ from src.application.dtos.teacher import (
 from src.application.dtos.course import (
     CourseC1
 )
+from src.application.dtos.problem import UploadedTestCasesDTO
 from src.logger import logger
 
 
 __all__ = [
     "ShowTeacherCourseToManageStudents",
     "ShowTeacherCourseToManageProblems",
+    "ShowTeacherCourseToUpdateProblems",
     "UpdateCourseData",
     "DeleteModules",
     "AddProblem",
+    "UploadTestCases",
     "DeleteProblems",
     "AddTags",
     "DeleteTags",
@@ -44,24 +67,35 @@ __all__ = [
 
 
 class ShowTeacherCourseToManageStudents:
-    def __init__(self, uow: UoWInterface, course_repo: CourseRepositoryInterface):
+    def __init__(self, uow: UoWInterface, course_queries: CourseQueriesInterface):
         self._uow = uow
-        self._course_repo = course_repo
+        self._course_queries = course_queries
 
     async def execute(self, course_id: int):
         async with self._uow:
-            course = await self._course_repo.get_by_id_with_rels(course_id, [Course._students], [Course._tags, Tag.students])
+            course = await self._course_queries.get_course_students(course_id)
         return course
 
 
 class ShowTeacherCourseToManageProblems:
-    def __init__(self, uow: UoWInterface, course_repo: CourseRepositoryInterface):
+    def __init__(self, uow: UoWInterface, course_queries: CourseQueriesInterface):
         self._uow = uow
-        self._course_repo = course_repo
+        self._course_queries = course_queries
 
     async def execute(self, course_id: int):
         async with self._uow:
-            course = await self._course_repo.get_by_id_with_rels(course_id, [Course._modules, Module._problems])
+            course = await self._course_queries.get_course_problems_progress(course_id)
+        return course
+
+
+class ShowTeacherCourseToUpdateProblems:
+    def __init__(self, uow: UoWInterface, course_queries: CourseQueriesInterface):
+        self._uow = uow
+        self._course_queries = course_queries
+
+    async def execute(self, course_id: int):
+        async with self._uow:
+            course = await self._course_queries.get_course_problems(course_id)
         return course
 
 
@@ -89,67 +123,180 @@ class DeleteModules:
     def __init__(
         self,
         uow: UoWInterface,
-        course_repo: CourseRepositoryInterface
+        course_repo: CourseRepositoryInterface,
+        progress_repo: CourseProgressRepositoryInterface
     ):
         self._uow = uow
         self._course_repo = course_repo
+        self._progress_repo = progress_repo
 
     async def execute(self, course_id: int, modules_ids: list[int]):
         async with self._uow:
             course = await self._course_repo.get_by_id_with_rels(course_id, [Course._modules])
             manager = CourseModulesManagerService(course)  # type: ignore
             manager.delete_modules(modules_ids)
+            await self._uow.flush()
+            await self._progress_repo.recount(course_id)
+
+
+async def _single_part(test_cases: TestCases) -> AsyncIterator[TestCases]:
+    yield test_cases
 
 
 class AddProblem:
     def __init__(
         self,
         uow: UoWInterface,
-        course_repo: CourseRepositoryInterface
+        course_repo: CourseRepositoryInterface,
+        test_case_repo: TestCaseRepositoryInterface,
+        bundles: ProblemBundleStorageInterface
     ):
         self._uow = uow
         self._course_repo = course_repo
+        self._test_case_repo = test_case_repo
+        self._bundles = bundles
 
     async def execute(self, course_id: int, dto: AddProblemDTO):
-        async with self._uow as uow:
-            course = await self._course_repo.get_by_id_with_rels(course_id, [Course._modules, Module._problems])
-            module = course.get_module(dto.module_name)  # type: ignore
-            if not module:
-                module = Module(dto.module_name, course_id)
-                module_manager = CourseModulesManagerService(course)  # type: ignore
-                module_manager.add_modules([module])
-                uow.save(module)
-                await uow.flush()
-            problem_manager = CourseProblemManagerService(course)  # type: ignore
-            new_problem = Problem(
-                dto.problem_data.name,
-                dto.problem_data.description,
-                module.id,
-                dto.problem_data.auto_pass,
-                dto.problem_data.show_test_cases,
-                TestCases(
+        test_cases = TestCases(
+            {
+                data.test_num: TestCase.from_dict(
                     {
-                        data.test_num: TestCase.from_dict(
-                            {
-                                "input": data.input,
-                                "output": data.output
-                            }
-                        ) for data in dto.problem_data.test_cases
+                        "input": data.input,
+                        "output": data.output
                     }
+                ) for data in dto.problem_data.test_cases
+            }
+        )
+        bundle_version = await self._bundles.build(_single_part(test_cases))
+        try:
+            async with self._uow as uow:
+                course = await self._course_repo.get_by_id_with_rels(course_id, [Course._modules, Module._problems])
+                module = course.get_module(dto.module_name)  # type: ignore
+                if not module:
+                    module = Module(dto.module_name, course_id)
+                    module_manager = CourseModulesManagerService(course)  # type: ignore
+                    module_manager.add_modules([module])
+                    uow.save(module)
+                    await uow.flush()
+                problem_manager = CourseProblemManagerService(course)  # type: ignore
+                new_problem = Problem(
+                    dto.problem_data.name,
+                    dto.problem_data.description,
+                    module.id,
+                    dto.problem_data.auto_pass,
+                    dto.problem_data.show_test_cases,
+                    dto.problem_data.ignore_whitespace,
+                    test_cases
                 )
-            )
-            problem_manager.add_problems(module.name, [new_problem])
-            uow.save(new_problem)
+                problem_manager.add_problems(module.name, [new_problem])
+                uow.save(new_problem)
+                await uow.flush()
+                await self._test_case_repo.save(new_problem.id, new_problem.test_cases)
+                new_problem.attach_bundle(bundle_version)
+        except BaseException:
+            self._bundles.discard(bundle_version)
+            raise
+
+
+STAGE_MEMORY_SIZE = 1024 * 1024
+"""Validated parts of uploaded suite greater than this size (in bytes) are staged on disk"""
+
+
+def _read_staged(file: IO[bytes]) -> Iterator[TestCasesDataType]:
+    file.seek(0)
+    while True:
+        try:
+            yield pickle.load(file)
+        except EOFError:
+            return
+
+
+class UploadTestCases:
+    """
+    Replaces suite of problem with cases got by parts. Every part is validated against previous ones
+    and staged in temporary file, so only one part of suite is kept in memory and transaction is not opened
+    while upload is read. Suite is not changed if any part is invalid. Bundle of new suite is built from committed cases
+    after suite is saved, so writing transaction is not kept open while archive is written. Until bundle is attached
+    runners get inputs in job messages
+    """
+
+    def __init__(
+        self,
+        uow: UoWInterface,
+        problem_repo: ProblemRepositoryInterface,
+        test_case_repo: TestCaseRepositoryInterface,
+        bundles: ProblemBundleStorageInterface
+    ):
+        self._uow = uow
+        self._problem_repo = problem_repo
+        self._test_case_repo = test_case_repo
+        self._bundles = bundles
+
+    async def execute(
+        self,
+        course_id: int,
+        problem_id: int,
+        parts: AsyncIterable[TestCasesDataType]
+    ) -> UploadedTestCasesDTO:
+        async with self._uow:
+            await self._get_problem(course_id, problem_id)
+        index = TestCasesDigestIndex()
+        with SpooledTemporaryFile(STAGE_MEMORY_SIZE) as staged:
+            async for part in parts:
+                cases = index.add(part)
+                if cases:
+                    pickle.dump(cases, staged)
+            if not index.count:
+                raise ImpossibleOperationError("Uploaded suite does not contain test cases")
+            async with self._uow:
+                problem = await self._get_problem(course_id, problem_id)
+                await self._test_case_repo.clear(problem_id)
+                for cases in _read_staged(staged):
+                    await self._test_case_repo.save(problem_id, TestCases().with_cases(cases))
+                problem.replace_test_cases()
+        await self._attach_bundle(course_id, problem_id, problem.test_cases_version)
+        return UploadedTestCasesDTO(count=index.count, test_cases_version=problem.test_cases_version)
+
+    async def _attach_bundle(self, course_id: int, problem_id: int, test_cases_version: int):
+        """
+        Suite is already saved, so problem stays without bundle if bundle can not be built.
+        Bundle is not attached if suite was replaced again while bundle was built
+        """
+        try:
+            async with self._uow:
+                bundle_version = await self._bundles.build(self._test_case_repo.stream(problem_id, with_output=False))
+        except Exception as e:
+            logger.error(f"Could not build bundle of problem {problem_id}: {e}")
+            return
+        try:
+            async with self._uow:
+                problem = await self._problem_repo.get_course_problem(course_id, problem_id)
+                attached = bool(problem and problem.test_cases_version == test_cases_version)
+                if attached:
+                    problem.attach_bundle(bundle_version)  # type: ignore
+        except Exception as e:
+            logger.error(f"Could not attach bundle of problem {problem_id}: {e}")
+            attached = False
+        if not attached:
+            self._bundles.discard(bundle_version)
+
+    async def _get_problem(self, course_id: int, problem_id: int) -> Problem:
+        problem = await self._problem_repo.get_course_problem(course_id, problem_id)
+        if not problem:
+            raise UndefinedProblemError("Problem does not exist", status=404)
+        return problem
 
 
 class DeleteProblems:
     def __init__(
         self,
         uow: UoWInterface,
-        course_repo: CourseRepositoryInterface
+        course_repo: CourseRepositoryInterface,
+        progress_repo: CourseProgressRepositoryInterface
     ):
         self._uow = uow
         self._course_repo = course_repo
+        self._progress_repo = progress_repo
 
     async def execute(self, course_id: int, dto: DeleteProblemsDTO):
         async with self._uow:
@@ -159,6 +306,8 @@ class DeleteProblems:
             )
             manager = CourseProblemManagerService(course)  # type: ignore
             manager.delete_problems(dto.module_name, dto.problems_ids)
+            await self._uow.flush()
+            await self._progress_repo.recount(course_id)
 
 
 class AddTags:
@@ -204,15 +353,21 @@ class DeleteTags:
 
 
 class AddStudents:
+    """
+    Students who were not in course before are notified by one bulk email
+    """
+
     def __init__(
             self,
             uow: UoWInterface,
             course_repo: CourseRepositoryInterface,
-            user_repo: UserRepositoryInterface
+            user_repo: UserRepositoryInterface,
+            email_service: EmailServiceInterface
     ):
         self._uow = uow
         self._course_repo = course_repo
         self._user_repo = user_repo
+        self._email_service = email_service
 
     async def execute(self, course_id: int, dto: AddStudentsDTO):
         async with self._uow:
@@ -220,11 +375,23 @@ class AddStudents:
             if not students:
                 raise undefinedStudentError("Students does not exist")
             course = await self._course_repo.get_by_id_with_rels(course_id, [Course._tags, Tag.students], [Course._students])
+            added = [student.email for student in students if student not in course.students]  # type: ignore
             manager = CourseStudentsManagerService(course)  # type: ignore
             if dto.tag_name:
                 manager.add_students_by_tag(dto.tag_name, students)
             else:
                 manager.add_students(students)
+        if not added:
+            return
+        topic, msg = EmailMessageTextTemplate.notify_students_added(course.name)  # type: ignore
+        try:
+            results = await self._email_service.send_bulk(added, topic, msg)
+        except Exception as e:
+            logger.error(f"Could not notify students added to course {course_id}: {e}")
+            return
+        failed = [email for email, error in results.items() if error]
+        if failed:
+            logger.warning(f"Students {failed} added to course {course_id} were not notified")
 
 
 class DeleteStudents:
@@ -232,17 +399,27 @@ class DeleteStudents:
             self,
             uow: UoWInterface,
             course_repo: CourseRepositoryInterface,
-            user_repo: UserRepositoryInterface
+            user_repo: UserRepositoryInterface,
+            access_cache: CourseAccessCacheInterface,
+            progress_repo: CourseProgressRepositoryInterface
     ):
         self._uow = uow
         self._course_repo = course_repo
         self._user_repo = user_repo
+        self._access_cache = access_cache
+        self._progress_repo = progress_repo
 
     async def execute(self, course_id: int, dto: DeleteStudentsDTO):
         async with self._uow:
             course = await self._course_repo.get_by_id_with_rels(course_id, [Course._tags, Tag.students], [Course._students])
             manager = CourseStudentsManagerService(course)  # type: ignore
-            manager.delete_students(dto.students_ids)
+            deleted = manager.delete_students(dto.students_ids)
+            await self._uow.flush()
+            await self._progress_repo.recount(course_id)
+        for student_id in dto.students_ids:
+            self._access_cache.invalidate(student_id, course_id)
+        for student in deleted:
+            self._access_cache.revoke_claims(student.id, student.course_access_version)
 
 
 class GenerateInviteLink:
@@ -1,3 +1,6 @@
+import base64
+import binascii
+
 from typing import Optional
 
 from src.domain.entities import Course, DefautTagType, Tag
@@ -17,8 +20,9 @@ from src.application.use_cases.exceptions import (
     UndefinedCourseError,
     InvalidInvitingLinkError,
     CoursePrivacyError,
+    InvalidCursorError
 )
-from src.application.dtos.course import CourseC1
+from src.application.dtos.course import CourseC1, CourseG1
 
 __all__ = [
     "ShowCourse",
@@ -30,7 +34,23 @@ __all__ = [
 ]
 
 
+def encode_cursor(course_id: int) -> str:
+    return base64.urlsafe_b64encode(str(course_id).encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> int:
+    try:
+        return int(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode())
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise InvalidCursorError("Pagination cursor is invalid")
+
+
 class ShowMain:
+    """
+    Catalogue of courses can be paginated by page number or by opaque cursor got from previous page.
+    Cursor pagination costs the same for every page but total count of courses is approximate
+    """
+
     def __init__(self, uow: UoWInterface, course_repo: CourseRepositoryInterface):
         self._uow = uow
         self._course_repo = course_repo
@@ -39,16 +59,26 @@ class ShowMain:
         self,
         user_id: Optional[int] = None,
         page: int = 1,
-        size: int = 10
-    ) -> tuple[list, list, tuple[list[Course], int, int, int]]:
-        as_student = []
-        as_teacher = []
+        size: int = 10,
+        after: Optional[str] = None
+    ) -> tuple[list[CourseG1], list[CourseG1], tuple[list[CourseG1], int, int, int, Optional[str]]]:
+        page = max(1, page)
+        size = min(100, max(1, size))
+        after_id = decode_cursor(after) if after is not None else None
         async with self._uow:
-            paginated = await self._course_repo.get_all_paginated(page=page, size=size)
-            if user_id:
-                as_student = await self._course_repo.get_student_courses(user_id)
-                as_teacher = await self._course_repo.get_teacher_courses(user_id)
-        return as_teacher, as_student, paginated
+            if after_id is None:
+                as_teacher, as_student, courses, total = await self._course_repo.get_main_page(
+                    user_id, size, page=page)
+                has_next = page * size < total
+                page_num = page
+            else:
+                as_teacher, as_student, courses, total = await self._course_repo.get_main_page(
+                    user_id, size + 1, after_id=after_id)
+                has_next = len(courses) > size
+                courses = courses[:size]
+                page_num = 0
+        next_cursor = encode_cursor(courses[-1].id) if courses and has_next else None
+        return as_teacher, as_student, (courses, page_num, size, total, next_cursor)
 
 
 class ShowCourse:
@@ -1,14 +1,13 @@
-from typing import Optional, AsyncGenerator
+from typing import Optional, AsyncGenerator, AsyncIterable, Iterable
 
 from fastapi import Request
 from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession, AsyncEngine
-from ploomby.rabbit import RabbitConsumerFactory
-from ploomby.registry import MessageConsumerRegistry
 from dishka import make_async_container, Scope, provide, Provider
 from dishka.integrations.fastapi import FastapiProvider
 
 from src.application.use_cases import *
 from src.application.interfaces.repositories import *
+from src.application.interfaces.queries import *
 from src.application.interfaces.uow import UoWInterface
 from src.application.interfaces.services import *
 from src.infrastructure.services.user import *
@@ -16,23 +15,24 @@ from src.infrastructure.services import *
 from src.infrastructure.configs import (
     DBConfig,
     EmailConfig,
-    AppConfig
+    AppConfig,
+    PasswordConfig,
+    RabbitMQConfig,
+    RunnersConfig
 )
 from src.infrastructure.repositories import *
+from src.infrastructure.queries import *
 from src.infrastructure.uow import AlchemyUoW
-from src.interfaces.broker.rabbitmq import callback_registry
+from src.infrastructure.broker import RabbitCodeRunQueue
 from src.domain.value_objects import (
     AuthenticatedUserId,
     AuthenticatedStudentId,
     AuthenticatedTeacherId,
-    AuthenticatedNotStrictlyUserId
+    AuthenticatedNotStrictlyUserId,
+    AuthenticatedRunner
 )
 
 
-# _consumer_factory = RabbitConsumerFactory(rabbit_conf.conn_url())
-# consumer_registry = MessageConsumerRegistry(callback_registry, _consumer_factory)
-
-
 class DBProvider(Provider):
     scope = Scope.APP
 
@@ -80,6 +80,30 @@ class RepoProvider(Provider):
     def get_course_alchemy_repo(self, session: AsyncSession) -> CourseRepositoryInterface:
         return AlchemyCourseRepository(session)
 
+    @provide
+    def get_problem_alchemy_repo(self, session: AsyncSession) -> ProblemRepositoryInterface:
+        return AlchemyProblemRepository(session)
+
+    @provide
+    def get_attempt_alchemy_repo(self, session: AsyncSession) -> AttemptRepositoryInterface:
+        return AlchemyAttemptRepository(session)
+
+    @provide
+    def get_submission_alchemy_repo(self, session: AsyncSession) -> SubmissionRepositoryInterface:
+        return AlchemySubmissionRepository(session)
+
+    @provide
+    def get_course_progress_alchemy_repo(self, session: AsyncSession) -> CourseProgressRepositoryInterface:
+        return AlchemyCourseProgressRepository(session)
+
+    @provide
+    def get_test_case_alchemy_repo(self, session: AsyncSession) -> TestCaseRepositoryInterface:
+        return AlchemyTestCaseRepository(session)
+
+    @provide
+    def get_course_alchemy_queries(self, session: AsyncSession) -> CourseQueriesInterface:
+        return AlchemyCourseQueries(session)
+
 
 class ApplicationServiceProvider(Provider):
     scope = Scope.REQUEST
@@ -92,12 +116,109 @@ class ApplicationServiceProvider(Provider):
     def get_email_conf(self) -> EmailConfig:
         return EmailConfig()  # type: ignore
 
-    password_service = provide(PasswordService, provides=PasswordServiceInterface)
+    @provide(scope=Scope.APP)
+    def get_password_conf(self) -> PasswordConfig:
+        return PasswordConfig()
+
+    @provide(scope=Scope.APP)
+    def get_password_service(self, conf: PasswordConfig) -> Iterable[PasswordServiceInterface]:
+        executor = create_password_executor(conf.password_hash_executor, conf.password_hash_workers)
+        yield PasswordService(executor, conf.password_hash_max_concurrency, conf.password_hash_wait_warning)
+        executor.shutdown()
+
+    @provide(scope=Scope.APP)
+    def get_bundle_storage(self, conf: AppConfig) -> ProblemBundleStorageInterface:
+        return FileProblemBundleStorage(conf.bundles_dir)
+
+    @provide(scope=Scope.APP)
+    def get_rabbitmq_conf(self) -> RabbitMQConfig:
+        return RabbitMQConfig()  # type: ignore
+
+    @provide(scope=Scope.APP)
+    async def get_code_run_queue(self, conf: RabbitMQConfig) -> AsyncIterable[CodeRunQueueInterface]:
+        queue = RabbitCodeRunQueue(conf.conn_url, conf.message_key_name, conf.cancel_exchange)
+        yield queue
+        await queue.close()
+
+    @provide(scope=Scope.APP)
+    def get_runners_conf(self) -> RunnersConfig:
+        return RunnersConfig()  # type: ignore
+
+    @provide(scope=Scope.APP)
+    def get_runner_registry(self, conf: RunnersConfig, rabbit_conf: RabbitMQConfig) -> RunnerRegistryInterface:
+        options = {
+            "ewma_alpha": conf.runner_ewma_alpha,
+            "job_timeout": conf.runner_job_timeout,
+            "cooldown": conf.runner_cooldown
+        }
+        if conf.runners_conf_path:
+            return InMemoryRunnerRegistry.from_yaml(conf.runners_conf_path, **options)
+        return InMemoryRunnerRegistry([RunnerConf(name="default", queue=rabbit_conf.runner_queue)], **options)
+
+    @provide(scope=Scope.APP)
+    async def get_smtp_pool(self, conf: EmailConfig) -> AsyncIterable[SMTPConnectionPool]:
+        pool = SMTPConnectionPool(
+            conf.email_host,
+            conf.email_port,
+            conf.email_sender,
+            conf.email_sender_password,
+            use_tls=conf.email_use_tls,
+            size=conf.email_pool_size,
+            idle_timeout=conf.email_idle_timeout,
+            timeout=conf.email_timeout
+        )
+        yield pool
+        await pool.close()
+
+    @provide(scope=Scope.APP)
+    async def get_email_outbox(
+        self,
+        conf: EmailConfig,
+        pool: SMTPConnectionPool,
+        sessionmaker: async_sessionmaker[AsyncSession]
+    ) -> AsyncIterable[EmailOutbox]:
+        store = PostgresEmailOutboxStore(sessionmaker, conf.email_max_attempts) if conf.email_outbox_durable else None
+        outbox = EmailOutbox(
+            pool,
+            conf.email_sender,
+            maxsize=conf.email_outbox_size,
+            workers=conf.email_workers,
+            max_attempts=conf.email_max_attempts,
+            retry_delay=conf.email_retry_delay,
+            retry_max_delay=conf.email_retry_max_delay,
+            store=store,
+            bulk_batch_size=conf.email_bulk_batch_size
+        )
+        outbox.start()
+        yield outbox
+        await outbox.drain(conf.email_drain_timeout)
+
     email_service = provide(AsyncEmailService, provides=EmailServiceInterface)
 
-    @provide(provides=AuthenticationServiceInterface)
+    @provide(scope=Scope.APP, provides=AuthenticationServiceInterface)
     def get_jwt_auth_service(self, conf: AppConfig) -> AuthenticationServiceInterface:
-        return JWTAuthenticationService(conf.token_expire_time, conf.secret)
+        return JWTAuthenticationService(
+            conf.token_expire_time,
+            conf.secret,
+            conf.course_access_token_expire_time,
+            conf.token_decode_cache_size
+        )
+
+    @provide(scope=Scope.APP)
+    def get_user_status_cache(self, conf: AppConfig) -> UserStatusCacheInterface:
+        return InMemoryUserStatusCache(conf.user_status_cache_size, conf.user_status_cache_ttl)
+
+    @provide(scope=Scope.APP)
+    def get_course_access_cache(self, conf: AppConfig) -> CourseAccessCacheInterface:
+        return InMemoryCourseAccessCache(
+            conf.course_access_cache_size,
+            conf.course_access_cache_ttl,
+            conf.course_access_token_expire_time
+        )
+
+    @provide(scope=Scope.APP)
+    def get_verdict_cache(self, conf: AppConfig) -> VerdictCacheInterface:
+        return InMemoryVerdictCache(conf.verdict_cache_size, conf.verdict_cache_ttl)
 
 
 class UseCaseProvider(Provider):
@@ -157,6 +278,62 @@ class UseCaseProvider(Provider):
             conf.reg_confirm_url
         )
 
+    @provide
+    def get_code_run_callback(
+        self,
+        conf: RunnersConfig,
+        uow: UoWInterface,
+        attempt_repo: AttemptRepositoryInterface,
+        test_case_repo: TestCaseRepositoryInterface,
+        submission_repo: SubmissionRepositoryInterface,
+        progress_repo: CourseProgressRepositoryInterface,
+        runners: RunnerRegistryInterface,
+        verdict_cache: VerdictCacheInterface,
+        run_queue: CodeRunQueueInterface
+    ) -> CodeRunCallbackUseCase:
+        return CodeRunCallbackUseCase(
+            uow,
+            attempt_repo,
+            test_case_repo,
+            submission_repo,
+            progress_repo,
+            runners,
+            verdict_cache,
+            run_queue,
+            conf.runner_fail_fast
+        )
+
+    @provide
+    def get_send_problem_solution(
+        self,
+        conf: RunnersConfig,
+        uow: UoWInterface,
+        problem_repo: ProblemRepositoryInterface,
+        attempt_repo: AttemptRepositoryInterface,
+        test_case_repo: TestCaseRepositoryInterface,
+        submission_repo: SubmissionRepositoryInterface,
+        progress_repo: CourseProgressRepositoryInterface,
+        run_queue: CodeRunQueueInterface,
+        runners: RunnerRegistryInterface,
+        verdict_cache: VerdictCacheInterface
+    ) -> SendProblemSolution:
+        return SendProblemSolution(
+            uow,
+            problem_repo,
+            attempt_repo,
+            test_case_repo,
+            submission_repo,
+            progress_repo,
+            run_queue,
+            runners,
+            verdict_cache,
+            conf.runner_job_timeout
+        )
+
+    @provide
+    def get_authenticate_runner(self, conf: RunnersConfig) -> AuthenticateRunner:
+        return AuthenticateRunner(conf.runner_token)
+
 
 use_case_provider = UseCaseProvider()
 use_case_provider.provide_all(
@@ -167,7 +344,9 @@ use_case_provider.provide_all(
     UpdateCourseData,
     ShowTeacherCourseToManageStudents,
     ShowTeacherCourseToManageProblems,
+    ShowTeacherCourseToUpdateProblems,
     AddProblem,
+    UploadTestCases,
     DeleteProblems,
     AddStudents,
     DeleteStudents,
@@ -180,13 +359,24 @@ use_case_provider.provide_all(
     ShowMain,
     AuthenticateUserAsTeacher,
     AuthenticateUserAsStudent,
+    IssueCourseAccessToken,
     RequestSubscribeOnCourse,
     SubscribeOnCourseByLink,
     SubscribeOnCourse,
+    ShowAttemptProgress,
+    ShowSubmissions,
+    GetProblemBundle,
 )
 
 
+COURSE_ACCESS_COOKIE = "course_access"
+
+
 class AuthProvider(Provider):
+    """
+    Access to course is checked by claims from course access cookie first. When claims do not cover course,
+    new token is put to request state and set to cookie of response
+    """
     scope = Scope.REQUEST
 
     @provide
@@ -202,22 +392,34 @@ class AuthProvider(Provider):
         self,
         r: Request,
         use_case: AuthenticateUserAsStudent,
+        issue_token: IssueCourseAccessToken,
         user_id: AuthenticatedUserId
     ) -> AuthenticatedStudentId:
-        return AuthenticatedStudentId(await use_case.execute(user_id, int(
-            r.path_params.get("course_id")  # type: ignore
-        )))
+        course_id = int(r.path_params.get("course_id"))  # type: ignore
+        claims_token = r.cookies.get(COURSE_ACCESS_COOKIE)
+        student_id = await use_case.execute(user_id, course_id, claims_token)
+        r.state.course_access_token = await issue_token.execute(user_id, course_id, claims_token)
+        return AuthenticatedStudentId(student_id)
 
     @provide
     async def auth_teacher(
         self,
         r: Request,
         use_case: AuthenticateUserAsTeacher,
+        issue_token: IssueCourseAccessToken,
         user_id: AuthenticatedUserId
     ) -> AuthenticatedTeacherId:
-        return AuthenticatedTeacherId(await use_case.execute(user_id, int(
-            r.path_params.get("course_id")  # type: ignore
-        )))
+        course_id = int(r.path_params.get("course_id"))  # type: ignore
+        claims_token = r.cookies.get(COURSE_ACCESS_COOKIE)
+        teacher_id = await use_case.execute(user_id, course_id, claims_token)
+        r.state.course_access_token = await issue_token.execute(user_id, course_id, claims_token)
+        return AuthenticatedTeacherId(teacher_id)
+
+    @provide
+    async def auth_runner(self, r: Request, use_case: AuthenticateRunner) -> AuthenticatedRunner:
+        scheme, _, token = r.headers.get("Authorization", "").partition(" ")
+        await use_case.execute(token if scheme.lower() == "bearer" else None)
+        return AuthenticatedRunner(True)
 
 
 container = make_async_container(
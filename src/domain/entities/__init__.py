@@ -1,5 +1,6 @@
-from .attempt import Attempt
+from .attempt import Attempt, AttemptStatus
 from .course import Course
 from .problem import Problem, Module
 from .user import User
 from .tag import Tag, DefautTagType
+from .submission import Submission
@@ -1,9 +1,11 @@
 from dataclasses import dataclass, field
 from datetime import datetime, timezone
+from enum import Enum
+from typing import Optional, Iterable
 
 from .problem import Problem
 
-from ..value_objects import TestCases
+from ..value_objects import TestCases, TestCase, TestResult
 from .exceptions import (
     MismatchTestNumsError,
     MismatchTestsCountError,
@@ -11,6 +13,12 @@ from .exceptions import (
 )
 
 
+class AttemptStatus(Enum):
+    PENDING = "pending"
+    PASSED = "passed"
+    FAILED = "failed"
+
+
 @dataclass
 class Attempt:
     user_id: int
@@ -19,29 +27,159 @@ class Attempt:
     amount: int = field(default=0, init=False)
     passed: bool = field(default=False, init=False)
     updated_at: datetime = field(default_factory=lambda: datetime.now(timezone.utc), init=False)
-    test_cases: TestCases = field(default_factory=TestCases)
+    test_cases: TestCases = field(default_factory=TestCases, compare=False, repr=False)
+    job_id: Optional[str] = field(default=None, init=False)
+    solution_hash: Optional[str] = field(default=None, init=False)
+    status: AttemptStatus = field(default=AttemptStatus.PENDING, init=False)
+    passed_count: int = field(default=0, init=False)
+    """Count of correct results got in current run"""
+    mismatched: set[int] = field(default_factory=set, init=False, compare=False, repr=False)
+    """Numbers of tests with incorrect results got in current run"""
+    missing: set[int] = field(default_factory=set, init=False, compare=False, repr=False)
+    """Numbers of tests which results are not got in current run yet"""
+    runner: Optional[str] = field(default=None, init=False, compare=False)
+    """Queue of runner executing current run"""
+    started_at: Optional[datetime] = field(default=None, init=False, compare=False)
+    """Time when current run was started"""
+
+    def start(self, job_id: str, solution_hash: Optional[str] = None, test_nums: Optional[Iterable[int]] = None):
+        """
+        Starts new run of solution. Results of previous run are discarded.
+        Problem with test cases should be loaded unless numbers of tests are provided
+
+        :param job_id: Identifier of run used to match results sent by runners
+        :type job_id: str
+        :param solution_hash: Identifier of solution content on current version of problem test cases
+        :type solution_hash: str | None
+        :param test_nums: Numbers of all tests of problem
+        :type test_nums: Iterable[int] | None
+        """
+        self.job_id = job_id
+        self.solution_hash = solution_hash
+        self.amount += 1
+        self.passed = False
+        self.status = AttemptStatus.PENDING
+        self.test_cases = TestCases()
+        self.passed_count = 0
+        self.mismatched = set()
+        if test_nums is None:
+            test_nums = (num for num, _ in self.problem.test_cases)
+        self.missing = set(test_nums)
+        self.runner = None
+        self.updated_at = self.started_at = datetime.now(timezone.utc)
+
+    def add_result(self, num: int, output: str):
+        """
+        Saves output of solution got on test with provided number
+        """
+        self.add_results({num: TestResult.from_output(output)})
 
-    def mark_as_passed(self):
+    def add_results(self, results: dict[int, TestResult], fail_fast: bool = False):
         """
-        Mark attempt as passed comparing test cases got in last attempt with excpected values of cases outputs 
+        Saves results of solution got on several tests at once and updates progress of run checking every result once.
+        Results are compared by digests. Only incorrect results are kept and their outputs are kept only if problem allows
+        to show test cases. Results are not saved if any test number is unknown
 
-        :param expected_cases: set of test cases that with correct outputs(problem.test_cases)
-        :type expected_cases: TestCases
+        :param results: Map of test number to result of solution
+        :type results: dict[int, TestResult]
+        :param fail_fast: If True attempt fails on the first incorrect result without waiting for other results
+        :type fail_fast: bool
         """
-        if self.problem.test_cases.count != self.test_cases.count:
-            raise MismatchTestsCountError("Count of provided results mismatch with specified cases")
-        mismatching_outputs = []
-        mismatchng_nums = []
-        for num, case in self.test_cases:
-            matching_result = self.problem.test_cases.get_case(num)
-            if not matching_result:
-                mismatchng_nums.append(num)
+        expected_cases = {num: self.problem.test_cases.get_case(num) for num in results}
+        unknown = [num for num, case in expected_cases.items() if not case]
+        if unknown:
+            raise MismatchTestNumsError(f"Problem does not contain tests {unknown}")
+        failed: dict[int, TestCase] = {}
+        corrected: list[int] = []
+        first_mismatch: Optional[int] = None
+        for num, result in results.items():
+            expected: TestCase = expected_cases[num]  # type: ignore
+            if num not in self.missing:
+                self._forget_result(num)
+            self.missing.discard(num)
+            if expected.matches(result, self.problem.ignore_whitespace):
+                self.passed_count += 1
+                corrected.append(num)
                 continue
-            if matching_result.output != case.output:
-                mismatching_outputs.append(num)
-        if mismatching_outputs:
-            raise MismatchTestOutputsError(f"Result of tests {mismatching_outputs} are incorrect")
-        if mismatchng_nums:
-            raise MismatchTestNumsError(
-                f"Provided results dont contain tests {mismatchng_nums}")
+            self.mismatched.add(num)
+            failed[num] = TestCase.from_trusted_dict({
+                "input": expected.input,
+                "output": (result.output or "") if self.problem.show_test_cases else ""
+            })
+            first_mismatch = num if first_mismatch is None else first_mismatch
+        if failed or corrected:
+            self.test_cases = self.test_cases.with_cases(failed, without=corrected)
+        self.updated_at = datetime.now(timezone.utc)
+        if fail_fast and first_mismatch is not None:
+            self._fail(MismatchTestOutputsError(f"Result of test {first_mismatch} is incorrect"))
+
+    def add_cached_results(self, failed: dict[int, Optional[str]]):
+        """
+        Applies verdict of identical solution checked before: all tests except failed ones are passed.
+        Only failed cases of problem are required to be loaded
+
+        :param failed: Map of number of failed test to output of solution if it was kept
+        :type failed: dict[int, str | None]
+        """
+        self.add_results({num: TestResult.mismatch(output) for num, output in failed.items()})
+        self.passed_count += len(self.missing)
+        self.missing = set()
+
+    @property
+    def failed_results(self) -> dict[int, Optional[str]]:
+        """
+        Incorrect results of current run: number of test -> output of solution if it was kept
+        """
+        return {num: case.output or None for num, case in self.test_cases}
+
+    def _forget_result(self, num: int):
+        """
+        Discards result of test got before, e.g. when runner resent result
+        """
+        if num in self.mismatched:
+            self.mismatched.discard(num)
+        elif self.passed_count:
+            self.passed_count -= 1
+
+    def abort(self):
+        """
+        Fails current run which results will never be got, e.g. when job was not sent to runners
+        """
+        self.passed = False
+        self.status = AttemptStatus.FAILED
+        self.updated_at = datetime.now(timezone.utc)
+
+    def _fail(self, error: Exception):
+        self.passed = False
+        self.status = AttemptStatus.FAILED
+        raise error
+
+    @property
+    def is_complete(self) -> bool:
+        return not self.missing
+
+    @property
+    def is_finished(self) -> bool:
+        return self.status is not AttemptStatus.PENDING
+
+    @property
+    def total(self) -> int:
+        return self.passed_count + len(self.mismatched) + len(self.missing)
+
+    @property
+    def progress(self) -> str:
+        """
+        Count of correct results of current run, e.g. '37/200'
+        """
+        return f"{self.passed_count}/{self.total}"
+
+    def finish(self):
+        """
+        Sets final status of attempt using progress of run. Errors of checking results are raised after status was set
+        """
+        if self.missing:
+            self._fail(MismatchTestsCountError(f"Results of tests {sorted(self.missing)} are not provided"))
+        if self.mismatched:
+            self._fail(MismatchTestOutputsError(f"Result of tests {sorted(self.mismatched)} are incorrect"))
         self.passed = True
+        self.status = AttemptStatus.PASSED
@@ -1,4 +1,5 @@
 from dataclasses import dataclass, field
+from typing import Optional
 
 from .exceptions import HasNoDirectAccessError
 from ..value_objects import TestCases
@@ -11,8 +12,26 @@ class Problem:
     module_id: int
     auto_pass: bool = False
     show_test_cases: bool = False
-    test_cases: TestCases = field(default_factory=TestCases)
+    ignore_whitespace: bool = False
+    """If True outputs differing from expected only in whitespaces are correct"""
+    test_cases: TestCases = field(default_factory=TestCases, compare=False, repr=False)
     id: int = field(default=None, init=False)  # type: ignore
+    test_cases_version: int = field(default=1, init=False)
+    """Changes every time test cases are changed. Results of solutions are valid only for the version they were got on"""
+    bundle_version: Optional[str] = field(default=None, init=False)
+    """Version of bundle of current test cases cached by runners. None if bundle was not built for current test cases"""
+
+    def replace_test_cases(self):
+        """
+        Marks that whole suite was replaced in storage without loading it. Test cases are changed only
+        through TestCaseRepository, so loaded cases are not actual anymore
+        """
+        self.test_cases = TestCases()
+        self.test_cases_version += 1
+        self.bundle_version = None
+
+    def attach_bundle(self, version: str):
+        self.bundle_version = version
 
 
 @dataclass
@@ -0,0 +1,49 @@
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Optional
+
+from .attempt import Attempt, AttemptStatus
+
+
+@dataclass
+class Submission:
+    """
+    Entry of append-only history of solutions sent by student. Entry is written once when solution is sent
+    and completed once with verdict of its run
+    """
+    user_id: int
+    problem_id: int
+    job_id: str
+    lang: str
+    code: str = field(repr=False)
+    solution_hash: Optional[str] = None
+    status: AttemptStatus = AttemptStatus.PENDING
+    passed_count: int = 0
+    total: int = 0
+    created_at: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
+    finished_at: Optional[datetime] = None
+    id: int = field(default=None, init=False)  # type: ignore
+
+    @classmethod
+    def of_attempt(cls, attempt: Attempt, lang: str, code: str):
+        """
+        Records started run of attempt. Verdict is recorded too if attempt is already finished, e.g. by cached verdict
+        """
+        submission = cls(
+            attempt.user_id,
+            attempt.problem_id,
+            attempt.job_id,  # type: ignore
+            lang,
+            code,
+            attempt.solution_hash,
+            total=attempt.total
+        )
+        if attempt.is_finished:
+            submission.complete(attempt)
+        return submission
+
+    def complete(self, attempt: Attempt):
+        self.status = attempt.status
+        self.passed_count = attempt.passed_count
+        self.total = attempt.total
+        self.finished_at = datetime.now(timezone.utc)
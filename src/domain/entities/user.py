@@ -11,5 +11,12 @@ class User:
     password: str
     name: str = ""
     is_active: bool = field(default=False, init=False)
+    course_access_version: int = field(default=0, init=False)
     id: int = field(default=None, init=False)  # type: ignore
     tags: list[Course] = field(default_factory=list, init=False)
+
+    def change_course_access(self):
+        """
+        Marks that set of courses available to user changed, so issued claims of course access are outdated
+        """
+        self.course_access_version += 1
@@ -46,6 +46,7 @@ class CourseStudentsManagerService(BaseCourseManagerService):
         for s in students:
             if s not in self._course._students:
                 self._course._students.append(s)
+                s.change_course_access()
 
     def _find_tag_to_add_students(self, target_name: str):
         for tag in self._course.tags:
@@ -63,15 +64,19 @@ class CourseStudentsManagerService(BaseCourseManagerService):
             if s not in target_tag.students:
                 target_tag.students.append(s)
 
-    def _delete_students_common(self, ids: list[int]) -> list[int]:
-        to_delete = [s.id for s in self._course._students if s.id in ids]
-        self._course._students = [s for s in self._course._students if s.id not in to_delete]
+    def _delete_students_common(self, ids: list[int]) -> list[User]:
+        to_delete = [s for s in self._course._students if s.id in ids]
+        self._course._students = [s for s in self._course._students if s.id not in ids]
+        for s in to_delete:
+            s.change_course_access()
         return to_delete
 
-    def delete_students(self, ids: list[int]):
+    def delete_students(self, ids: list[int]) -> list[User]:
         deleted = self._delete_students_common(ids)
+        deleted_ids = [s.id for s in deleted]
         for tag in self._course.tags:
-            tag.students = [s for s in tag.students if s.id not in deleted]
+            tag.students = [s for s in tag.students if s.id not in deleted_ids]
+        return deleted
 
 
 class CourseModulesManagerService(BaseCourseNamedAttrsManagerService):
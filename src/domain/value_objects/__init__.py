@@ -1,2 +1,2 @@
-from .test_case import TestCase, TestCases
+from .test_case import TestCase, TestCases, TestResult, TestCasesDigestIndex
 from .ints import *
@@ -5,3 +5,4 @@ AuthenticatedUserId = NewType("AuthenticatedUserId", int)
 AuthenticatedStudentId = NewType("AuthenticatedStudentId", int)
 AuthenticatedTeacherId = NewType("AuthenticatedTeacherId", int)
 AuthenticatedNotStrictlyUserId = Optional[AuthenticatedUserId]
+AuthenticatedRunner = NewType("AuthenticatedRunner", bool)
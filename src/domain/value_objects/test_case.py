@@ -1,9 +1,44 @@
-from typing import Sequence, Optional
+from hashlib import sha256
+from functools import cached_property
+from typing import Sequence, Optional, Iterable
 from dataclasses import dataclass, field
 
 from .exceptions import DuplicateTestCaseInput, ValidationTestCaseError
 
 
+def digest_output(output: str) -> str:
+    return sha256(output.encode()).hexdigest()
+
+
+def normalize_output(output: str) -> str:
+    """
+    Collapses every sequence of whitespaces to single space and strips output
+    """
+    return " ".join(output.split())
+
+
+@dataclass(frozen=True)
+class TestResult:
+    """
+    Result of solution on test case. Runners send digests of output instead of full output,
+    full output is sent only if it may be shown to student
+    """
+    digest: str
+    normalized_digest: Optional[str] = None
+    output: Optional[str] = None
+
+    @classmethod
+    def from_output(cls, output: str):
+        return cls(digest_output(output), digest_output(normalize_output(output)), output)
+
+    @classmethod
+    def mismatch(cls, output: Optional[str] = None):
+        """
+        Result known to be incorrect, e.g. restored from verdict of identical solution
+        """
+        return cls("", None, output)
+
+
 @dataclass
 class TestCase:
     input: str
@@ -23,48 +58,173 @@ class TestCase:
             "output": self.output
         }
 
+    @cached_property
+    def digest(self) -> str:
+        return digest_output(self.output)
+
+    @cached_property
+    def normalized_digest(self) -> str:
+        return digest_output(normalize_output(self.output))
+
+    def matches(self, result: TestResult, ignore_whitespace: bool = False) -> bool:
+        """
+        Compares digests of expected and got outputs. If ignore_whitespace is True, outputs differing
+        only in whitespaces match each other
+        """
+        if ignore_whitespace and result.normalized_digest is not None:
+            return result.normalized_digest == self.normalized_digest
+        return result.digest == self.digest
+
+    def as_result(self) -> TestResult:
+        return TestResult(self.digest, self.normalized_digest)
+
+    def to_stored_dict(self):
+        return {
+            **self.to_dict(),
+            "digest": self.digest,
+            "normalized_digest": self.normalized_digest
+        }
+
     @classmethod
     def from_dict(cls, io_dict: dict[str, str]):
         return cls(**io_dict)
 
+    @classmethod
+    def from_trusted_dict(cls, io_dict: dict[str, str]):
+        """
+        Builds test case without validation. Should be used only for data validated before storing
+        """
+        case = cls.__new__(cls)
+        case.input = io_dict["input"]
+        case.output = io_dict.get("output", "")
+        if "digest" in io_dict:
+            case.__dict__["digest"] = io_dict["digest"]
+            case.__dict__["normalized_digest"] = io_dict["normalized_digest"]
+        return case
+
 
 TestCasesDataType = dict[int, TestCase]
 """Represents format of data of test cases. { test_num -> { input: input_data, output: output_data } }"""
 
 
+_REMOVED = None
+
+
+class TestCasesDigestIndex:
+    """
+    Validates suite of test cases got by parts, e.g. from uploaded archive. Only digests of inputs and outputs
+    of checked cases are kept, so memory used does not depend on size of cases
+    """
+
+    def __init__(self):
+        self._by_input: dict[str, tuple[int, str]] = {}
+        self._nums: set[int] = set()
+
+    def add(self, cases_data: TestCasesDataType) -> TestCasesDataType:
+        """
+        Checks cases against all cases added before and returns cases which should be stored.
+        Case with the same input and output as added one is skipped
+
+        :raises ValidationTestCaseError: if number of test is not natural int or is repeated
+        :raises DuplicateTestCaseInput: if inputs of cases with different outputs match
+        """
+        accepted: TestCasesDataType = {}
+        for num, case in cases_data.items():
+            if isinstance(num, bool) or not (isinstance(num, int) and num > 0):
+                raise ValidationTestCaseError("Number of test should be natural int")
+            if num in self._nums:
+                raise ValidationTestCaseError(f"Test {num} is repeated")
+            self._nums.add(num)
+            input_digest = digest_output(case.input)
+            added = self._by_input.get(input_digest)
+            if added is not None:
+                if added[1] != case.digest:
+                    raise DuplicateTestCaseInput(f"Inputs of tests {added[0]} and {num} cannot match")
+                continue
+            self._by_input[input_digest] = (num, case.digest)
+            accepted[num] = case
+        return accepted
+
+    @property
+    def count(self) -> int:
+        """
+        Count of accepted cases
+        """
+        return len(self._by_input)
+
+
 @dataclass
 class TestCases:
+    """
+    Keeps index of inputs of test cases, so adding or changing N cases costs O(N) regardless of total count of cases
+    """
     _data: TestCasesDataType = field(default_factory=dict)
 
     def __post_init__(self):
-        self._data = self._get_validated_test_cases(self._data)
+        cases_data = self._data
+        self._data = {}
+        self._by_input: dict[str, int] = {}
+        self._apply(self._plan(cases_data))
 
     def __iter__(self):
         return iter(self._data.items())
 
-    def _validate_input_duplicates(self, cases: Sequence[TestCase]):
+    def _get_index(self) -> dict[str, int]:
         """
-        Ensures test cases inputs duplications
+        Index is built lazily for test cases created without validation
         """
-        if len(set(case.input for case in cases)) != len(cases):
-            raise DuplicateTestCaseInput("Inputs cannot match")
+        index = self.__dict__.get("_by_input")
+        if index is None:
+            index = self._by_input = {case.input: num for num, case in self._data.items()}
+        return index
 
-    def _validate_io_duplicates(self, cases_data: TestCasesDataType):
-        case_map: dict[str, str] = {}
-        res: TestCasesDataType = {}
-        for num, case in cases_data.items():
-            if case_map.get(case.input) == case.output:
-                continue
-            res[num] = case
-            case_map[case.input] = case.output
-        return res
+    def _plan(self, cases_data: TestCasesDataType) -> dict[int, Optional[TestCase]]:
+        """
+        Validates provided cases against current ones without changing them.
+        Case with the same input and output as existing one is skipped, existing case keeps its number.
+        Returns changes of cases: test_num -> new case or None if case should be removed
 
-    def _get_validated_test_cases(self, cases_data: TestCasesDataType):
+        :raises ValidationTestCaseError: if number of test is not natural int
+        :raises DuplicateTestCaseInput: if inputs of cases with different outputs match
+        """
         if not all((isinstance(num, int) and num > 0) for num in cases_data):
             raise ValidationTestCaseError("Number of test should be natural int")
-        deduplicated_io = self._validate_io_duplicates(cases_data)
-        self._validate_input_duplicates([v for v in deduplicated_io.values()])
-        return deduplicated_io
+        index = self._get_index()
+        changed_index: dict[str, Optional[int]] = {}
+        changes: dict[int, Optional[TestCase]] = {}
+
+        def owner_of(input_: str) -> Optional[int]:
+            return changed_index[input_] if input_ in changed_index else index.get(input_)
+
+        for num in cases_data:
+            current = self._data.get(num)
+            if current is not None and owner_of(current.input) == num:
+                changed_index[current.input] = _REMOVED
+        for num, case in cases_data.items():
+            owner = owner_of(case.input)
+            if owner is None:
+                changes[num] = case
+                changed_index[case.input] = num
+                continue
+            owner_case = changes.get(owner) or self._data[owner]
+            if owner_case.output != case.output:
+                raise DuplicateTestCaseInput("Inputs cannot match")
+            if num != owner and num in self._data:
+                changes[num] = _REMOVED
+        return changes
+
+    def _apply(self, changes: dict[int, Optional[TestCase]]):
+        index = self._get_index()
+        for num, case in changes.items():
+            current = self._data.get(num)
+            if current is not None and index.get(current.input) == num:
+                del index[current.input]
+        for num, case in changes.items():
+            if case is _REMOVED:
+                self._data.pop(num, None)
+                continue
+            self._data[num] = case
+            index[case.input] = num
 
     def get_case(self, num: int) -> Optional[TestCase]:
         return self._data.get(num)
@@ -72,21 +232,61 @@ class TestCases:
     def as_dict(self):
         return {num: case.to_dict() for num, case in self._data.items()}
 
+    def as_stored_dict(self):
+        """
+        Same as as_dict but also contains digests of outputs to not compute them on every load
+        """
+        return {num: case.to_stored_dict() for num, case in self._data.items()}
+
     @classmethod
     def from_dict(cls, test_cases_data: dict[int, dict[str, str]]):
         data = {num: TestCase.from_dict(case_data)
                 for num, case_data in test_cases_data.items()}
         return cls(_data=data)
 
+    @classmethod
+    def from_trusted_dict(cls, test_cases_data: dict):
+        """
+        Builds test cases without validation and deduplication. Should be used only for data validated before storing,
+        e.g. loaded from database. Numbers of tests may be provided as strings like keys of JSON object
+        """
+        test_cases = cls.__new__(cls)
+        test_cases._data = {int(num): TestCase.from_trusted_dict(case_data)
+                            for num, case_data in test_cases_data.items()}
+        return test_cases
+
+    def copy(self) -> "TestCases":
+        """
+        Returns independent test cases with the same cases without validation
+        """
+        test_cases = self.__class__.__new__(self.__class__)
+        test_cases._data = self._data.copy()
+        test_cases._by_input = self._get_index().copy()
+        return test_cases
+
+    def with_cases(self, cases_data: TestCasesDataType, without: Iterable[int] = ()) -> "TestCases":
+        """
+        Returns new test cases containing provided cases additionally to current ones except cases with numbers from without.
+        Cases are not validated, so method should be used only for cases built from already validated ones
+        """
+        test_cases = self.__class__.__new__(self.__class__)
+        test_cases._data = {**self._data, **cases_data}
+        for num in without:
+            test_cases._data.pop(num, None)
+        return test_cases
+
     def update_test_cases(self, cases_data: TestCasesDataType):
-        res = self._data.copy()
-        res.update(cases_data)
-        deduplicated_io = self._get_validated_test_cases(res)
-        self._data = deduplicated_io
+        """
+        Adds new cases and replaces existing ones with the same numbers. Nothing is changed if validation fails
+        """
+        self._apply(self._plan(cases_data))
 
     def delete_test_cases(self, nums: Sequence[int]):
+        index = self._get_index()
         for num in nums:
-            self._data.pop(num, None)
+            case = self._data.pop(num, None)
+            if case is not None and index.get(case.input) == num:
+                del index[case.input]
 
     @property
     def count(self):
@@ -0,0 +1 @@
+from .rabbitmq import RabbitCodeRunQueue
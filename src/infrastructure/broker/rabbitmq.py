@@ -0,0 +1,108 @@
+import asyncio
+
+from typing import Optional
+
+from aio_pika import connect_robust, Message, DeliveryMode, ExchangeType
+from aio_pika.abc import AbstractRobustConnection, AbstractChannel, AbstractExchange
+
+from src.application.interfaces.services import CodeRunQueueInterface
+from src.application.dtos.runner import CodeRunJobDTO, CancelCodeRunDTO
+from src.logger import logger
+
+
+class RabbitCodeRunQueue(CodeRunQueueInterface):
+    """
+    Publishes jobs into durable queues of runners. Connection is opened lazily on first publishing and shared by all requests.
+    Cancellations are broadcasted to all runners through fanout exchange, runner executing the job stops it
+    """
+
+    def __init__(
+        self,
+        conn_url: str,
+        message_key_name: str,
+        cancel_exchange: str,
+        task_name: str = "run_code",
+        cancel_task_name: str = "cancel_run"
+    ):
+        self._conn_url = conn_url
+        self._message_key_name = message_key_name
+        self._cancel_exchange_name = cancel_exchange
+        self._task_name = task_name
+        self._cancel_task_name = cancel_task_name
+        self._connection: Optional[AbstractRobustConnection] = None
+        self._channel: Optional[AbstractChannel] = None
+        self._cancel_exchange: Optional[AbstractExchange] = None
+        self._declared: set[str] = set()
+        self._lock = asyncio.Lock()
+
+    async def _get_channel(self) -> AbstractChannel:
+        if not self._connection or self._connection.is_closed:
+            self._connection = await connect_robust(self._conn_url)
+        if not self._channel or self._channel.is_closed:
+            self._channel = await self._connection.channel()
+            self._declared.clear()
+            self._cancel_exchange = None
+        return self._channel
+
+    async def _get_queue_channel(self, queue: str) -> AbstractChannel:
+        if self._channel and not self._channel.is_closed and queue in self._declared:
+            return self._channel
+        async with self._lock:
+            channel = await self._get_channel()
+            if queue not in self._declared:
+                await channel.declare_queue(
+                    queue,
+                    durable=True,
+                    arguments={"x-max-priority": 10}
+                )
+                self._declared.add(queue)
+        return channel
+
+    async def _get_cancel_exchange(self) -> AbstractExchange:
+        if self._channel and not self._channel.is_closed and self._cancel_exchange:
+            return self._cancel_exchange
+        async with self._lock:
+            channel = await self._get_channel()
+            if not self._cancel_exchange:
+                self._cancel_exchange = await channel.declare_exchange(
+                    self._cancel_exchange_name,
+                    ExchangeType.FANOUT,
+                    durable=True
+                )
+        return self._cancel_exchange
+
+    async def enqueue(self, job: CodeRunJobDTO, queue: str) -> None:
+        channel = await self._get_queue_channel(queue)
+        await channel.default_exchange.publish(
+            Message(
+                job.model_dump_json().encode(),
+                headers={self._message_key_name: self._task_name},
+                content_type="application/json",
+                delivery_mode=DeliveryMode.PERSISTENT,
+                message_id=job.job_id
+            ),
+            routing_key=queue
+        )
+        logger.info(f"Job '{job.job_id}' of problem {job.problem_id} sent to '{queue}'")
+
+    async def cancel(self, job_id: str) -> None:
+        exchange = await self._get_cancel_exchange()
+        await exchange.publish(
+            Message(
+                CancelCodeRunDTO(job_id=job_id).model_dump_json().encode(),
+                headers={self._message_key_name: self._cancel_task_name},
+                content_type="application/json",
+                delivery_mode=DeliveryMode.NOT_PERSISTENT
+            ),
+            routing_key=""
+        )
+        logger.info(f"Cancellation of job '{job_id}' sent")
+
+    async def close(self):
+        if self._channel and not self._channel.is_closed:
+            await self._channel.close()
+        if self._connection and not self._connection.is_closed:
+            await self._connection.close()
+        self._channel = None
+        self._connection = None
+        self._cancel_exchange = None
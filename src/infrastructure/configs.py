@@ -1,4 +1,6 @@
 # mypy: disable-error-code=call-arg
+from typing import Literal, Optional
+
 from pydantic_settings import BaseSettings
 
 
@@ -19,20 +21,71 @@ class AppConfig(BaseSettings):
     secret: str
     invite_expire_time: int
     invite_confirm_url: str
+    user_status_cache_ttl: int = 30
+    user_status_cache_size: int = 10000
+    course_access_cache_ttl: int = 10
+    course_access_cache_size: int = 10000
+    course_access_token_expire_time: int = 300
+    token_decode_cache_size: int = 10000
+    verdict_cache_ttl: int = 3600
+    verdict_cache_size: int = 5000
+    test_cases_upload_max_size: int = 512 * 1024 * 1024
+    test_case_max_size: int = 16 * 1024 * 1024
+    bundles_dir: str = "data/bundles"
+    cookie_secure: bool = True
+    cookie_samesite: Literal["lax", "strict", "none"] = "lax"
+
+    @property
+    def cookie_options(self):
+        return {"httponly": True, "secure": self.cookie_secure, "samesite": self.cookie_samesite}
+
+
+class PasswordConfig(BaseSettings):
+    password_hash_executor: Literal["thread", "process"] = "thread"
+    password_hash_workers: int = 4
+    password_hash_max_concurrency: int = 4
+    password_hash_wait_warning: float = 0.5
 
 
 class RabbitMQConfig(BaseSettings):
     rabbitmq_default_user: str
     rabbitmq_default_pass: str
     rabbitmq_host: str
+    runner_queue: str = "runlet.runs"
+    callback_queue: str = "runlet.callbacks"
+    message_key_name: str = "task_name"
+    cancel_exchange: str = "runlet.cancels"
+    callback_batch_size: int = 50
+    callback_batch_window: float = 0.2
 
     @property
     def conn_url(self):
         return f"amqp://{self.rabbitmq_default_user}:{self.rabbitmq_default_pass}@{self.rabbitmq_host}"
 
 
+class RunnersConfig(BaseSettings):
+    runner_token: str
+    runners_conf_path: Optional[str] = None
+    runner_ewma_alpha: float = 0.2
+    runner_job_timeout: float = 60
+    runner_cooldown: float = 30
+    runner_fail_fast: bool = True
+
+
 class EmailConfig(BaseSettings):
     email_sender: str
     email_sender_password: str
     email_host: str
     email_port: int
+    email_use_tls: bool = True
+    email_pool_size: int = 2
+    email_idle_timeout: float = 60
+    email_timeout: float = 30
+    email_outbox_size: int = 1000
+    email_outbox_durable: bool = False
+    email_workers: int = 4
+    email_max_attempts: int = 5
+    email_retry_delay: float = 1
+    email_retry_max_delay: float = 60
+    email_drain_timeout: float = 10
+    email_bulk_batch_size: int = 100
@@ -1,6 +1,9 @@
 from .attempts import attempts
+from .submissions import submissions
 from .users import users, users_tags, tags
 from .courses import courses
-from .problems import problems, modules
+from .problems import problems, problem_test_cases, modules
 from .users_courses import users_courses
 from .base import metadata
+from .progress import course_student_progress, problem_progress
+from .email_outbox import email_outbox
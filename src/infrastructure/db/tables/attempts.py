@@ -2,11 +2,14 @@ from datetime import datetime, timezone
 
 from sqlalchemy import (
     Table, Column,
-    Integer, Boolean,
-    ForeignKey, CheckConstraint, DateTime
+    Integer, Boolean, String, Enum,
+    ForeignKey, CheckConstraint, DateTime, Index,
+    false, text
 )
 
-from .base import metadata, TestCaseJSONBType
+from src.domain.entities import AttemptStatus
+
+from .base import metadata, TestCaseJSONBType, int_set
 
 
 attempts = Table(
@@ -14,11 +17,22 @@ attempts = Table(
     Column('user_id', ForeignKey('users.id', ondelete="CASCADE"),
            nullable=False, primary_key=True),
     Column('problem_id', ForeignKey('problems.id', ondelete="CASCADE"),
-           nullable=False, primary_key=True, unique=True),
+           nullable=False, primary_key=True),
     Column('amount', Integer, nullable=False, default=0),
     Column('passed', Boolean, nullable=False, default=False),
     Column('test_cases', TestCaseJSONBType(), nullable=True),
     Column("updated_at", DateTime(timezone=True), nullable=False,
            default=lambda: datetime.now(timezone.utc)),
-    CheckConstraint("amount >= 0", name="ck_attempts_amount_non_negative")
+    Column("job_id", String(36), nullable=True),
+    Column("solution_hash", String(64), nullable=True),
+    Column("status", Enum(AttemptStatus, name="attempt_status", values_callable=lambda e: [s.value for s in e]),
+           nullable=False, default=AttemptStatus.PENDING),
+    Column("passed_count", Integer, nullable=False, default=0),
+    Column("mismatched", int_set(), nullable=False, server_default="{}"),
+    Column("missing", int_set(), nullable=False, server_default="{}"),
+    Column("solved", Boolean, nullable=False, server_default=false()),
+    Column("runner", String(255), nullable=True),
+    Column("started_at", DateTime(timezone=True), nullable=True),
+    CheckConstraint("amount >= 0", name="ck_attempts_amount_non_negative"),
+    Index("ix_attempts_pending_runner", "runner", "started_at", postgresql_where=text("status = 'pending'"))
 )
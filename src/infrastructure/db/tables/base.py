@@ -1,5 +1,6 @@
 from sqlalchemy import MetaData, Column, Integer, TypeDecorator
-from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.dialects.postgresql import JSONB, ARRAY
+from sqlalchemy.ext.mutable import MutableSet
 from src.domain.value_objects import TestCases
 
 metadata = MetaData()
@@ -14,7 +15,7 @@ class TestCaseJSONBType(TypeDecorator):
 
     def process_bind_param(self, value, dialect):
         if isinstance(value, TestCases):
-            return value.as_dict()
+            return value.as_stored_dict()
         elif not value:
             return {}
         else:
@@ -23,7 +24,25 @@ class TestCaseJSONBType(TypeDecorator):
     def process_result_value(self, value, dialect):
         if value is None:
             return TestCases()
-        return TestCases.from_dict({int(test_num): value[test_num] for test_num in value})
+        return TestCases.from_trusted_dict(value)
 
     def copy(self, **kw):
         return self.__class__()
+
+
+class IntSetType(TypeDecorator):
+    impl = ARRAY(Integer)
+    cache_ok = True
+
+    def process_bind_param(self, value, dialect):
+        return sorted(value) if value else []
+
+    def process_result_value(self, value, dialect):
+        return set(value) if value else set()
+
+
+def int_set():
+    """
+    Set of ints tracking its changes in place
+    """
+    return MutableSet.as_mutable(IntSetType())
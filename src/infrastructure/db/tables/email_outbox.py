@@ -0,0 +1,23 @@
+from datetime import datetime, timezone
+
+from sqlalchemy import (
+    Table, Column, Index,
+    BigInteger, Integer, String, Text,
+    DateTime
+)
+
+from .base import metadata
+
+
+email_outbox = Table(
+    "email_outbox", metadata,
+    Column("id", BigInteger, primary_key=True, autoincrement=True),
+    Column("recipient", String(320), nullable=False),
+    Column("topic", String(255), nullable=False),
+    Column("text", Text, nullable=False),
+    Column("attempts", Integer, nullable=False, default=0),
+    Column("created_at", DateTime(timezone=True), nullable=False, default=lambda: datetime.now(timezone.utc)),
+    Column("next_attempt_at", DateTime(timezone=True), nullable=False, default=lambda: datetime.now(timezone.utc)),
+    Index("ix_email_outbox_next_attempt_at", "next_attempt_at")
+)
+"""Emails waiting to be sent. Row is deleted when email is sent"""
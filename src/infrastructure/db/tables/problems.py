@@ -1,7 +1,7 @@
-from sqlalchemy import Table, Column, String, ForeignKey, Boolean
+from sqlalchemy import Table, Column, String, ForeignKey, Boolean, Integer, LargeBinary
 
 
-from .base import metadata, id_, TestCaseJSONBType
+from .base import metadata, id_
 
 problems = Table(
     "problems", metadata,
@@ -10,8 +10,22 @@ problems = Table(
     Column('description', String(1024), nullable=False),
     Column('module_id', ForeignKey("modules.id", ondelete="CASCADE"), nullable=False),
     Column("auto_pass", Boolean, default=False, nullable=False),
-    Column('test_cases', TestCaseJSONBType(), nullable=True),
-    Column("show_test_cases", Boolean, default=False, nullable=False)
+    Column("show_test_cases", Boolean, default=False, nullable=False),
+    Column("ignore_whitespace", Boolean, default=False, nullable=False),
+    Column("test_cases_version", Integer, default=1, nullable=False),
+    Column("bundle_version", String(64), nullable=True)
+)
+
+
+problem_test_cases = Table(
+    "problem_test_cases", metadata,
+    Column("problem_id", ForeignKey("problems.id", ondelete="CASCADE"), primary_key=True),
+    Column("num", Integer, primary_key=True),
+    Column("input", LargeBinary, nullable=False),
+    Column("output", LargeBinary, nullable=False),
+    Column("compressed", Boolean, default=False, nullable=False),
+    Column("digest", String(64), nullable=False),
+    Column("normalized_digest", String(64), nullable=False)
 )
 
 
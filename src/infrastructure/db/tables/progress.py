@@ -0,0 +1,21 @@
+from sqlalchemy import Table, Column, Integer, ForeignKey
+
+from .base import metadata
+
+
+course_student_progress = Table(
+    "course_student_progress", metadata,
+    Column("course_id", ForeignKey("courses.id", ondelete="CASCADE"), primary_key=True),
+    Column("student_id", ForeignKey("users.id", ondelete="CASCADE"), primary_key=True),
+    Column("solved", Integer, nullable=False, default=0)
+)
+"""Count of problems of course solved by student"""
+
+
+problem_progress = Table(
+    "problem_progress", metadata,
+    Column("problem_id", ForeignKey("problems.id", ondelete="CASCADE"), primary_key=True),
+    Column("attempted", Integer, nullable=False, default=0),
+    Column("solved", Integer, nullable=False, default=0)
+)
+"""Count of students who tried to solve problem and who solved it"""
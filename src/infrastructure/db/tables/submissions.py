@@ -0,0 +1,31 @@
+from datetime import datetime, timezone
+
+from sqlalchemy import (
+    Table, Column, Index,
+    BigInteger, Integer, String, Text, Enum,
+    ForeignKey, DateTime
+)
+
+from src.domain.entities import AttemptStatus
+
+from .base import metadata
+
+
+submissions = Table(
+    "submissions", metadata,
+    Column("id", BigInteger, primary_key=True, autoincrement=True),
+    Column("user_id", ForeignKey("users.id", ondelete="CASCADE"), nullable=False),
+    Column("problem_id", ForeignKey("problems.id", ondelete="CASCADE"), nullable=False),
+    Column("job_id", String(36), nullable=False, unique=True),
+    Column("lang", String(32), nullable=False),
+    Column("code", Text, nullable=False),
+    Column("solution_hash", String(64), nullable=True),
+    Column("status", Enum(AttemptStatus, name="attempt_status", values_callable=lambda e: [s.value for s in e],
+                          create_type=False),
+           nullable=False, default=AttemptStatus.PENDING),
+    Column("passed_count", Integer, nullable=False, default=0),
+    Column("total", Integer, nullable=False, default=0),
+    Column("created_at", DateTime(timezone=True), nullable=False, default=lambda: datetime.now(timezone.utc)),
+    Column("finished_at", DateTime(timezone=True), nullable=True),
+    Index("ix_submissions_user_problem_created", "user_id", "problem_id", "created_at")
+)
@@ -1,6 +1,6 @@
 from sqlalchemy import (
     Table, Column,
-    String, Boolean,
+    String, Boolean, Integer,
     ForeignKey
 )
 from sqlalchemy_utils import EmailType  # type: ignore
@@ -14,6 +14,7 @@ users = Table(
     Column('password', String(255), nullable=False),
     Column('name', String(100), nullable=True),
     Column('is_active', Boolean, default=False, nullable=False),
+    Column('course_access_version', Integer, default=0, server_default="0", nullable=False),
 )
 
 tags = Table(
@@ -0,0 +1,140 @@
+from typing import Optional, Any
+
+from sqlalchemy import select, func, ColumnElement
+
+from src.application.interfaces.queries import CourseQueriesInterface
+from src.application.dtos.course import CourseG3, CourseG4, CourseG6, CourseG7
+from src.infrastructure.db.tables import (
+    courses, modules, problems, users, users_courses, tags, users_tags,
+    course_student_progress, problem_progress
+)
+from src.infrastructure.repositories.base import BaseAlchemyRepository
+
+
+class AlchemyCourseQueries(BaseAlchemyRepository, CourseQueriesInterface):
+    """
+    Progress of students is read from aggregates updated on every verdict,
+    so number of queries does not depend on number of students or attempts
+    """
+
+    async def _get_course_with_modules(
+        self,
+        course_id: int,
+        with_problems_descriptions: bool,
+        with_progress: bool = False
+    ) -> Optional[tuple[dict[str, Any], list[dict[str, Any]]]]:
+        problem_cols: dict[str, ColumnElement[Any]] = {"id": problems.c.id, "name": problems.c.name}
+        if with_problems_descriptions:
+            problem_cols["description"] = problems.c.description
+        if with_progress:
+            problem_cols["attempted"] = func.coalesce(problem_progress.c.attempted, 0)
+            problem_cols["solved"] = func.coalesce(problem_progress.c.solved, 0)
+        stmt = select(
+            courses.c.id, courses.c.name, courses.c.description,
+            modules.c.id, modules.c.name,
+            *problem_cols.values()
+        ).select_from(courses).outerjoin(
+            modules, modules.c.course_id == courses.c.id
+        ).outerjoin(
+            problems, problems.c.module_id == modules.c.id
+        )
+        if with_progress:
+            stmt = stmt.outerjoin(problem_progress, problem_progress.c.problem_id == problems.c.id)
+        stmt = stmt.where(courses.c.id == course_id).order_by(modules.c.id, problems.c.id)
+        rows = (await self._session.execute(stmt)).all()
+        if not rows:
+            return None
+        course = {"id": rows[0][0], "name": rows[0][1], "description": rows[0][2]}
+        course_modules: dict[int, dict[str, Any]] = {}
+        for row in rows:
+            module_id, module_name, problem = row[3], row[4], row[5:]
+            if module_id is None:
+                continue
+            module = course_modules.setdefault(
+                module_id, {"id": module_id, "name": module_name, "problems": []})
+            if problem[0] is None:
+                continue
+            module["problems"].append(dict(zip(problem_cols, problem)))
+        return course, list(course_modules.values())
+
+    async def get_student_course(self, course_id: int) -> Optional[CourseG7]:
+        res = await self._get_course_with_modules(course_id, with_problems_descriptions=False)
+        if not res:
+            return None
+        course, course_modules = res
+        return CourseG7.model_validate({**course, "modules": course_modules})
+
+    async def get_course_problems(self, course_id: int) -> Optional[CourseG6]:
+        res = await self._get_course_with_modules(course_id, with_problems_descriptions=True)
+        if not res:
+            return None
+        course, course_modules = res
+        return CourseG6.model_validate({"id": course["id"], "name": course["name"], "modules": course_modules})
+
+    async def get_course_problems_progress(self, course_id: int) -> Optional[CourseG3]:
+        res = await self._get_course_with_modules(course_id, with_problems_descriptions=False, with_progress=True)
+        if not res:
+            return None
+        course, course_modules = res
+        students_count = await self._session.scalar(
+            select(func.count()).select_from(users_courses).where(users_courses.c.course_id == course_id)
+        )
+        for module in course_modules:
+            for problem in module["problems"]:
+                problem["solve_rate"] = problem["solved"] / students_count if students_count else 0.0
+        return CourseG3.model_validate({
+            "id": course["id"],
+            "name": course["name"],
+            "students_count": students_count,
+            "modules": course_modules
+        })
+
+    async def get_course_students(self, course_id: int) -> Optional[CourseG4]:
+        course = (await self._session.execute(
+            select(
+                courses.c.id,
+                courses.c.name,
+                select(func.count()).select_from(problems).join(
+                    modules, modules.c.id == problems.c.module_id
+                ).where(modules.c.course_id == course_id).scalar_subquery()
+            ).where(courses.c.id == course_id)
+        )).first()
+        if not course:
+            return None
+        problems_count = course[2]
+        students = await self._session.execute(
+            select(users.c.id, users.c.name, func.coalesce(course_student_progress.c.solved, 0)).join(
+                users_courses, users_courses.c.student_id == users.c.id
+            ).outerjoin(
+                course_student_progress,
+                (course_student_progress.c.course_id == course_id)
+                & (course_student_progress.c.student_id == users.c.id)
+            ).where(users_courses.c.course_id == course_id).order_by(users.c.id)
+        )
+        course_students = [{"id": id_, "name": name, "solved": solved} for id_, name, solved in students]
+        solved_by_student = {student["id"]: student["solved"] for student in course_students}
+        tags_students = await self._session.execute(
+            select(tags.c.name, users.c.id, users.c.name).outerjoin(
+                users_tags, users_tags.c.tag_id == tags.c.id
+            ).outerjoin(
+                users, users.c.id == users_tags.c.user_id
+            ).where(tags.c.course_id == course_id).order_by(tags.c.id, users.c.id)
+        )
+        course_tags: dict[str, list[dict[str, Any]]] = {}
+        for tag_name, user_id, user_name in tags_students:
+            tag_students = course_tags.setdefault(tag_name, [])
+            if user_id is not None:
+                tag_students.append({"id": user_id, "name": user_name, "solved": solved_by_student.get(user_id, 0)})
+        return CourseG4.model_validate({
+            "id": course[0],
+            "name": course[1],
+            "problems_count": problems_count,
+            "students": course_students,
+            "tags": [self._tag_progress(name, students_, problems_count) for name, students_ in course_tags.items()]
+        })
+
+    @staticmethod
+    def _tag_progress(name: str, students: list[dict[str, Any]], problems_count: int) -> dict[str, Any]:
+        solved = sum(student["solved"] for student in students)
+        pairs = len(students) * problems_count
+        return {"name": name, "students": students, "solved": solved, "solve_rate": solved / pairs if pairs else 0.0}
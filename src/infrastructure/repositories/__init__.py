@@ -1,2 +1,7 @@
 from .user import AlchemyUserRepository
 from .course import AlchemyCourseRepository
+from .problem import AlchemyProblemRepository
+from .attempt import AlchemyAttemptRepository
+from .test_case import AlchemyTestCaseRepository
+from .submission import AlchemySubmissionRepository
+from .progress import AlchemyCourseProgressRepository
@@ -0,0 +1,74 @@
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import select, update, func
+from sqlalchemy.sql.dml import ReturningInsert
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import undefer, selectinload
+
+from src.domain.entities import Attempt, AttemptStatus
+from src.application.interfaces.repositories import AttemptRepositoryInterface
+from src.infrastructure.db.tables import attempts
+from .base import BaseAlchemyRepository
+
+
+_RUN_COLUMNS = (
+    "passed",
+    "test_cases",
+    "updated_at",
+    "job_id",
+    "solution_hash",
+    "status",
+    "passed_count",
+    "mismatched",
+    "missing",
+    "runner",
+    "started_at"
+)
+
+
+class AlchemyAttemptRepository(BaseAlchemyRepository, AttemptRepositoryInterface):
+    async def get(self, user_id: int, problem_id: int) -> Optional[Attempt]:
+        return await self._session.scalar(
+            select(Attempt).where(attempts.c.user_id == user_id, attempts.c.problem_id == problem_id)
+        )
+
+    async def save_started(self, attempt: Attempt) -> None:
+        values = insert(attempts).values(
+            user_id=attempt.user_id,
+            problem_id=attempt.problem_id,
+            amount=1,
+            **{name: getattr(attempt, name) for name in _RUN_COLUMNS}
+        )
+        stmt: ReturningInsert[tuple[int]] = values.on_conflict_do_update(
+            index_elements=[attempts.c.user_id, attempts.c.problem_id],
+            set_={"amount": attempts.c.amount + 1, **{name: values.excluded[name] for name in _RUN_COLUMNS}}
+        ).returning(attempts.c.amount)
+        attempt.amount = await self._session.scalar(stmt)  # type: ignore
+
+    async def mark_solved(self, user_id: int, problem_id: int) -> bool:
+        res = await self._session.execute(
+            update(attempts).where(
+                attempts.c.user_id == user_id, attempts.c.problem_id == problem_id, attempts.c.solved.is_(False)
+            ).values(solved=True).returning(attempts.c.user_id)
+        )
+        return res.first() is not None
+
+    async def get_with_results_for_update(self, user_id: int, problem_id: int) -> Optional[Attempt]:
+        stmt = select(Attempt).where(
+            attempts.c.user_id == user_id, attempts.c.problem_id == problem_id
+        ).options(
+            undefer(Attempt.test_cases),  # type: ignore
+            selectinload(Attempt.problem)  # type: ignore
+        ).with_for_update()
+        return await self._session.scalar(stmt)
+
+    async def count_running(self, started_after: datetime) -> dict[str, int]:
+        rows = await self._session.execute(
+            select(attempts.c.runner, func.count()).where(
+                attempts.c.status == AttemptStatus.PENDING,
+                attempts.c.runner.is_not(None),
+                attempts.c.started_at > started_after
+            ).group_by(attempts.c.runner)
+        )
+        return {runner: count for runner, count in rows.tuples()}
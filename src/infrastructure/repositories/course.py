@@ -1,29 +1,73 @@
 from typing import Optional, Any, Sequence
 
-from sqlalchemy import select, exists, func
+from sqlalchemy import (
+    select, exists, func, table, column, cast, case,
+    literal_column, union_all, null, BigInteger, String, ColumnElement
+)
 from sqlalchemy.orm import selectinload
 
 from src.application.interfaces.repositories import CourseRepositoryInterface
 from src.domain.entities import Course
-from src.infrastructure.db.tables import users_courses
+from src.application.dtos.course import CourseG1
+from src.infrastructure.db.tables import users_courses, courses, users
 from .base import BaseAlchemyRepository
 
 
+pg_class = table("pg_class", column("oid"), column("reltuples"))
+
+
 class AlchemyCourseRepository(BaseAlchemyRepository, CourseRepositoryInterface):
     async def get_by_id(self, course_id: int) -> Optional[Course]:
         return await self._session.scalar(select(Course).where(Course.id == course_id))
 
-    async def get_all_paginated(self, page: int = 1, size: int = 10):
-        page = max(1, page)
-        size = min(100, max(1, size))
-        count_stmt = select(func.count()).select_from(
-            select(Course).order_by(Course.id).subquery())
-        total = await self._session.scalar(count_stmt)
-        offset = (page - 1) * size
-        if offset >= total:  # type: ignore
-            return []
-        res = await self._session.scalars(select(Course).offset(offset).limit(size))
-        return res.all(), page, size, total
+    async def get_main_page(
+        self,
+        user_id: Optional[int],
+        size: int,
+        page: int = 1,
+        after_id: Optional[int] = None
+    ) -> tuple[list[CourseG1], list[CourseG1], list[CourseG1], int]:
+        """
+        Collects teacher courses, student courses, page of catalogue and count of courses using one UNION ALL statement.
+        If after_id provided page of catalogue is selected by keyset and count is estimated
+        """
+        exact_total = select(func.count()).select_from(courses).scalar_subquery()
+        total: ColumnElement[int]
+        catalogue = select(
+            literal_column("'catalogue'"), courses.c.id, courses.c.name
+        ).order_by(courses.c.id).limit(size)
+        if after_id is None:
+            catalogue = catalogue.offset((page - 1) * size)
+            total = exact_total
+        else:
+            catalogue = catalogue.where(courses.c.id > after_id)
+            estimated = func.coalesce(
+                select(cast(pg_class.c.reltuples, BigInteger)).where(
+                    pg_class.c.oid == func.to_regclass(courses.name)).scalar_subquery(),
+                -1
+            )
+            total = case((estimated < 0, exact_total), else_=estimated)
+        parts = [
+            catalogue,
+            select(literal_column("'total'"), total, cast(null(), String))
+        ]
+        if user_id:
+            parts += [
+                select(literal_column("'teacher'"), courses.c.id, courses.c.name).where(
+                    courses.c.teacher_id == user_id),
+                select(literal_column("'student'"), courses.c.id, courses.c.name).join(
+                    users_courses, courses.c.id == users_courses.c.course_id
+                ).where(users_courses.c.student_id == user_id)
+            ]
+        stmt = union_all(*parts).order_by(literal_column("1"), literal_column("2"))
+        sections: dict[str, list[CourseG1]] = {"teacher": [], "student": [], "catalogue": []}
+        count = 0
+        for section, id_, name in await self._session.execute(stmt):
+            if section == "total":
+                count = id_
+            else:
+                sections[section].append(CourseG1(id=id_, name=name))
+        return sections["teacher"], sections["student"], sections["catalogue"], count
 
     async def get_student_courses(self, student_id: int) -> list[Course]:
         stmt = select(Course).join(
@@ -34,10 +78,6 @@ class AlchemyCourseRepository(BaseAlchemyRepository, CourseRepositoryInterface):
         res = await self._session.scalars(stmt)
         return res.unique().all()  # type: ignore
 
-    async def get_teacher_courses(self, teacher_id: int) -> list[Course]:
-        res = await self._session.scalars(select(Course).where(Course._teacher_id == teacher_id))
-        return res.all()  # type: ignore
-
     async def get_by_id_with_rels(self, course_id: int, *rels_chains: Sequence[Any]) -> Optional[Course]:
         options = []
         for list_models in rels_chains:
@@ -59,3 +99,28 @@ class AlchemyCourseRepository(BaseAlchemyRepository, CourseRepositoryInterface):
                 )
             )
         )
+
+    async def get_user_access(self, user_id: int, course_id: int) -> Optional[tuple[Optional[int], bool]]:
+        is_student = exists().where(
+            users_courses.c.student_id == user_id,
+            users_courses.c.course_id == courses.c.id
+        )
+        res = await self._session.execute(
+            select(courses.c.teacher_id, is_student).where(courses.c.id == course_id)
+        )
+        row = res.first()
+        if row is None:
+            return None
+        return row[0], bool(row[1])
+
+    async def get_user_courses_access(self, user_id: int) -> Optional[tuple[list[int], list[int], int]]:
+        student_courses = select(func.array_agg(users_courses.c.course_id)).where(
+            users_courses.c.student_id == user_id
+        ).scalar_subquery()
+        teacher_courses = select(func.array_agg(courses.c.id)).where(courses.c.teacher_id == user_id).scalar_subquery()
+        row = (await self._session.execute(
+            select(student_courses, teacher_courses, users.c.course_access_version).where(users.c.id == user_id)
+        )).first()
+        if row is None:
+            return None
+        return list(row[0] or []), list(row[1] or []), row[2]
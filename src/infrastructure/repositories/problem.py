@@ -0,0 +1,62 @@
+from typing import Optional
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.domain.entities import Problem
+from src.application.interfaces.repositories import ProblemRepositoryInterface
+from src.infrastructure.db.tables import modules, problems
+from .base import BaseAlchemyRepository
+from .test_case import AlchemyTestCaseRepository
+
+
+class AlchemyProblemRepository(BaseAlchemyRepository, ProblemRepositoryInterface):
+    def __init__(self, session: AsyncSession):
+        super().__init__(session)
+        self._test_case_repo = AlchemyTestCaseRepository(session)
+
+    async def _load_test_cases(self, problems: list[Problem]):
+        test_cases = await self._test_case_repo.get_for_problems(problem.id for problem in problems)
+        for problem in problems:
+            problem.test_cases = test_cases[problem.id]
+
+    async def get_by_id(self, problem_id: int, with_test_cases: bool = False) -> Optional[Problem]:
+        problem = await self._session.scalar(select(Problem).where(problems.c.id == problem_id))
+        if problem and with_test_cases:
+            await self._load_test_cases([problem])
+        return problem
+
+    async def get_course_problem(
+        self,
+        course_id: int,
+        problem_id: int,
+        with_test_cases: bool = False
+    ) -> Optional[Problem]:
+        stmt = select(Problem).join(
+            modules, modules.c.id == problems.c.module_id
+        ).where(problems.c.id == problem_id, modules.c.course_id == course_id)
+        problem = await self._session.scalar(stmt)
+        if problem and with_test_cases:
+            await self._load_test_cases([problem])
+        return problem
+
+    async def get_by_bundle_version(self, bundle_version: str) -> Optional[Problem]:
+        return await self._session.scalar(
+            select(Problem).where(problems.c.bundle_version == bundle_version).limit(1)
+        )
+
+    async def _get_course_problems(self, course_id: int, with_test_cases: bool) -> list[Problem]:
+        stmt = select(Problem).join(
+            modules, modules.c.id == problems.c.module_id
+        ).where(modules.c.course_id == course_id)
+        res = await self._session.scalars(stmt)
+        course_problems = list(res.all())
+        if with_test_cases:
+            await self._load_test_cases(course_problems)
+        return course_problems
+
+    async def get_course_problems(self, course_id: int) -> list[Problem]:
+        return await self._get_course_problems(course_id, with_test_cases=False)
+
+    async def get_course_problems_with_testcases(self, course_id: int) -> list[Problem]:
+        return await self._get_course_problems(course_id, with_test_cases=True)
@@ -0,0 +1,71 @@
+from sqlalchemy import select, delete, func, literal
+from sqlalchemy.dialects.postgresql import insert
+
+from src.application.interfaces.repositories import CourseProgressRepositoryInterface
+from src.infrastructure.db.tables import (
+    course_student_progress,
+    problem_progress,
+    problems,
+    modules,
+    attempts,
+    users_courses
+)
+from .base import BaseAlchemyRepository
+
+
+class AlchemyCourseProgressRepository(BaseAlchemyRepository, CourseProgressRepositoryInterface):
+    async def add_attempted(self, problem_id: int) -> None:
+        stmt = insert(problem_progress).values(problem_id=problem_id, attempted=1, solved=0)
+        await self._session.execute(stmt.on_conflict_do_update(
+            index_elements=[problem_progress.c.problem_id],
+            set_={"attempted": problem_progress.c.attempted + 1}
+        ))
+
+    async def add_solved(self, user_id: int, problem_id: int) -> None:
+        problem_stmt = insert(problem_progress).values(problem_id=problem_id, attempted=1, solved=1)
+        await self._session.execute(problem_stmt.on_conflict_do_update(
+            index_elements=[problem_progress.c.problem_id],
+            set_={"solved": problem_progress.c.solved + 1}
+        ))
+        course_id = select(modules.c.course_id).join(
+            problems, problems.c.module_id == modules.c.id
+        ).where(problems.c.id == problem_id).scalar_subquery()
+        student_stmt = insert(course_student_progress).values(course_id=course_id, student_id=user_id, solved=1)
+        await self._session.execute(student_stmt.on_conflict_do_update(
+            index_elements=[course_student_progress.c.course_id, course_student_progress.c.student_id],
+            set_={"solved": course_student_progress.c.solved + 1}
+        ))
+
+    async def recount(self, course_id: int) -> None:
+        enrolled_attempts = select(
+            attempts.c.user_id, attempts.c.problem_id, attempts.c.solved
+        ).join(
+            problems, problems.c.id == attempts.c.problem_id
+        ).join(
+            modules, modules.c.id == problems.c.module_id
+        ).join(
+            users_courses,
+            (users_courses.c.course_id == modules.c.course_id) & (users_courses.c.student_id == attempts.c.user_id)
+        ).where(modules.c.course_id == course_id).subquery()
+        await self._session.execute(
+            delete(course_student_progress).where(course_student_progress.c.course_id == course_id)
+        )
+        await self._session.execute(delete(problem_progress).where(problem_progress.c.problem_id.in_(
+            select(problems.c.id).join(modules, modules.c.id == problems.c.module_id).where(
+                modules.c.course_id == course_id
+            )
+        )))
+        students = select(
+            literal(course_id), enrolled_attempts.c.user_id, func.count()
+        ).where(enrolled_attempts.c.solved.is_(True)).group_by(enrolled_attempts.c.user_id)
+        await self._session.execute(insert(course_student_progress).from_select(
+            ["course_id", "student_id", "solved"], students
+        ))
+        course_problems = select(
+            enrolled_attempts.c.problem_id,
+            func.count(),
+            func.count().filter(enrolled_attempts.c.solved.is_(True))
+        ).group_by(enrolled_attempts.c.problem_id)
+        await self._session.execute(insert(problem_progress).from_select(
+            ["problem_id", "attempted", "solved"], course_problems
+        ))
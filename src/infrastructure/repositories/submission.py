@@ -0,0 +1,33 @@
+from datetime import datetime, timezone
+
+from sqlalchemy import select, update
+
+from src.domain.entities import Submission, Attempt
+from src.application.interfaces.repositories import SubmissionRepositoryInterface
+from src.infrastructure.db.tables import submissions
+from .base import BaseAlchemyRepository
+
+
+class AlchemySubmissionRepository(BaseAlchemyRepository, SubmissionRepositoryInterface):
+    async def add(self, submission: Submission) -> None:
+        self._session.add(submission)
+
+    async def complete(self, attempt: Attempt) -> None:
+        await self._session.execute(
+            update(submissions).where(
+                submissions.c.job_id == attempt.job_id, submissions.c.finished_at.is_(None)
+            ).values(
+                status=attempt.status,
+                passed_count=attempt.passed_count,
+                total=attempt.total,
+                finished_at=datetime.now(timezone.utc)
+            )
+        )
+
+    async def get_history(self, user_id: int, problem_id: int, limit: int = 20) -> list[Submission]:
+        res = await self._session.scalars(
+            select(Submission).where(
+                submissions.c.user_id == user_id, submissions.c.problem_id == problem_id
+            ).order_by(submissions.c.created_at.desc()).limit(limit)
+        )
+        return list(res.all())
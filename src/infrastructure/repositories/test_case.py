@@ -0,0 +1,143 @@
+import zlib
+
+from typing import Optional, Iterable, AsyncIterator
+
+from sqlalchemy import select, delete, func
+from sqlalchemy.dialects.postgresql import insert
+
+from src.domain.value_objects import TestCase, TestCases
+from src.application.interfaces.repositories import TestCaseRepositoryInterface
+from src.infrastructure.db.tables import problem_test_cases
+from .base import BaseAlchemyRepository
+
+
+COMPRESS_THRESHOLD = 1024
+"""Cases which input and output together are not shorter than threshold (in bytes) are stored compressed"""
+
+
+def pack_test_case(problem_id: int, num: int, case: TestCase, compress_threshold: int = COMPRESS_THRESHOLD) -> dict:
+    """
+    Converts case to row of problem_test_cases table
+    """
+    input_, output = case.input.encode(), case.output.encode()
+    compressed = len(input_) + len(output) >= compress_threshold
+    if compressed:
+        input_, output = zlib.compress(input_), zlib.compress(output)
+    return {
+        "problem_id": problem_id,
+        "num": num,
+        "input": input_,
+        "output": output,
+        "compressed": compressed,
+        "digest": case.digest,
+        "normalized_digest": case.normalized_digest
+    }
+
+
+def _decode(data: bytes, compressed: bool) -> str:
+    return (zlib.decompress(data) if compressed else data).decode()
+
+
+_c = problem_test_cases.c
+
+
+class AlchemyTestCaseRepository(BaseAlchemyRepository, TestCaseRepositoryInterface):
+    compress_threshold = COMPRESS_THRESHOLD
+    save_batch_size = 1000
+
+    def _select(self, with_output: bool):
+        columns = [_c.num, _c.input, _c.compressed, _c.digest, _c.normalized_digest]
+        if with_output:
+            columns.append(_c.output)
+        return select(*columns)
+
+    def _build(self, rows) -> TestCases:
+        return TestCases.from_trusted_dict({
+            row.num: {
+                "input": _decode(row.input, row.compressed),
+                "output": _decode(row.output, row.compressed) if "output" in row._fields else "",
+                "digest": row.digest,
+                "normalized_digest": row.normalized_digest
+            } for row in rows
+        })
+
+    async def get_case(self, problem_id: int, num: int) -> Optional[TestCase]:
+        res = await self._session.execute(
+            self._select(with_output=True).where(_c.problem_id == problem_id, _c.num == num)
+        )
+        return self._build(res.all()).get_case(num)
+
+    async def get_cases(self, problem_id: int, nums: Iterable[int], with_output: bool = True) -> TestCases:
+        nums = list(nums)
+        if not nums:
+            return TestCases()
+        res = await self._session.execute(
+            self._select(with_output).where(_c.problem_id == problem_id, _c.num.in_(nums))
+        )
+        return self._build(res.all())
+
+    async def get_page(self, problem_id: int, after: int = 0, size: int = 100, with_output: bool = True) -> TestCases:
+        res = await self._session.execute(
+            self._select(with_output).where(
+                _c.problem_id == problem_id, _c.num > after
+            ).order_by(_c.num).limit(size)
+        )
+        return self._build(res.all())
+
+    async def stream(self, problem_id: int, page_size: int = 500, with_output: bool = True) -> AsyncIterator[TestCases]:
+        after = 0
+        while True:
+            page = await self.get_page(problem_id, after, page_size, with_output)
+            if not page.count:
+                return
+            yield page
+            if page.count < page_size:
+                return
+            after = max(num for num, _ in page)
+
+    async def get_for_problems(self, problem_ids: Iterable[int]) -> dict[int, TestCases]:
+        """
+        Loads full suites of several problems at once
+        """
+        problem_ids = list(problem_ids)
+        if not problem_ids:
+            return {}
+        res = await self._session.execute(
+            self._select(with_output=True).add_columns(_c.problem_id).where(_c.problem_id.in_(problem_ids))
+        )
+        grouped: dict[int, list] = {problem_id: [] for problem_id in problem_ids}
+        for row in res.all():
+            grouped[row.problem_id].append(row)
+        return {problem_id: self._build(rows) for problem_id, rows in grouped.items()}
+
+    async def get_nums(self, problem_id: int) -> list[int]:
+        res = await self._session.scalars(
+            select(_c.num).where(_c.problem_id == problem_id).order_by(_c.num)
+        )
+        return list(res.all())
+
+    async def count(self, problem_id: int) -> int:
+        return await self._session.scalar(
+            select(func.count()).select_from(problem_test_cases).where(_c.problem_id == problem_id)
+        ) or 0
+
+    async def save(self, problem_id: int, test_cases: TestCases) -> None:
+        rows = [pack_test_case(problem_id, num, case, self.compress_threshold) for num, case in test_cases]
+        stmt = insert(problem_test_cases)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[_c.problem_id, _c.num],
+            set_={name: stmt.excluded[name]
+                  for name in ("input", "output", "compressed", "digest", "normalized_digest")}
+        )
+        for start in range(0, len(rows), self.save_batch_size):
+            await self._session.execute(stmt, rows[start:start + self.save_batch_size])
+
+    async def delete(self, problem_id: int, nums: Iterable[int]) -> None:
+        nums = list(nums)
+        if nums:
+            await self._session.execute(
+                delete(problem_test_cases).where(_c.problem_id == problem_id, _c.num.in_(nums))
+            )
+
+    async def clear(self, problem_id: int) -> None:
+        await self._session.execute(delete(problem_test_cases).where(_c.problem_id == problem_id))
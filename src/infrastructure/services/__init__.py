@@ -1 +1,7 @@
 from .email import AsyncEmailService
+from .smtp import SMTPConnectionPool
+from .outbox import EmailOutbox, OutboxEmail, PostgresEmailOutboxStore
+from .cache import InMemoryUserStatusCache, InMemoryCourseAccessCache, InMemoryVerdictCache
+from .batching import BatchAccumulator
+from .runners import InMemoryRunnerRegistry, RunnerConf
+from .bundles import FileProblemBundleStorage
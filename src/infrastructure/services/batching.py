@@ -0,0 +1,81 @@
+import asyncio
+
+from dataclasses import dataclass, field
+from typing import Generic, TypeVar, Hashable, Callable, Awaitable, Optional
+
+
+K = TypeVar("K", bound=Hashable)
+T = TypeVar("T")
+
+
+@dataclass
+class _Batch(Generic[T]):
+    done: asyncio.Future
+    items: list[T] = field(default_factory=list)
+    timer: Optional[asyncio.Task] = None
+
+
+class BatchAccumulator(Generic[K, T]):
+    """
+    Accumulates items by key and passes them to flush function by batches. Batch is flushed when it reaches max_size
+    or when window seconds passed since its first item was added. If no other coroutine is waiting in add,
+    nothing can join the batch (e.g. consumer dispatches messages one by one), so batch is flushed immediately.
+    Coroutine adding item waits until the batch containing item is flushed and gets error of flushing if it happened,
+    so caller is able to acknowledge item only after it was really stored
+    """
+
+    def __init__(self, flush_func: Callable[[K, list[T]], Awaitable[None]], max_size: int = 50, window: float = 0.2):
+        self._flush_func = flush_func
+        self._batches: dict[K, _Batch[T]] = {}
+        self._waiting = 0
+        self.configure(max_size, window)
+
+    def configure(self, max_size: int, window: float):
+        self._max_size = max_size
+        self._window = window
+
+    def __len__(self):
+        return sum(len(batch.items) for batch in self._batches.values())
+
+    async def add(self, key: K, item: T) -> None:
+        batch = self._batches.get(key)
+        if batch is None:
+            batch = _Batch(asyncio.get_running_loop().create_future())
+            batch.timer = asyncio.create_task(self._flush_later(key, batch))
+            self._batches[key] = batch
+        batch.items.append(item)
+        self._waiting += 1
+        try:
+            if len(batch.items) >= self._max_size:
+                await self._flush(key, batch)
+            else:
+                await asyncio.sleep(0)  # lets already dispatched handlers add their items
+                if self._waiting == 1:
+                    await self._flush(key, batch)
+            await asyncio.shield(batch.done)
+        finally:
+            self._waiting -= 1
+
+    async def _flush_later(self, key: K, batch: _Batch[T]):
+        await asyncio.sleep(self._window)
+        await self._flush(key, batch)
+
+    async def _flush(self, key: K, batch: _Batch[T]):
+        if self._batches.get(key) is not batch:
+            return
+        del self._batches[key]
+        if batch.timer and batch.timer is not asyncio.current_task():
+            batch.timer.cancel()
+        try:
+            await self._flush_func(key, batch.items)
+        except Exception as e:
+            batch.done.set_exception(e)
+        else:
+            batch.done.set_result(None)
+
+    async def drain(self):
+        """
+        Flushes all accumulated batches immediately
+        """
+        for key, batch in list(self._batches.items()):
+            await self._flush(key, batch)
@@ -0,0 +1,83 @@
+import asyncio
+import gzip
+import hashlib
+import io
+import os
+import re
+import tarfile
+import tempfile
+
+from typing import Optional, AsyncIterable
+
+from src.domain.value_objects import TestCases
+from src.application.interfaces.services import ProblemBundleStorageInterface
+
+
+_VERSION_RE = re.compile(r"^[0-9a-f]{64}$")
+
+
+class FileProblemBundleStorage(ProblemBundleStorageInterface):
+    """
+    Keeps bundles on local disk (or shared volume) as '<version>.tar.gz' files containing '<num>.in' file for every case.
+    Archives are built deterministically, so version is sha256 of archive content and bundle missing on disk of
+    app instance can be rebuilt from the same cases. Bundle is written to temporary file first and renamed
+    when complete, so runners never get partial bundle
+    """
+
+    def __init__(self, root: str, compress_level: int = 6):
+        self._root = root
+        self._compress_level = compress_level
+        os.makedirs(root, exist_ok=True)
+
+    def _path(self, version: str) -> str:
+        return os.path.join(self._root, f"{version}.tar.gz")
+
+    @staticmethod
+    def _add_part(archive: tarfile.TarFile, test_cases: TestCases):
+        for num, case in sorted(test_cases, key=lambda item: item[0]):
+            data = case.input.encode()
+            info = tarfile.TarInfo(f"{num}.in")
+            info.size = len(data)
+            info.mode = 0o644
+            archive.addfile(info, io.BytesIO(data))
+
+    @staticmethod
+    def _digest(path: str) -> str:
+        digest = hashlib.sha256()
+        with open(path, "rb") as file:
+            for chunk in iter(lambda: file.read(1024 * 1024), b""):
+                digest.update(chunk)
+        return digest.hexdigest()
+
+    def _publish(self, tmp_path: str) -> str:
+        version = self._digest(tmp_path)
+        os.replace(tmp_path, self._path(version))
+        return version
+
+    async def build(self, test_cases: AsyncIterable[TestCases]) -> str:
+        fd, tmp_path = tempfile.mkstemp(dir=self._root, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as raw:
+                with gzip.GzipFile(fileobj=raw, mode="wb", compresslevel=self._compress_level, mtime=0) as compressed:
+                    with tarfile.open(fileobj=compressed, mode="w", format=tarfile.USTAR_FORMAT) as archive:
+                        async for part in test_cases:
+                            await asyncio.to_thread(self._add_part, archive, part)
+            return await asyncio.to_thread(self._publish, tmp_path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    def locate(self, version: str) -> Optional[str]:
+        if not _VERSION_RE.match(version):
+            return None
+        path = self._path(version)
+        return path if os.path.exists(path) else None
+
+    def discard(self, version: str) -> None:
+        path = self.locate(version)
+        if path:
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
@@ -0,0 +1,131 @@
+import time
+
+from collections import OrderedDict
+from typing import Generic, TypeVar, Optional, Hashable
+
+from src.application.interfaces.services import (
+    UserStatusCacheInterface,
+    CourseAccessCacheInterface,
+    VerdictCacheInterface
+)
+
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+class TTLCache(Generic[K, V]):
+    """
+    Bounded in-process LRU cache which entries expire after ttl seconds.
+    Cache is not thread-safe and is supposed to be used inside single event loop
+    """
+
+    def __init__(self, maxsize: int, ttl: float):
+        self._maxsize = maxsize
+        self._ttl = ttl
+        self._data: OrderedDict[K, tuple[float, V]] = OrderedDict()
+
+    def __len__(self):
+        return len(self._data)
+
+    def get(self, key: K) -> Optional[V]:
+        item = self._data.get(key)
+        if item is None:
+            return None
+        expires_at, value = item
+        if expires_at <= time.monotonic():
+            del self._data[key]
+            return None
+        self._data.move_to_end(key)
+        return value
+
+    def set(self, key: K, value: V, ttl: Optional[float] = None):
+        self._data[key] = (time.monotonic() + (self._ttl if ttl is None else ttl), value)
+        self._data.move_to_end(key)
+        if len(self._data) > self._maxsize:
+            self._data.popitem(last=False)
+
+    def pop(self, key: K) -> Optional[V]:
+        item = self._data.pop(key, None)
+        return item[1] if item else None
+
+    def clear(self):
+        self._data.clear()
+
+
+class InMemoryUserStatusCache(UserStatusCacheInterface):
+    """
+    Invalidation affects only current process, so ttl should be short enough
+    to bound staleness of status on other workers
+    """
+
+    def __init__(self, maxsize: int, ttl: float):
+        self._cache: TTLCache[int, bool] = TTLCache(maxsize, ttl)
+
+    def get(self, user_id: int) -> Optional[bool]:
+        return self._cache.get(user_id)
+
+    def set(self, user_id: int, is_active: bool) -> None:
+        self._cache.set(user_id, is_active)
+
+    def invalidate(self, user_id: int) -> None:
+        self._cache.pop(user_id)
+
+
+class InMemoryCourseAccessCache(CourseAccessCacheInterface):
+    """
+    Revoked versions of claims are kept for claims_ttl seconds, after that revoked claims are expired anyway.
+    Revocations are not bounded by maxsize, so they are never evicted before claims expire: expired revocations
+    are pruned in order of revoking. Revocation affects only current process, so lifetime of claims bounds
+    staleness of access on other workers
+    """
+
+    def __init__(self, maxsize: int, ttl: float, claims_ttl: float = 300):
+        self._cache: TTLCache[tuple[int, int], tuple[Optional[int], bool]] = TTLCache(maxsize, ttl)
+        self._claims_ttl = claims_ttl
+        self._claims_versions: OrderedDict[int, tuple[float, int]] = OrderedDict()
+        """User id -> time revocation expires at and the least trusted version, in order of expiration"""
+
+    def get(self, user_id: int, course_id: int) -> Optional[tuple[Optional[int], bool]]:
+        return self._cache.get((user_id, course_id))
+
+    def set(self, user_id: int, course_id: int, access: tuple[Optional[int], bool]) -> None:
+        self._cache.set((user_id, course_id), access)
+
+    def invalidate(self, user_id: int, course_id: int) -> None:
+        self._cache.pop((user_id, course_id))
+
+    def _prune(self, now: float):
+        while self._claims_versions:
+            user_id, (expires_at, _) = next(iter(self._claims_versions.items()))
+            if expires_at > now:
+                return
+            del self._claims_versions[user_id]
+
+    def revoke_claims(self, user_id: int, version: int) -> None:
+        now = time.monotonic()
+        self._prune(now)
+        version = max(version, self.get_claims_version(user_id))
+        self._claims_versions[user_id] = (now + self._claims_ttl, version)
+        self._claims_versions.move_to_end(user_id)
+
+    def get_claims_version(self, user_id: int) -> int:
+        item = self._claims_versions.get(user_id)
+        if item is None or item[0] <= time.monotonic():
+            return 0
+        return item[1]
+
+
+class InMemoryVerdictCache(VerdictCacheInterface):
+    """
+    Entries of outdated test cases versions are never requested again and are evicted by ttl or lru
+    """
+
+    def __init__(self, maxsize: int, ttl: float):
+        self._cache: TTLCache[str, dict[int, Optional[str]]] = TTLCache(maxsize, ttl)
+
+    def get(self, key: str) -> Optional[dict[int, Optional[str]]]:
+        return self._cache.get(key)
+
+    def set(self, key: str, failed: dict[int, Optional[str]]) -> None:
+        self._cache.set(key, failed)
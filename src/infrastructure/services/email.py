@@ -1,30 +1,27 @@
-import aiosmtplib
-import asyncio
+from typing import Optional, Sequence
+
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from email.message import EmailMessage
-from src.logger import logger
 from src.application.interfaces.services import EmailServiceInterface
-from ..configs import EmailConfig
+from .outbox import EmailOutbox, OutboxEmail
 
 
 class AsyncEmailService(EmailServiceInterface):
-    def __init__(self, conf: EmailConfig):
-        self._conf = conf
+    """
+    Puts emails to outbox. With Postgres outbox email is stored by session of request,
+    so email called inside transaction is sent only if transaction is committed
+    """
+
+    def __init__(self, outbox: EmailOutbox, session: AsyncSession):
+        self._outbox = outbox
+        self._session = session
 
     async def send_mail(self, to: str, topic: str, text: str):
-        message = EmailMessage()
-        message['From'] = self._conf.email_sender
-        message['To'] = to
-        message['Subject'] = topic
-        message.set_content(text)
-        asyncio.create_task(self._def_task(message))
+        email = OutboxEmail(to, topic, text)
+        if self._outbox.store:
+            await self._outbox.store.add(self._session, email)
+        else:
+            await self._outbox.put(email)
 
-    async def _def_task(self, msg: EmailMessage):
-        async with aiosmtplib.SMTP(hostname=self._conf.email_host, port=self._conf.email_port, use_tls=True) as cli:
-            await cli.login(self._conf.email_sender, self._conf.email_sender_password)
-            try:
-                await cli.send_message(msg)
-                logger.info(f"Email with topic '{msg['Subject']}' sent to '{msg['To']}'")
-            except Exception as e:
-                logger.error(
-                    f"Unable to send email with topic '{msg['Subject']}' to '{msg["To"]}': {e}")
+    async def send_bulk(self, recipients: Sequence[str], topic: str, text: str) -> dict[str, Optional[str]]:
+        return await self._outbox.send_bulk(recipients, topic, text)
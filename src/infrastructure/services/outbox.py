@@ -0,0 +1,251 @@
+import asyncio
+
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from email.message import EmailMessage
+from typing import Optional, Sequence
+
+import aiosmtplib
+
+from sqlalchemy import select, update, delete, insert
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from src.logger import logger
+from src.infrastructure.db.tables import email_outbox
+from .smtp import SMTPConnectionPool
+
+
+@dataclass
+class OutboxEmail:
+    to: str
+    topic: str
+    text: str
+    id: Optional[int] = None
+    """Id of row in Postgres outbox if email is stored there"""
+    attempts: int = 0
+
+
+class PostgresEmailOutboxStore:
+    """
+    Durable part of outbox. Emails are written by request session, so they are committed or rolled back
+    together with transaction of use case. Claimed rows are leased for lease seconds: if process dies
+    before email is sent, row is claimed again after lease expires
+    """
+
+    def __init__(self, sessionmaker: async_sessionmaker[AsyncSession], max_attempts: int = 5, lease: float = 300):
+        self._sessionmaker = sessionmaker
+        self._max_attempts = max_attempts
+        self._lease = lease
+
+    @staticmethod
+    async def add(session: AsyncSession, email: OutboxEmail):
+        stmt = insert(email_outbox).values(recipient=email.to, topic=email.topic, text=email.text)
+        if session.in_transaction():
+            await session.execute(stmt)
+            return
+        async with session.begin():
+            await session.execute(stmt)
+
+    async def claim(self, limit: int) -> list[OutboxEmail]:
+        now = datetime.now(timezone.utc)
+        due = select(email_outbox.c.id).where(
+            email_outbox.c.next_attempt_at <= now, email_outbox.c.attempts < self._max_attempts
+        ).order_by(email_outbox.c.id).limit(limit).with_for_update(skip_locked=True)
+        async with self._sessionmaker() as session, session.begin():
+            rows = await session.execute(
+                update(email_outbox).where(email_outbox.c.id.in_(due.scalar_subquery())).values(
+                    next_attempt_at=now + timedelta(seconds=self._lease)
+                ).returning(email_outbox.c.id, email_outbox.c.recipient, email_outbox.c.topic,
+                            email_outbox.c.text, email_outbox.c.attempts)
+            )
+            return [OutboxEmail(to, topic, text, id_, attempts) for id_, to, topic, text, attempts in rows]
+
+    async def complete(self, email_id: int):
+        async with self._sessionmaker() as session, session.begin():
+            await session.execute(delete(email_outbox).where(email_outbox.c.id == email_id))
+
+    async def retry_later(self, email_id: int, attempts: int, delay: float):
+        async with self._sessionmaker() as session, session.begin():
+            await session.execute(update(email_outbox).where(email_outbox.c.id == email_id).values(
+                attempts=attempts,
+                next_attempt_at=datetime.now(timezone.utc) + timedelta(seconds=delay)
+            ))
+
+
+class EmailOutbox:
+    """
+    Bounded queue of outgoing emails drained by fixed pool of workers, so number of SMTP sessions never exceeds
+    count of workers. Putting email waits while queue is full. Failed email is retried with exponential backoff
+    up to max_attempts times, email rejected by server with permanent (5xx) reply is not retried. If store is given, emails are written to Postgres outbox and poller moves
+    due emails from it to queue, so emails survive restarts.
+    Outbox must be drained on shutdown: emails in queue are sent, emails left in store are sent after restart.
+    Bulk emails are sent bypassing queue because caller waits for results, no more batches are sent at once
+    than connections in pool
+    """
+
+    def __init__(
+        self,
+        pool: SMTPConnectionPool,
+        sender: str,
+        maxsize: int = 1000,
+        workers: int = 4,
+        max_attempts: int = 5,
+        retry_delay: float = 1,
+        retry_max_delay: float = 60,
+        store: Optional[PostgresEmailOutboxStore] = None,
+        poll_interval: float = 1,
+        bulk_batch_size: int = 100
+    ):
+        self._pool = pool
+        self._sender = sender
+        self._queue: asyncio.Queue[OutboxEmail] = asyncio.Queue(maxsize)
+        self._workers_count = workers
+        self._max_attempts = max_attempts
+        self._retry_delay = retry_delay
+        self._retry_max_delay = retry_max_delay
+        self._store = store
+        self._poll_interval = poll_interval
+        self._bulk_batch_size = bulk_batch_size
+        self._tasks: list[asyncio.Task] = []
+        self._poller: Optional[asyncio.Task] = None
+        self._closed = False
+
+    @property
+    def store(self) -> Optional[PostgresEmailOutboxStore]:
+        return self._store
+
+    def __len__(self):
+        return self._queue.qsize()
+
+    def start(self):
+        self._tasks = [asyncio.create_task(self._work()) for _ in range(self._workers_count)]
+        if self._store:
+            self._poller = asyncio.create_task(self._poll())
+
+    async def put(self, email: OutboxEmail):
+        if self._closed:
+            raise RuntimeError("Outbox is closed")
+        await self._queue.put(email)
+
+    @staticmethod
+    def _is_permanent(error: Exception) -> bool:
+        return isinstance(error, aiosmtplib.SMTPResponseException) and error.code >= 500
+
+    def _backoff(self, attempts: int) -> float:
+        return min(self._retry_delay * 2 ** (attempts - 1), self._retry_max_delay)
+
+    def _make_message(self, email: OutboxEmail) -> EmailMessage:
+        message = EmailMessage()
+        message['From'] = self._sender
+        message['To'] = email.to
+        message['Subject'] = email.topic
+        message.set_content(email.text)
+        return message
+
+    async def _send_batch(self, message: EmailMessage, recipients: list[str]) -> dict[str, Optional[str]]:
+        attempts = 0
+        while True:
+            try:
+                errors, _ = await self._pool.send(message, recipients)
+            except aiosmtplib.SMTPRecipientsRefused as e:
+                refused = {error.recipient: f"{error.code} {error.message}" for error in e.recipients}
+                return {recipient: refused.get(recipient, str(e)) for recipient in recipients}
+            except Exception as e:
+                attempts += 1
+                if self._is_permanent(e) or attempts >= self._max_attempts:
+                    logger.error(f"Unable to send email with topic '{message['Subject']}' to {len(recipients)} recipients: {e}")
+                    return {recipient: str(e) for recipient in recipients}
+                await asyncio.sleep(self._backoff(attempts))
+            else:
+                return {
+                    recipient: f"{errors[recipient].code} {errors[recipient].message}" if recipient in errors else None
+                    for recipient in recipients
+                }
+
+    async def send_bulk(self, recipients: Sequence[str], topic: str, text: str) -> dict[str, Optional[str]]:
+        """
+        Message is rendered once and sent with up to bulk_batch_size recipients in envelope per SMTP transaction.
+        Recipients are not shown in headers of message
+        """
+        if self._closed:
+            raise RuntimeError("Outbox is closed")
+        message = self._make_message(OutboxEmail("undisclosed-recipients:;", topic, text))
+        unique = list(dict.fromkeys(recipients))
+        batches = [unique[start:start + self._bulk_batch_size] for start in range(0, len(unique), self._bulk_batch_size)]
+        slots = asyncio.Semaphore(self._pool.size)
+
+        async def send_batch(batch: list[str]) -> dict[str, Optional[str]]:
+            async with slots:
+                return await self._send_batch(message, batch)
+
+        results: dict[str, Optional[str]] = {}
+        for batch_results in await asyncio.gather(*(send_batch(batch) for batch in batches)):
+            results.update(batch_results)
+        logger.info(f"Email with topic '{topic}' sent to {sum(error is None for error in results.values())} "
+                    f"of {len(results)} recipients")
+        return results
+
+    async def _send(self, email: OutboxEmail):
+        while True:
+            try:
+                await self._pool.send(self._make_message(email))
+            except Exception as e:
+                email.attempts += 1
+                if self._is_permanent(e):
+                    email.attempts = self._max_attempts
+                if email.attempts >= self._max_attempts:
+                    logger.error(f"Unable to send email with topic '{email.topic}' to '{email.to}': {e}")
+                    if email.id is not None:
+                        await self._store.retry_later(email.id, email.attempts, 0)  # type: ignore
+                    return
+                delay = self._backoff(email.attempts)
+                logger.warning(f"Email to '{email.to}' failed ({e}), retry in {delay}s")
+                if email.id is not None:
+                    await self._store.retry_later(email.id, email.attempts, delay)  # type: ignore
+                    return
+                await asyncio.sleep(delay)
+            else:
+                logger.info(f"Email with topic '{email.topic}' sent to '{email.to}'")
+                if email.id is not None:
+                    await self._store.complete(email.id)  # type: ignore
+                return
+
+    async def _work(self):
+        while True:
+            email = await self._queue.get()
+            try:
+                await self._send(email)
+            except Exception as e:
+                logger.error(f"Email worker error: {e}")
+            finally:
+                self._queue.task_done()
+
+    async def _poll(self):
+        while True:
+            free = self._queue.maxsize - self._queue.qsize()
+            emails = []
+            if free > 0:
+                try:
+                    emails = await self._store.claim(free)  # type: ignore
+                except Exception as e:
+                    logger.error(f"Unable to claim emails from outbox: {e}")
+            for email in emails:
+                await self._queue.put(email)
+            if not emails:
+                await asyncio.sleep(self._poll_interval)
+
+    async def drain(self, timeout: Optional[float] = None):
+        """
+        Stops accepting emails and waits until queued emails are sent or timeout passes
+        """
+        self._closed = True
+        if self._poller:
+            self._poller.cancel()
+        try:
+            await asyncio.wait_for(self._queue.join(), timeout)
+        except asyncio.TimeoutError:
+            logger.warning(f"{self._queue.qsize()} emails were not sent before shutdown")
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, *([self._poller] if self._poller else []), return_exceptions=True)
+        self._tasks, self._poller = [], None
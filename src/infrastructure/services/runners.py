@@ -0,0 +1,159 @@
+import time
+
+from dataclasses import dataclass, field
+from typing import Optional, Sequence, Mapping
+
+import yaml
+
+from pydantic import BaseModel
+
+from src.application.interfaces.services import RunnerRegistryInterface
+from src.logger import logger
+
+
+class RunnerConf(BaseModel):
+    name: str
+    queue: str
+    langs: Optional[list[str]] = None
+    """Languages supported by runner. Runner without specified languages accepts any language"""
+    max_in_flight: Optional[int] = None
+
+
+class RunnersConf(BaseModel):
+    runners: list[RunnerConf]
+
+
+@dataclass
+class RunnerState:
+    conf: RunnerConf
+    in_flight: dict[str, float] = field(default_factory=dict)
+    """Started jobs in order of their start: job_id -> start time"""
+    latency: Optional[float] = None
+    """EWMA of jobs duration in seconds"""
+    unhealthy_until: float = 0
+
+    def accepts(self, lang: str, now: float, in_flight: int) -> bool:
+        if self.unhealthy_until > now:
+            return False
+        if self.conf.langs is not None and lang not in self.conf.langs:
+            return False
+        return self.conf.max_in_flight is None or in_flight < self.conf.max_in_flight
+
+    def load(self, in_flight: int, default_latency: float) -> float:
+        """
+        Expected time to finish in flight jobs and the new one
+        """
+        return (in_flight + 1) * (self.latency or default_latency)
+
+
+class InMemoryRunnerRegistry(RunnerRegistryInterface):
+    """
+    Keeps latency and health of runners in process memory. Count of in flight jobs is taken from shared storage
+    when it is passed to acquire, so load includes jobs sent by every app instance. Otherwise only jobs acquired
+    by this instance are counted and job which result was not got within job_timeout releases runner
+    and is counted with duration equal to timeout. Runner that could not accept a job is excluded
+    from dispatching by this instance for cooldown seconds
+    """
+
+    def __init__(
+        self,
+        runners: Sequence[RunnerConf],
+        ewma_alpha: float = 0.2,
+        job_timeout: float = 60,
+        cooldown: float = 30,
+        default_latency: float = 1
+    ):
+        if not runners:
+            raise ValueError("At least one runner should be configured")
+        self._runners = [RunnerState(conf) for conf in runners]
+        self._jobs: dict[str, RunnerState] = {}
+        self._shared_jobs: set[str] = set()
+        """Jobs counted by shared storage which may be completed by other instances"""
+        self._alpha = ewma_alpha
+        self._job_timeout = job_timeout
+        self._cooldown = cooldown
+        self._default_latency = default_latency
+
+    @classmethod
+    def from_yaml(cls, path: str, **kwargs):
+        with open(path) as f:
+            conf = RunnersConf.model_validate(yaml.safe_load(f))
+        logger.info(f"Loaded {len(conf.runners)} runners from '{path}'")
+        return cls(conf.runners, **kwargs)
+
+    @property
+    def runners(self) -> list[RunnerState]:
+        return self._runners
+
+    def _observe(self, runner: RunnerState, duration: float):
+        if runner.latency is None:
+            runner.latency = duration
+        else:
+            runner.latency = self._alpha * duration + (1 - self._alpha) * runner.latency
+
+    def _expire(self, now: float):
+        for runner in self._runners:
+            for job_id, started in list(runner.in_flight.items()):
+                if now - started < self._job_timeout:
+                    break
+                del runner.in_flight[job_id]
+                self._jobs.pop(job_id, None)
+                if job_id in self._shared_jobs:
+                    self._shared_jobs.discard(job_id)
+                else:
+                    self._observe(runner, self._job_timeout)
+
+    def supports(self, lang: str) -> bool:
+        return any(runner.conf.langs is None or lang in runner.conf.langs for runner in self._runners)
+
+    def acquire(self, lang: str, job_id: str, in_flight: Optional[Mapping[str, int]] = None) -> Optional[str]:
+        now = time.monotonic()
+        self._expire(now)
+
+        def count(runner: RunnerState) -> int:
+            if in_flight is None:
+                return len(runner.in_flight)
+            return in_flight.get(runner.conf.queue, 0)
+
+        candidates = [runner for runner in self._runners if runner.accepts(lang, now, count(runner))]
+        if not candidates:
+            return None
+        runner = min(candidates, key=lambda r: r.load(count(r), self._default_latency))
+        runner.in_flight[job_id] = now
+        self._jobs[job_id] = runner
+        if in_flight is not None:
+            self._shared_jobs.add(job_id)
+        return runner.conf.queue
+
+    def _pop(self, job_id: str) -> Optional[RunnerState]:
+        runner = self._jobs.pop(job_id, None)
+        self._shared_jobs.discard(job_id)
+        if runner:
+            runner.in_flight.pop(job_id, None)
+        return runner
+
+    def complete(self, job_id: str, queue: Optional[str] = None, duration: Optional[float] = None) -> None:
+        started = None
+        runner = self._jobs.get(job_id)
+        if runner:
+            started = runner.in_flight.get(job_id)
+            self._pop(job_id)
+        elif queue is not None:
+            runner = next((r for r in self._runners if r.conf.queue == queue), None)
+        if not runner:
+            return
+        if duration is None and started is not None:
+            duration = time.monotonic() - started
+        if duration is not None:
+            self._observe(runner, duration)
+        runner.unhealthy_until = 0
+
+    def release(self, job_id: str) -> None:
+        self._pop(job_id)
+
+    def fail(self, job_id: str) -> None:
+        runner = self._pop(job_id)
+        if not runner:
+            return
+        runner.unhealthy_until = time.monotonic() + self._cooldown
+        logger.warning(f"Runner '{runner.conf.name}' is marked as unhealthy for {self._cooldown}s")
@@ -0,0 +1,123 @@
+import asyncio
+import time
+
+from contextlib import asynccontextmanager
+from email.message import EmailMessage
+from typing import Optional, AsyncIterator
+
+import aiosmtplib
+
+from src.logger import logger
+
+
+_CONNECTION_ERRORS = (aiosmtplib.SMTPServerDisconnected, aiosmtplib.SMTPConnectError, ConnectionError)
+
+
+class SMTPConnectionPool:
+    """
+    Keeps up to size connections to SMTP server opened and authenticated, so emails are not sent
+    with new TLS handshake and login each. Connection idle longer than idle_timeout is closed instead of reuse.
+    Message failed because connection was dropped by server is sent once more on new connection.
+    Pool is supposed to be used inside single event loop
+    """
+
+    def __init__(
+        self,
+        hostname: str,
+        port: int,
+        username: Optional[str] = None,
+        password: Optional[str] = None,
+        use_tls: bool = True,
+        size: int = 2,
+        idle_timeout: float = 60,
+        timeout: float = 30
+    ):
+        self._hostname = hostname
+        self._port = port
+        self._username = username
+        self._password = password
+        self._use_tls = use_tls
+        self._idle_timeout = idle_timeout
+        self._timeout = timeout
+        self._size = size
+        self._slots = asyncio.Semaphore(size)
+        self._idle: list[tuple[float, aiosmtplib.SMTP]] = []
+        """Idle connections with time they were released at. The last released connection is taken first"""
+
+    @property
+    def size(self) -> int:
+        return self._size
+
+    @property
+    def idle_count(self) -> int:
+        return len(self._idle)
+
+    async def _connect(self) -> aiosmtplib.SMTP:
+        conn = aiosmtplib.SMTP(
+            hostname=self._hostname,
+            port=self._port,
+            use_tls=self._use_tls,
+            timeout=self._timeout
+        )
+        await conn.connect()
+        if self._username and self._password:
+            try:
+                await conn.login(self._username, self._password)
+            except Exception:
+                conn.close()
+                raise
+        return conn
+
+    @staticmethod
+    async def _quit(conn: aiosmtplib.SMTP):
+        try:
+            await conn.quit()
+        except Exception:
+            conn.close()
+
+    async def _take(self) -> aiosmtplib.SMTP:
+        while self._idle:
+            released_at, conn = self._idle.pop()
+            if not conn.is_connected:
+                continue
+            if time.monotonic() - released_at >= self._idle_timeout:
+                await self._quit(conn)
+                continue
+            return conn
+        return await self._connect()
+
+    @asynccontextmanager
+    async def acquire(self) -> AsyncIterator[aiosmtplib.SMTP]:
+        """
+        Gives connection for exclusive use. Connection is returned to pool if it is alive and the last
+        command got proper response from server
+        """
+        async with self._slots:
+            conn = await self._take()
+            try:
+                yield conn
+            except (aiosmtplib.SMTPResponseException, aiosmtplib.SMTPRecipientsRefused):
+                self._release(conn)
+                raise
+            except BaseException:
+                conn.close()
+                raise
+            self._release(conn)
+
+    def _release(self, conn: aiosmtplib.SMTP):
+        if conn.is_connected:
+            self._idle.append((time.monotonic(), conn))
+
+    async def send(self, message: EmailMessage, recipients: Optional[list[str]] = None):
+        try:
+            async with self.acquire() as conn:
+                return await conn.send_message(message, recipients=recipients)
+        except _CONNECTION_ERRORS as e:
+            logger.warning(f"SMTP connection dropped, reconnecting: {e}")
+        async with self.acquire() as conn:
+            return await conn.send_message(message, recipients=recipients)
+
+    async def close(self):
+        idle, self._idle = self._idle, []
+        for _, conn in idle:
+            await self._quit(conn)
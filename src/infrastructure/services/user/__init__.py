@@ -1,2 +1,2 @@
 from .jwt_auth import JWTAuthenticationService
-from .password import PasswordService
+from .password import PasswordService, create_password_executor
@@ -1,3 +1,4 @@
+import hashlib
 import jwt
 import time
 
@@ -6,17 +7,31 @@ from typing import Optional
 
 from .exceptions import JWTUnauthorizedError
 from src.application.interfaces.services import AuthenticationServiceInterface
+from src.application.dtos.auth import CourseAccessClaimsDTO
+from ..cache import TTLCache
 from src.logger import logger
 
 
+COURSE_ACCESS_TOKEN_TYPE = "course_access"
+
+
 class JWTAuthenticationService(AuthenticationServiceInterface):
+    """
+    Payloads of verified tokens are kept in bounded LRU keyed by hash of token until token expires,
+    so repeated verification of the same token is a dict lookup. Invalid tokens are never cached
+    """
+
     def __init__(
         self,
         exp_time: int,
-        secret: str
+        secret: str,
+        course_access_exp_time: int = 300,
+        decode_cache_size: int = 10000
     ):
         self._exp = exp_time
         self._secret = secret
+        self._course_access_exp = course_access_exp_time
+        self._decoded: Optional[TTLCache[bytes, dict]] = TTLCache(decode_cache_size, exp_time) if decode_cache_size else None
 
     def generate_token(self, user_id: int, exp: Optional[int] = None) -> str:
         return self.encode({"user_id": user_id}, exp=exp)
@@ -28,8 +43,34 @@ class JWTAuthenticationService(AuthenticationServiceInterface):
             raise JWTUnauthorizedError("Token invlaid", status=401)
         return payload.get("user_id")
 
+    def generate_course_access_token(self, claims: CourseAccessClaimsDTO) -> str:
+        return self.encode(
+            {"typ": COURSE_ACCESS_TOKEN_TYPE, **claims.model_dump()},
+            exp=self._course_access_exp
+        )
+
+    def get_course_access_claims(self, token: str) -> Optional[CourseAccessClaimsDTO]:
+        try:
+            payload = self.decode(token)
+        except jwt.InvalidTokenError:
+            return None
+        if payload.get("typ") != COURSE_ACCESS_TOKEN_TYPE:
+            return None
+        try:
+            return CourseAccessClaimsDTO.model_validate(payload)
+        except ValueError:
+            return None
+
     def decode(self, token: str) -> dict:
-        return jwt.decode(token, self._secret, ["HS256"])
+        if self._decoded is None:
+            return jwt.decode(token, self._secret, ["HS256"])
+        key = hashlib.blake2b(token.encode(), digest_size=16).digest()
+        payload = self._decoded.get(key)
+        if payload is None:
+            payload = jwt.decode(token, self._secret, ["HS256"])
+            exp = payload.get("exp")
+            self._decoded.set(key, payload, ttl=None if exp is None else exp - time.time())
+        return dict(payload)
 
     def encode(self, payload: dict, exp: Optional[int] = None) -> str:
         payload.update({"exp": int(time.time() + (exp or self._exp))})
@@ -1,17 +1,98 @@
+import asyncio
+import time
+
+from concurrent.futures import Executor, ThreadPoolExecutor, ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Callable, TypeVar
+
 from passlib.context import CryptContext
 
+from src.application.interfaces.services import PasswordServiceInterface
+from src.logger import logger
+
+
+T = TypeVar("T")
+
+_context = CryptContext(
+    schemes=["pbkdf2_sha256"],
+    pbkdf2_sha256__default_rounds=300000,
+    pbkdf2_sha256__salt_size=16,
+    deprecated="auto"
+)
+
+
+def _hash(raw_password: str) -> str:
+    return _context.hash(raw_password)
+
+
+def _verify(checking: str, hashed: str) -> bool:
+    return _context.verify(checking, hashed)
+
+
+def create_password_executor(kind: str, workers: int) -> Executor:
+    """
+    pbkdf2 implementation of hashlib releases GIL, so thread pool is enough in most cases.
+    Process pool can be used to isolate hashing from the app worker completely
+    """
+    if kind == "process":
+        return ProcessPoolExecutor(max_workers=workers)
+    if kind == "thread":
+        return ThreadPoolExecutor(max_workers=workers, thread_name_prefix="password")
+    raise ValueError(f"Undefined executor kind: {kind}. Should be 'thread' or 'process'")
+
+
+@dataclass(frozen=True)
+class PasswordPoolStats:
+    in_flight: int
+    waiting: int
+    completed: int
+    max_wait: float
+    """The longest time (in seconds) operation waited in queue"""
+
+
+class PasswordService(PasswordServiceInterface):
+    """
+    Operations exceeding max_concurrency wait in queue. Operation waited longer than wait_warning seconds
+    is logged with current load of pool, so saturation of pool is visible in logs
+    """
+
+    def __init__(self, executor: Executor, max_concurrency: int, wait_warning: float = 0.5):
+        self._executor = executor
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._wait_warning = wait_warning
+        self._in_flight = 0
+        self._waiting = 0
+        self._completed = 0
+        self._max_wait = 0.0
+
+    @property
+    def stats(self) -> PasswordPoolStats:
+        """
+        Current load of pool. 'waiting' is the count of operations queued behind concurrency limit
+        """
+        return PasswordPoolStats(self._in_flight, self._waiting, self._completed, self._max_wait)
 
-class PasswordService:
-    def __init__(self):
-        self._context = CryptContext(
-            schemes=["pbkdf2_sha256"],
-            pbkdf2_sha256__default_rounds=300000,
-            pbkdf2_sha256__salt_size=16,
-            deprecated="auto"
-        )
+    async def _run(self, func: Callable[..., T], *args) -> T:
+        self._waiting += 1
+        started = time.monotonic()
+        try:
+            await self._semaphore.acquire()
+        finally:
+            self._waiting -= 1
+        waited = time.monotonic() - started
+        self._max_wait = max(self._max_wait, waited)
+        if waited >= self._wait_warning:
+            logger.warning(f"Password pool is saturated: operation waited {waited:.2f}s, {self.stats}")
+        self._in_flight += 1
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self._executor, func, *args)
+        finally:
+            self._in_flight -= 1
+            self._completed += 1
+            self._semaphore.release()
 
-    def hash_password(self, raw_password: str) -> str:
-        return self._context.hash(raw_password)
+    async def hash_password(self, raw_password: str) -> str:
+        return await self._run(_hash, raw_password)
 
-    def check_password(self, hashed: str, checking: str) -> bool:
-        return self._context.verify(checking, hashed)
+    async def check_password(self, hashed: str, checking: str) -> bool:
+        return await self._run(_verify, checking, hashed)
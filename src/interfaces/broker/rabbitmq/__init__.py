@@ -1 +1 @@
-from .callback import callback_registry
+from .callback import callback_registry, callback_batcher
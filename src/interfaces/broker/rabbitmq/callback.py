@@ -1,8 +1,28 @@
-from pydantic import BaseModel
-from fastapi import Depends
-
 from ploomby.registry import HandlersRegistry
 
+from src.application.dtos.callback import CodeRunCallbackDTO
+from src.application.use_cases import CodeRunCallbackUseCase
+from src.infrastructure.services import BatchAccumulator
+from src.container import container
 from src.logger import logger
 
 callback_registry = HandlersRegistry()
+
+
+async def store_code_run_results(key: tuple[int, int], results: list[CodeRunCallbackDTO]):
+    user_id, problem_id = key
+    async with container() as request_container:
+        use_case = await request_container.get(CodeRunCallbackUseCase)
+        await use_case.execute(user_id, problem_id, results)
+    logger.debug(f"{len(results)} results of problem {problem_id} stored")
+
+
+callback_batcher: BatchAccumulator[tuple[int, int], CodeRunCallbackDTO] = BatchAccumulator(store_code_run_results)
+
+
+@callback_registry.register("code_run_result")
+async def handle_code_run_result(dto: CodeRunCallbackDTO):
+    """
+    Results are accumulated per attempt, so message is acknowledged only after its batch was stored
+    """
+    await callback_batcher.add((dto.user_id, dto.problem_id), dto)
@@ -2,3 +2,4 @@ from .auth import auth_router
 from .user import user_router
 from .teacher import teacher_router
 from .student import student_router
+from .bundle import bundle_router
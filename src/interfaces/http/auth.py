@@ -5,6 +5,7 @@ from dishka.integrations.fastapi import FromDishka, DishkaRoute
 from src.domain.value_objects import AuthenticatedUserId
 from src.application.dtos.auth import RegisterUserRequestDTO, LoginUserDTO
 from src.application.use_cases import *
+from src.infrastructure.configs import AppConfig
 
 
 auth_router = APIRouter(prefix="/auth", tags=["Auth"], route_class=DishkaRoute)
@@ -31,11 +32,12 @@ async def registration_confirm(
 async def login(
     dto: LoginUserDTO,
     use_case: FromDishka[LoginUser],
+    conf: FromDishka[AppConfig],
     token: str = Cookie(default=None, include_in_schema=False)
 ):
     token = await use_case.execute(dto)
     resp = JSONResponse({"detail": "Logged in"})
-    resp.set_cookie("token", token)
+    resp.set_cookie("token", token, **conf.cookie_options)
     return resp
 
 
@@ -43,4 +45,5 @@ async def login(
 async def logout(user_id: FromDishka[AuthenticatedUserId]):
     resp = JSONResponse({"detail": "Logged out"})
     resp.delete_cookie("token")
+    resp.delete_cookie("course_access")
     return resp
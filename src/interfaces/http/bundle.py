@@ -0,0 +1,26 @@
+from fastapi import APIRouter
+from fastapi.responses import FileResponse
+from dishka.integrations.fastapi import FromDishka, DishkaRoute
+
+from src.application.use_cases import GetProblemBundle
+from src.domain.value_objects import AuthenticatedRunner
+
+bundle_router = APIRouter(prefix="/bundles", tags=["Runners"], route_class=DishkaRoute)
+
+
+@bundle_router.get("/{version}")
+async def get_problem_bundle(
+    version: str,
+    runner: FromDishka[AuthenticatedRunner],
+    use_case: FromDishka[GetProblemBundle]
+):
+    """
+    Returns bundle of problem test cases to runners authorized by runner token in "Authorization: Bearer" header.
+    Bundle is content-addressed and never changes, so runners may cache it forever, but shared proxies must not
+    """
+    path = await use_case.execute(version)
+    return FileResponse(
+        path,
+        media_type="application/gzip",
+        headers={"Cache-Control": "private, max-age=31536000, immutable", "ETag": f'"{version}"'}
+    )
@@ -1,10 +1,21 @@
 from typing import Optional
 
-from fastapi import APIRouter
+from fastapi import APIRouter, Query
 from dishka.integrations.fastapi import FromDishka, DishkaRoute
 
-from src.application.use_cases import ShowStudentCourses, ShowStudentCourse
-from src.application.dtos.student import SendProblemSolutionDTO
+from src.application.use_cases import (
+    ShowStudentCourses,
+    ShowStudentCourse,
+    SendProblemSolution,
+    ShowAttemptProgress,
+    ShowSubmissions
+)
+from src.application.dtos.student import (
+    SendProblemSolutionDTO,
+    SolutionJobDTO,
+    AttemptProgressDTO,
+    SubmissionDTO
+)
 from src.application.dtos.course import (
     CourseG7
 )
@@ -35,11 +46,39 @@ async def get_problem_to_solve(
     pass
 
 
-@student_router.post("/course/{course_id}/problem/{problem_id}")
+@student_router.post("/course/{course_id}/problem/{problem_id}", status_code=202)
 async def send_problem_solution(
     course_id: int,
     problem_id: int,
     dto: SendProblemSolutionDTO,
-    user_id: FromDishka[AuthenticatedStudentId]
-):
-    pass
+    user_id: FromDishka[AuthenticatedStudentId],
+    use_case: FromDishka[SendProblemSolution]
+) -> SolutionJobDTO:
+    """
+    Solution is checked asynchronously by runners. Verdict is available by attempt after all results are got
+    """
+    return SolutionJobDTO(job_id=await use_case.execute(user_id, course_id, problem_id, dto))
+
+
+@student_router.get("/course/{course_id}/problem/{problem_id}/attempt")
+async def get_attempt_progress(
+    course_id: int,
+    problem_id: int,
+    user_id: FromDishka[AuthenticatedStudentId],
+    use_case: FromDishka[ShowAttemptProgress]
+) -> Optional[AttemptProgressDTO]:
+    return await use_case.execute(user_id, problem_id)
+
+
+@student_router.get("/course/{course_id}/problem/{problem_id}/submissions")
+async def get_submissions(
+    course_id: int,
+    problem_id: int,
+    user_id: FromDishka[AuthenticatedStudentId],
+    use_case: FromDishka[ShowSubmissions],
+    limit: int = Query(20, ge=1, le=100)
+) -> list[SubmissionDTO]:
+    """
+    Returns latest solutions of student on problem starting from the newest one
+    """
+    return await use_case.execute(user_id, problem_id, limit)
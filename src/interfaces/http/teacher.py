@@ -1,6 +1,6 @@
 from typing import Optional
 
-from fastapi import APIRouter
+from fastapi import APIRouter, Request
 from dishka.integrations.fastapi import FromDishka, DishkaRoute
 
 from src.application.dtos.course import (
@@ -22,10 +22,12 @@ from src.application.dtos.teacher import (
 )
 from src.application.use_cases import (
     ShowTeacherCourseToManageProblems,
+    ShowTeacherCourseToUpdateProblems,
     ShowTeacherCourseToManageStudents,
     UpdateCourseData,
     GenerateInviteLink,
     AddProblem,
+    UploadTestCases,
     DeleteProblems,
     DeleteModules,
     AddStudents,
@@ -33,7 +35,10 @@ from src.application.use_cases import (
     AddTags,
     DeleteTags,
 )
+from src.application.dtos.problem import UploadedTestCasesDTO
 from src.domain.value_objects import AuthenticatedTeacherId
+from src.infrastructure.configs import AppConfig
+from .uploads import read_test_cases
 teacher_router = APIRouter(prefix="/teaching", tags=["Manage teaching"], route_class=DishkaRoute)
 
 
@@ -44,8 +49,8 @@ async def get_teacher_course_to_manage_students(
     use_case: FromDishka[ShowTeacherCourseToManageStudents]
 ) -> Optional[CourseG4]:
     """
-    Endpoint returns data of course with all students, tags and tags students data.
-    Need to add additional data for indicators of progress 
+    Endpoint returns data of course with all students, tags and tags students data
+    with count of solved problems of every student and solve rate of every tag
     """
     return await use_case.execute(course_id)
 
@@ -57,8 +62,8 @@ async def get_teacher_course_to_manage_problems(
     use_case: FromDishka[ShowTeacherCourseToManageProblems]
 ) -> Optional[CourseG3]:
     """
-    Endpoint returns data of course with all needed modules and modules problems data.
-    Need to add additional data for indicators of progress 
+    Endpoint returns data of course with all needed modules and modules problems data
+    with count of students who tried and solved every problem
     """
     return await use_case.execute(course_id)
 
@@ -87,7 +92,7 @@ async def create_invite_link(
 async def get_course_to_update_problems(
     course_id: int,
     user_id: FromDishka[AuthenticatedTeacherId],
-    use_case: FromDishka[ShowTeacherCourseToManageProblems]
+    use_case: FromDishka[ShowTeacherCourseToUpdateProblems]
 ) -> Optional[CourseG6]:
     return await use_case.execute(course_id)
 
@@ -102,6 +107,28 @@ async def add_problem(
     return await use_case.execute(course_id, dto)
 
 
+@teacher_router.put("/course/{course_id}/problem/{problem_id}/test_cases")
+async def upload_test_cases(
+    course_id: int,
+    problem_id: int,
+    request: Request,
+    conf: FromDishka[AppConfig],
+    use_case: FromDishka[UploadTestCases],
+    user_id: FromDishka[AuthenticatedTeacherId]
+) -> UploadedTestCasesDTO:
+    """
+    Replaces test cases of problem with suite streamed in request body. Suite is sent either as NDJSON
+    (application/x-ndjson) of objects like {"test_num": 1, "input": "...", "output": "..."}
+    or as zip or tar archive (application/zip, application/x-tar, application/gzip) of files '<num>.in' and '<num>.out'
+    """
+    return await use_case.execute(course_id, problem_id, read_test_cases(
+        request.headers.get("content-type", ""),
+        request.stream(),
+        conf.test_cases_upload_max_size,
+        conf.test_case_max_size
+    ))
+
+
 @teacher_router.delete("/course/{course_id}/problems")
 async def delete_problems(
     course_id: int,
@@ -0,0 +1,190 @@
+import asyncio
+import json
+import os
+import tarfile
+import zipfile
+
+from tempfile import SpooledTemporaryFile
+from typing import AsyncIterable, AsyncIterator, Union
+
+from src.domain.exc import HandlingError
+from src.domain.value_objects import TestCase
+from src.domain.value_objects.test_case import TestCasesDataType
+
+
+NDJSON_TYPES = {"application/x-ndjson", "application/ndjson", "application/jsonl"}
+ARCHIVE_TYPES = {
+    "application/zip",
+    "application/x-zip-compressed",
+    "application/x-tar",
+    "application/gzip",
+    "application/x-gzip",
+    "application/octet-stream"
+}
+SPOOL_MEMORY_SIZE = 1024 * 1024
+"""Uploaded archives greater than this size (in bytes) are spooled to disk"""
+PART_MAX_CASES = 500
+PART_MAX_SIZE = 8 * 1024 * 1024
+READ_GROUP_SIZE = 100
+
+
+class InvalidUploadError(HandlingError):
+    pass
+
+
+async def _limit_size(chunks: AsyncIterable[bytes], max_size: int) -> AsyncIterator[bytes]:
+    total = 0
+    async for chunk in chunks:
+        total += len(chunk)
+        if total > max_size:
+            raise InvalidUploadError("Uploaded suite is too large", status=413)
+        yield chunk
+
+
+def _parse_ndjson_line(line: bytes) -> tuple[int, TestCase]:
+    try:
+        data = json.loads(line)
+        num = data["test_num"]
+        case = TestCase.from_dict({"input": data["input"], "output": data["output"]})
+    except (ValueError, KeyError, TypeError) as e:
+        raise InvalidUploadError(f"Invalid test case line: {e}")
+    if isinstance(num, bool) or not isinstance(num, int):
+        raise InvalidUploadError(f"Invalid test case line: test_num should be int, got {json.dumps(num)}")
+    return num, case
+
+
+async def read_ndjson_cases(chunks: AsyncIterable[bytes], max_case_size: int) -> AsyncIterator[tuple[int, TestCase]]:
+    """
+    Parses stream of lines like {"test_num": 1, "input": "...", "output": "..."}. Only current line is kept in memory
+    """
+    buffer = bytearray()
+    async for chunk in chunks:
+        buffer += chunk
+        start = 0
+        while (end := buffer.find(b"\n", start)) != -1:
+            if end - start > max_case_size:
+                raise InvalidUploadError("Test case is too large", status=413)
+            line = bytes(buffer[start:end])
+            start = end + 1
+            if line.strip():
+                yield _parse_ndjson_line(line)
+        del buffer[:start]
+        if len(buffer) > max_case_size:
+            raise InvalidUploadError("Test case is too large", status=413)
+    if buffer.strip():
+        yield _parse_ndjson_line(bytes(buffer))
+
+
+class _ArchiveReader:
+    """
+    Random access to cases of zip or tar archive stored as files '<num>.in' and '<num>.out' in any directory.
+    Other files are ignored
+    """
+
+    def __init__(self, file, max_case_size: int):
+        self._max_case_size = max_case_size
+        self._zip = None
+        self._tar = None
+        members: dict[str, Union[zipfile.ZipInfo, tarfile.TarInfo]]
+        if zipfile.is_zipfile(file):
+            file.seek(0)
+            self._zip = zipfile.ZipFile(file)
+            members = {info.filename: info for info in self._zip.infolist() if not info.is_dir()}
+        else:
+            file.seek(0)
+            try:
+                self._tar = tarfile.open(fileobj=file, mode="r:*")
+                members = {member.name: member for member in self._tar.getmembers() if member.isfile()}
+            except tarfile.TarError:
+                raise InvalidUploadError("Uploaded file is not zip or tar archive")
+        self._cases: dict[int, dict[str, Union[zipfile.ZipInfo, tarfile.TarInfo]]] = {}
+        for name, member in members.items():
+            stem, ext = os.path.splitext(os.path.basename(name))
+            if ext not in (".in", ".out") or not stem.isdigit():
+                continue
+            case = self._cases.setdefault(int(stem), {})
+            if ext in case:
+                raise InvalidUploadError(f"File '{stem}{ext}' is repeated")
+            case[ext] = member
+        incomplete = sorted(num for num, case in self._cases.items() if len(case) != 2)
+        if incomplete:
+            raise InvalidUploadError(f"Input or output of tests {incomplete} is missing")
+
+    @property
+    def nums(self) -> list[int]:
+        return sorted(self._cases)
+
+    def _read(self, member: Union[zipfile.ZipInfo, tarfile.TarInfo]) -> str:
+        if self._zip is not None:
+            stream = self._zip.open(member)  # type: ignore
+        else:
+            stream = self._tar.extractfile(member)  # type: ignore
+        with stream:  # type: ignore
+            data = stream.read(self._max_case_size + 1)  # type: ignore
+        if len(data) > self._max_case_size:
+            raise InvalidUploadError("Test case is too large", status=413)
+        try:
+            return data.decode()
+        except UnicodeDecodeError:
+            raise InvalidUploadError("Test case is not valid UTF-8 text")
+
+    def read_cases(self, nums: list[int]) -> list[tuple[int, TestCase]]:
+        return [
+            (num, TestCase(self._read(self._cases[num][".in"]), self._read(self._cases[num][".out"])))
+            for num in nums
+        ]
+
+
+async def read_archive_cases(file, max_case_size: int) -> AsyncIterator[tuple[int, TestCase]]:
+    """
+    Reads cases of archive one group after another in worker thread
+    """
+    reader = await asyncio.to_thread(_ArchiveReader, file, max_case_size)
+    nums = reader.nums
+    for start in range(0, len(nums), READ_GROUP_SIZE):
+        for case in await asyncio.to_thread(reader.read_cases, nums[start:start + READ_GROUP_SIZE]):
+            yield case
+
+
+async def split_into_parts(
+    cases: AsyncIterable[tuple[int, TestCase]],
+    max_cases: int = PART_MAX_CASES,
+    max_size: int = PART_MAX_SIZE
+) -> AsyncIterator[TestCasesDataType]:
+    part: TestCasesDataType = {}
+    size = 0
+    async for num, case in cases:
+        if num in part:
+            raise InvalidUploadError(f"Test {num} is repeated")
+        part[num] = case
+        size += len(case.input) + len(case.output)
+        if len(part) >= max_cases or size >= max_size:
+            yield part
+            part, size = {}, 0
+    if part:
+        yield part
+
+
+async def read_test_cases(
+    content_type: str,
+    chunks: AsyncIterable[bytes],
+    max_size: int,
+    max_case_size: int
+) -> AsyncIterator[TestCasesDataType]:
+    """
+    Reads uploaded suite by parts. NDJSON is parsed while it is received,
+    archives are spooled to temporary file first because members of zip can be read only when whole file is got
+    """
+    media_type = content_type.split(";")[0].strip().lower()
+    chunks = _limit_size(chunks, max_size)
+    if media_type in NDJSON_TYPES:
+        async for part in split_into_parts(read_ndjson_cases(chunks, max_case_size)):
+            yield part
+    elif media_type in ARCHIVE_TYPES:
+        with SpooledTemporaryFile(SPOOL_MEMORY_SIZE) as file:
+            async for chunk in chunks:
+                file.write(chunk)
+            async for part in split_into_parts(read_archive_cases(file, max_case_size)):
+                yield part
+    else:
+        raise InvalidUploadError(f"Unsupported type of suite '{media_type}'", status=415)
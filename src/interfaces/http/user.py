@@ -28,9 +28,14 @@ async def get_main(
     user_id: FromDishka[AuthenticatedNotStrictlyUserId],
     use_case: FromDishka[ShowMain],
     page: int = Query(default=1, ge=1),
-    size: int = Query(default=10, ge=10)
+    size: int = Query(default=10, ge=10),
+    after: Optional[str] = Query(default=None)
 ) -> MainDTO:
-    data = await use_case.execute(user_id, page=page, size=size)
+    """
+    Courses catalogue is paginated by page number or, if 'after' provided, by cursor from 'next' field of previous page.
+    In cursor mode 'page' is 0 and 'total' is approximate
+    """
+    data = await use_case.execute(user_id, page=page, size=size, after=after)
     return {  # type: ignore
         "as_teacher": data[0],
         "as_student": data[1],
@@ -38,7 +43,8 @@ async def get_main(
             "courses": data[2][0] if data[2] else [],
             "page": data[2][1] if data[2] else 0,
             "size": data[2][2] if data[2] else 0,
-            "total": data[2][3] if data[2] else 0
+            "total": data[2][3] if data[2] else 0,
+            "next": data[2][4] if data[2] else None
         }
     }
 
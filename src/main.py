@@ -1,9 +1,11 @@
 from contextlib import asynccontextmanager
+from dataclasses import fields, MISSING
 
 from fastapi import FastAPI, APIRouter, Request, HTTPException
 from fastapi.responses import JSONResponse
 from dishka.integrations.fastapi import setup_dishka
-from sqlalchemy.orm import registry, relationship, column_property
+from sqlalchemy import event
+from sqlalchemy.orm import registry, relationship, column_property, deferred
 from ploomby.registry import MessageConsumerRegistry
 from ploomby.rabbit import RabbitConsumerFactory
 
@@ -13,18 +15,46 @@ from src.application.use_cases.teacher import *
 from src.infrastructure.db.tables import *
 from src.domain.exc import HandlingError
 from src.interfaces.http import *
+from src.interfaces.broker.rabbitmq import callback_registry, callback_batcher
+from src.infrastructure.configs import RabbitMQConfig, EmailConfig, AppConfig
+from src.infrastructure.services import EmailOutbox
+from src.application.interfaces.services import RunnerRegistryInterface
 from src.domain.entities import *
+from src.domain.value_objects import TestCases
 from src.logger import logger
 from src.container import (
-    container
+    container,
+    COURSE_ACCESS_COOKIE
 )
 
 
+def init_problem_test_cases(problem: Problem, _):
+    """
+    Test cases are stored separately from problems and are set by repositories when requested
+    """
+    problem.test_cases = TestCases()
+
+
+def apply_dataclass_defaults(entity, args, kwargs):
+    """
+    Instrumented attributes of mapped entities replace class-level defaults of dataclass fields
+    excluded from __init__, so such defaults are set explicitly when entity is created
+    """
+    for entity_field in fields(entity):
+        if not entity_field.init and entity_field.default is not MISSING:
+            setattr(entity, entity_field.name, entity_field.default)
+
+
 def map_tables():
     mapper_registry = registry()
     mapper_registry.map_imperatively(Problem, problems)
+    event.listen(Problem, "load", init_problem_test_cases)
     mapper_registry.map_imperatively(Attempt, attempts, properties={
-        "problem": relationship(Problem, lazy='raise', uselist=False)
+        "problem": relationship(Problem, lazy='raise', uselist=False),
+        "test_cases": deferred(attempts.c.test_cases, raiseload=True)
+    })
+    mapper_registry.map_imperatively(Submission, submissions, properties={
+        "code": deferred(submissions.c.code, raiseload=True)
     })
     mapper_registry.map_imperatively(Module, modules, properties={
         "_problems": relationship(Problem, lazy="raise", cascade="all, delete-orphan", passive_deletes=True)
@@ -41,6 +71,8 @@ def map_tables():
         "_students": relationship(User, secondary=users_courses, back_populates="courses", lazy='raise'),
         "_modules": relationship(Module, lazy='raise', cascade="all, delete-orphan", passive_deletes=True)
     })
+    for mapper in mapper_registry.mappers:
+        event.listen(mapper.class_, "init", apply_dataclass_defaults)
     mapper_registry.configure()
 
 
@@ -48,9 +80,18 @@ def map_tables():
 async def lifespan_handler(app: FastAPI):
     map_tables()
     setup_routers(app)
-    # await consumer_registry.register("callback", "task_name")
+    await container.get(RunnerRegistryInterface)
+    rabbit_conf = await container.get(RabbitMQConfig)
+    callback_batcher.configure(rabbit_conf.callback_batch_size, rabbit_conf.callback_batch_window)
+    consumer_registry = MessageConsumerRegistry(callback_registry, RabbitConsumerFactory(rabbit_conf.conn_url))
+    await consumer_registry.register(rabbit_conf.callback_queue, rabbit_conf.message_key_name)
+    email_conf = await container.get(EmailConfig)
+    email_outbox = await container.get(EmailOutbox)
     logger.info("App is ready. Starting...")
     yield
+    await consumer_registry.disconnect_consumers()
+    await callback_batcher.drain()
+    await email_outbox.drain(email_conf.email_drain_timeout)
     await container.close()
     logger.info("App shutdown")
 
@@ -59,6 +100,19 @@ app = FastAPI(lifespan=lifespan_handler)
 setup_dishka(container, app)
 
 
+@app.middleware("http")
+async def set_course_access_cookie(r: Request, call_next):
+    """
+    Sets token of course access claims issued while request was authenticated
+    """
+    response = await call_next(r)
+    token = getattr(r.state, "course_access_token", None)
+    if token:
+        conf = await container.get(AppConfig)
+        response.set_cookie(COURSE_ACCESS_COOKIE, token, **conf.cookie_options)
+    return response
+
+
 @app.exception_handler(HandlingError)
 async def handle_auth(r: Request, e: HandlingError):
     return JSONResponse({"detail": str(e)}, e.status)
@@ -70,4 +124,5 @@ def setup_routers(app: FastAPI):
     user_router.include_router(student_router)
     user_router.include_router(teacher_router)
     api_router.include_router(user_router)
+    api_router.include_router(bundle_router)
     app.include_router(api_router)
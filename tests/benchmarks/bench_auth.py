@@ -0,0 +1,29 @@
+"""
+Benchmark of verification of auth tokens with and without cache of verified tokens.
+
+Run: python -m tests.benchmarks.bench_auth [requests...]
+"""
+import sys
+import time
+
+from src.infrastructure.services.user import JWTAuthenticationService
+
+
+def bench(requests: int, users: int = 1000):
+    for cache_size in (0, 10_000):
+        service = JWTAuthenticationService(exp_time=3600, secret="bench-secret-of-recommended-length-32b", decode_cache_size=cache_size)
+        tokens = [service.generate_token(user_id) for user_id in range(1, users + 1)]
+        started = time.perf_counter()
+        for i in range(requests):
+            service.get_user_id_from_token(tokens[i % users])
+        elapsed = time.perf_counter() - started
+        print(
+            f"{requests:>8} requests | {users} users | cache {cache_size:>6} | "
+            f"{elapsed * 1000:8.1f} ms | {requests / elapsed:>10,.0f} req/s"
+        )
+
+
+if __name__ == "__main__":
+    sizes = [int(arg) for arg in sys.argv[1:]] or [10_000, 100_000]
+    for size in sizes:
+        bench(size)
@@ -0,0 +1,49 @@
+"""
+Benchmark of building and updating large test suites.
+
+Run: python -m tests.benchmarks.bench_testcases [sizes...]
+"""
+import sys
+import time
+
+from src.domain.value_objects import TestCase, TestCases
+
+
+def make_cases(start: int, count: int) -> dict[int, TestCase]:
+    return {num: TestCase(input=f"input_{num}", output=f"output_{num}") for num in range(start, start + count)}
+
+
+def measure(func) -> float:
+    started = time.perf_counter()
+    func()
+    return time.perf_counter() - started
+
+
+def bench(size: int, batch: int = 100, updates: int = 100):
+    cases = make_cases(1, size)
+    build = measure(lambda: TestCases(cases))
+    test_cases = TestCases(cases)
+
+    def update():
+        for i in range(updates):
+            test_cases.update_test_cases(make_cases(size + 1 + i * batch, batch))
+
+    def replace():
+        for i in range(updates):
+            start = 1 + i * batch
+            test_cases.update_test_cases({
+                num: TestCase(input=f"changed_{num}", output="") for num in range(start, start + batch)
+            })
+
+    added = measure(update)
+    replaced = measure(replace)
+    print(
+        f"{size:>7} cases | build {build * 1000:8.1f} ms | "
+        f"add {batch} x{updates} {added * 1000:8.1f} ms | replace {batch} x{updates} {replaced * 1000:8.1f} ms"
+    )
+
+
+if __name__ == "__main__":
+    sizes = [int(arg) for arg in sys.argv[1:]] or [10_000, 50_000, 100_000]
+    for size in sizes:
+        bench(size)
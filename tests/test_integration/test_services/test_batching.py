@@ -0,0 +1,76 @@
+import asyncio
+
+import pytest
+
+from src.infrastructure.services.batching import BatchAccumulator
+
+
+class Recorder:
+    def __init__(self, fail: bool = False):
+        self.flushed: list[tuple[str, list[int]]] = []
+        self._fail = fail
+
+    async def __call__(self, key: str, items: list[int]):
+        self.flushed.append((key, items))
+        if self._fail:
+            raise RuntimeError("storage is unavailable")
+
+
+@pytest.mark.asyncio
+async def test_batch_flushed_by_size():
+    """Пачка сбрасывается сразу при достижении максимального размера"""
+    recorder = Recorder()
+    batcher = BatchAccumulator(recorder, max_size=3, window=60)
+
+    await asyncio.gather(*(batcher.add("a", i) for i in range(3)))
+
+    assert recorder.flushed == [("a", [0, 1, 2])]
+    assert len(batcher) == 0
+
+
+@pytest.mark.asyncio
+async def test_batch_flushed_by_window():
+    """Неполная пачка сбрасывается по истечении окна, пачки разных ключей не смешиваются"""
+    recorder = Recorder()
+    batcher = BatchAccumulator(recorder, max_size=100, window=0.01)
+
+    await asyncio.gather(batcher.add("a", 1), batcher.add("b", 2), batcher.add("a", 3))
+
+    assert sorted(recorder.flushed) == [("a", [1, 3]), ("b", [2])]
+
+
+@pytest.mark.asyncio
+async def test_flush_error_propagated_to_every_item():
+    """Ошибку сохранения пачки получают все добавившие элементы корутины"""
+    batcher = BatchAccumulator(Recorder(fail=True), max_size=2, window=60)
+
+    results = await asyncio.gather(batcher.add("a", 1), batcher.add("a", 2), return_exceptions=True)
+
+    assert all(isinstance(res, RuntimeError) for res in results)
+
+
+@pytest.mark.asyncio
+async def test_drain_flushes_pending_batches():
+    """drain сбрасывает накопленные пачки не дожидаясь окна"""
+    recorder = Recorder()
+    batcher = BatchAccumulator(recorder, max_size=100, window=60)
+
+    pending = asyncio.gather(batcher.add("a", 1), batcher.add("b", 2))
+    await asyncio.sleep(0)
+    await asyncio.sleep(0)
+    await batcher.drain()
+    await pending
+
+    assert recorder.flushed == [("a", [1]), ("b", [2])]
+
+
+@pytest.mark.asyncio
+async def test_single_waiting_item_flushed_immediately():
+    """Если других ожидающих обработчиков нет, пачка сбрасывается сразу, не дожидаясь окна"""
+    recorder = Recorder()
+    batcher = BatchAccumulator(recorder, max_size=100, window=60)
+
+    await asyncio.wait_for(batcher.add("a", 1), 1)
+    await asyncio.wait_for(batcher.add("a", 2), 1)
+
+    assert recorder.flushed == [("a", [1]), ("a", [2])]
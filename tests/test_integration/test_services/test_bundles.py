@@ -0,0 +1,77 @@
+import tarfile
+
+import pytest
+
+from src.domain.value_objects import TestCase, TestCases
+from src.infrastructure.services import FileProblemBundleStorage
+
+
+async def parts(*parts_data: TestCases):
+    for part in parts_data:
+        yield part
+
+
+@pytest.mark.asyncio
+async def test_bundle_contains_inputs(tmp_path):
+    """
+    Бандл содержит входные данные всех частей набора в файлах '<num>.in'
+    """
+    storage = FileProblemBundleStorage(str(tmp_path))
+
+    version = await storage.build(parts(
+        TestCases({1: TestCase("in1", "out1")}),
+        TestCases({2: TestCase("in2", "out2")})
+    ))
+
+    path = storage.locate(version)
+    assert path is not None
+    with tarfile.open(path, "r:gz") as archive:
+        assert {member.name: archive.extractfile(member).read() for member in archive} == {  # type: ignore
+            "1.in": b"in1", "2.in": b"in2"
+        }
+    assert not [file for file in tmp_path.iterdir() if file.suffix == ".tmp"]
+
+
+@pytest.mark.asyncio
+async def test_bundle_version_is_content_hash(tmp_path):
+    """
+    Одинаковые наборы получают одну версию бандла, изменение входных данных меняет версию
+    """
+    storage = FileProblemBundleStorage(str(tmp_path))
+
+    first = await storage.build(parts(TestCases({1: TestCase("in1", "out1")})))
+    same = await storage.build(parts(TestCases({1: TestCase("in1", "other")})))
+    changed = await storage.build(parts(TestCases({1: TestCase("in2", "out1")})))
+
+    assert first == same
+    assert first != changed
+    assert len(list(tmp_path.iterdir())) == 2
+
+
+def test_locate_unknown_version(tmp_path):
+    """
+    Несуществующая или некорректная версия бандла не находится
+    """
+    storage = FileProblemBundleStorage(str(tmp_path))
+
+    assert storage.locate("0" * 64) is None
+    assert storage.locate("../secret") is None
+
+
+@pytest.mark.asyncio
+async def test_rebuilt_bundle_has_same_version(tmp_path):
+    """
+    Бандл, собранный заново по частям после удаления, получает ту же версию, что и собранный целиком
+    """
+    storage = FileProblemBundleStorage(str(tmp_path))
+
+    version = await storage.build(parts(TestCases({1: TestCase("in1", "out1"), 2: TestCase("in2", "out2")})))
+    storage.discard(version)
+    assert storage.locate(version) is None
+    rebuilt = await storage.build(parts(
+        TestCases({1: TestCase("in1", "out1")}),
+        TestCases({2: TestCase("in2", "out2")})
+    ))
+
+    assert rebuilt == version
+    assert storage.locate(version) is not None
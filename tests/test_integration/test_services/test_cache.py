@@ -0,0 +1,88 @@
+from freezegun import freeze_time
+
+from src.infrastructure.services.cache import TTLCache, InMemoryUserStatusCache, InMemoryCourseAccessCache
+
+
+def test_ttl_cache_returns_stored_value():
+    """Кеш должен возвращать сохраненное значение"""
+    cache: TTLCache[int, str] = TTLCache(maxsize=10, ttl=60)
+    cache.set(1, "value")
+
+    assert cache.get(1) == "value"
+    assert cache.get(2) is None
+
+
+def test_ttl_cache_entry_expires():
+    """Значение должно удаляться из кеша по истечении ttl"""
+    with freeze_time("2026-01-01 00:00:00") as frozen:
+        cache: TTLCache[int, str] = TTLCache(maxsize=10, ttl=60)
+        cache.set(1, "value")
+        frozen.tick(59)
+        assert cache.get(1) == "value"
+        frozen.tick(2)
+        assert cache.get(1) is None
+        assert len(cache) == 0
+
+
+def test_ttl_cache_custom_entry_ttl():
+    """Для отдельной записи можно задать собственный ttl"""
+    with freeze_time("2026-01-01 00:00:00") as frozen:
+        cache: TTLCache[int, str] = TTLCache(maxsize=10, ttl=60)
+        cache.set(1, "value", ttl=5)
+        frozen.tick(6)
+        assert cache.get(1) is None
+
+
+def test_ttl_cache_evicts_least_recently_used():
+    """При переполнении вытесняется давно не использованная запись"""
+    cache: TTLCache[int, int] = TTLCache(maxsize=2, ttl=60)
+    cache.set(1, 1)
+    cache.set(2, 2)
+    cache.get(1)
+    cache.set(3, 3)
+
+    assert cache.get(1) == 1
+    assert cache.get(2) is None
+    assert cache.get(3) == 3
+
+
+def test_user_status_cache_invalidate():
+    """Инвалидация удаляет статус пользователя из кеша"""
+    cache = InMemoryUserStatusCache(maxsize=10, ttl=60)
+    cache.set(1, False)
+    assert cache.get(1) is False
+
+    cache.invalidate(1)
+    cache.invalidate(2)
+
+    assert cache.get(1) is None
+
+
+def test_course_access_claims_revocation():
+    """Отозванная версия claims не уменьшается и забывается после истечения срока жизни claims"""
+    cache = InMemoryCourseAccessCache(maxsize=10, ttl=60, claims_ttl=300)
+    with freeze_time("2026-01-01 00:00:00") as frozen:
+        assert cache.get_claims_version(1) == 0
+        cache.revoke_claims(1, 3)
+        cache.revoke_claims(1, 2)
+        assert cache.get_claims_version(1) == 3
+
+        frozen.tick(301)
+        assert cache.get_claims_version(1) == 0
+
+
+def test_course_access_revocations_not_evicted():
+    """Отзывы claims не вытесняются при превышении maxsize и удаляются только после истечения срока жизни claims"""
+    cache = InMemoryCourseAccessCache(maxsize=2, ttl=60, claims_ttl=300)
+    with freeze_time("2026-01-01 00:00:00") as frozen:
+        for user_id in range(5):
+            cache.revoke_claims(user_id, 1)
+        assert [cache.get_claims_version(user_id) for user_id in range(5)] == [1] * 5
+
+        frozen.tick(200)
+        cache.revoke_claims(0, 2)
+        frozen.tick(101)
+        cache.revoke_claims(5, 1)
+
+        assert [cache.get_claims_version(user_id) for user_id in range(6)] == [2, 0, 0, 0, 0, 1]
+        assert len(cache._claims_versions) == 2
@@ -1,9 +1,12 @@
 from src.infrastructure.services.user import JWTAuthenticationService
 from src.infrastructure.services.user.exceptions import JWTUnauthorizedError
+from src.application.dtos.auth import CourseAccessClaimsDTO
 import jwt
 import time
 import pytest
 
+from freezegun import freeze_time
+
 
 def test_generate_token_contains_user_id():
     """Токен должен содержать переданный user_id"""
@@ -154,3 +157,63 @@ def test_init_with_different_exp_times():
 
     # Проверяем что exp разные
     assert payload_short["exp"] < payload_long["exp"]
+
+
+def test_course_access_claims_roundtrip():
+    """Claims доступа к курсам подписываются и читаются обратно, срок жизни берется из настроек claims"""
+    service = JWTAuthenticationService(exp_time=3600, secret="test", course_access_exp_time=60)
+    claims = CourseAccessClaimsDTO(user_id=1, version=2, student_courses=[10, 11], teacher_courses=[12])
+
+    token = service.generate_course_access_token(claims)
+
+    assert service.get_course_access_claims(token) == claims
+    payload = jwt.decode(token, "test", ["HS256"])
+    assert abs(payload["exp"] - int(time.time() + 60)) <= 2
+
+
+def test_course_access_claims_rejects_other_tokens():
+    """Обычный токен, токен с чужой подписью и истекший токен не принимаются как claims"""
+    service = JWTAuthenticationService(exp_time=3600, secret="test", course_access_exp_time=-1)
+    claims = CourseAccessClaimsDTO(user_id=1, version=0, student_courses=[], teacher_courses=[])
+    other = JWTAuthenticationService(exp_time=3600, secret="other")
+
+    assert service.get_course_access_claims(service.generate_token(1)) is None
+    assert service.get_course_access_claims(other.generate_course_access_token(claims)) is None
+    assert service.get_course_access_claims(service.generate_course_access_token(claims)) is None
+
+
+def test_decode_cache_skips_verification(mocker):
+    """Повторная проверка того же токена берется из кеша без разбора и проверки подписи"""
+    service = JWTAuthenticationService(exp_time=3600, secret="test")
+    token = service.generate_token(1)
+    verify = mocker.spy(jwt, "decode")
+
+    assert [service.get_user_id_from_token(token) for _ in range(3)] == [1, 1, 1]
+    assert verify.call_count == 1
+
+    service.decode(token)["user_id"] = 2
+    assert service.get_user_id_from_token(token) == 1
+
+
+def test_decode_cache_honors_expiration():
+    """Закешированный токен перестает приниматься после истечения срока его действия"""
+    with freeze_time("2026-01-01 00:00:00") as frozen:
+        service = JWTAuthenticationService(exp_time=10, secret="test")
+        token = service.generate_token(1)
+        assert service.get_user_id_from_token(token) == 1
+
+        frozen.tick(11)
+        with pytest.raises(JWTUnauthorizedError):
+            service.get_user_id_from_token(token)
+
+
+def test_decode_cache_ignores_invalid_tokens(mocker):
+    """Невалидные токены не кешируются и проверяются каждый раз"""
+    service = JWTAuthenticationService(exp_time=3600, secret="test")
+    token = JWTAuthenticationService(exp_time=3600, secret="other").generate_token(1)
+    verify = mocker.spy(jwt, "decode")
+
+    for _ in range(2):
+        with pytest.raises(JWTUnauthorizedError):
+            service.get_user_id_from_token(token)
+    assert verify.call_count == 2
@@ -0,0 +1,166 @@
+import asyncio
+
+import aiosmtplib
+import pytest
+
+from src.infrastructure.services import EmailOutbox, OutboxEmail
+
+
+class FakePool:
+    def __init__(self, failures: int = 0, delay: float = 0, error: Exception = ConnectionError("server unavailable")):
+        self.failures = failures
+        self.delay = delay
+        self.error = error
+        self.size = 2
+        self.sent: list[str] = []
+        self.calls = 0
+        self.active = 0
+        self.max_active = 0
+
+    async def send(self, message, recipients=None):
+        self.calls += 1
+        self.active += 1
+        self.max_active = max(self.max_active, self.active)
+        try:
+            await asyncio.sleep(self.delay)
+            if self.failures:
+                self.failures -= 1
+                raise self.error
+            self.sent.append(message["To"])
+            return {}, "OK"
+        finally:
+            self.active -= 1
+
+
+def make_outbox(pool: FakePool, **kwargs) -> EmailOutbox:
+    options = {"retry_delay": 0.01, "retry_max_delay": 0.02, **kwargs}
+    outbox = EmailOutbox(pool, "runlet@example.com", **options)  # type: ignore
+    outbox.start()
+    return outbox
+
+
+@pytest.mark.asyncio
+async def test_workers_limit_concurrency():
+    """
+    Одновременно отправляется не больше писем, чем воркеров, все письма отправлены после drain
+    """
+    pool = FakePool(delay=0.01)
+    outbox = make_outbox(pool, workers=2)
+
+    for num in range(6):
+        await outbox.put(OutboxEmail(f"user{num}@example.com", "topic", "text"))
+    await outbox.drain()
+
+    assert sorted(pool.sent) == [f"user{num}@example.com" for num in range(6)]
+    assert pool.max_active == 2
+
+
+@pytest.mark.asyncio
+async def test_put_waits_when_full():
+    """
+    Добавление письма в заполненную очередь ждет, пока воркер не освободит место
+    """
+    pool = FakePool(delay=0.05)
+    outbox = make_outbox(pool, maxsize=1, workers=1)
+
+    await outbox.put(OutboxEmail("user1@example.com", "topic", "text"))
+    await asyncio.sleep(0)
+    await outbox.put(OutboxEmail("user2@example.com", "topic", "text"))
+    with pytest.raises(asyncio.TimeoutError):
+        await asyncio.wait_for(outbox.put(OutboxEmail("user3@example.com", "topic", "text")), 0.01)
+    await outbox.drain()
+
+    assert pool.sent == ["user1@example.com", "user2@example.com"]
+
+
+@pytest.mark.asyncio
+async def test_retry_with_backoff():
+    """
+    Письмо отправляется повторно после ошибок
+    """
+    pool = FakePool(failures=2)
+    outbox = make_outbox(pool, max_attempts=3)
+
+    await outbox.put(OutboxEmail("user@example.com", "topic", "text"))
+    await outbox.drain()
+
+    assert (pool.calls, pool.sent) == (3, ["user@example.com"])
+
+
+@pytest.mark.asyncio
+async def test_give_up_after_max_attempts():
+    """
+    После max_attempts ошибок письмо отбрасывается, воркер продолжает работу
+    """
+    pool = FakePool(failures=2)
+    outbox = make_outbox(pool, max_attempts=2, workers=1)
+
+    await outbox.put(OutboxEmail("user1@example.com", "topic", "text"))
+    await outbox.put(OutboxEmail("user2@example.com", "topic", "text"))
+    await outbox.drain()
+
+    assert (pool.calls, pool.sent) == (3, ["user2@example.com"])
+
+
+@pytest.mark.asyncio
+async def test_closed_after_drain():
+    """
+    После drain новые письма не принимаются
+    """
+    outbox = make_outbox(FakePool())
+    await outbox.drain()
+
+    with pytest.raises(RuntimeError):
+        await outbox.put(OutboxEmail("user@example.com", "topic", "text"))
+
+
+@pytest.mark.asyncio
+async def test_permanent_error_not_retried():
+    """
+    Письмо, отклоненное сервером с постоянной ошибкой (5xx), не отправляется повторно
+    """
+    pool = FakePool(failures=1, error=aiosmtplib.SMTPResponseException(550, "mailbox unavailable"))
+    outbox = make_outbox(pool, max_attempts=3)
+
+    await outbox.put(OutboxEmail("user@example.com", "topic", "text"))
+    await outbox.drain()
+
+    assert (pool.calls, pool.sent) == (1, [])
+
+
+@pytest.mark.asyncio
+async def test_bulk_retries_only_transient_errors():
+    """
+    В массовой рассылке временная ошибка повторяется, а постоянная сразу возвращается получателям пачки
+    """
+    outbox = make_outbox(FakePool(), max_attempts=3, bulk_batch_size=1)
+    transient = FakePool(failures=1)
+    outbox._pool = transient  # type: ignore
+
+    results = await outbox.send_bulk(["user1@example.com"], "topic", "text")
+
+    assert results == {"user1@example.com": None}
+    assert transient.calls == 2
+    permanent = FakePool(failures=1, error=aiosmtplib.SMTPResponseException(554, "rejected"))
+    outbox._pool = permanent  # type: ignore
+
+    results = await outbox.send_bulk(["user2@example.com"], "topic", "text")
+
+    assert results == {"user2@example.com": "(554, 'rejected')"}
+    assert permanent.calls == 1
+    await outbox.drain()
+
+
+@pytest.mark.asyncio
+async def test_bulk_batches_limited_by_pool_size():
+    """
+    Одновременно отправляется не больше пачек массовой рассылки, чем соединений в пуле
+    """
+    pool = FakePool(delay=0.01)
+    outbox = make_outbox(pool, bulk_batch_size=1)
+
+    results = await outbox.send_bulk([f"user{num}@example.com" for num in range(6)], "topic", "text")
+    await outbox.drain()
+
+    assert len(results) == 6 and all(error is None for error in results.values())
+    assert (pool.calls, pool.max_active) == (6, 2)
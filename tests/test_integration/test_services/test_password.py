@@ -0,0 +1,61 @@
+import asyncio
+import pytest
+
+from concurrent.futures import ThreadPoolExecutor
+
+from src.infrastructure.services.user import PasswordService, create_password_executor
+
+
+@pytest.fixture
+def password_service():
+    executor = ThreadPoolExecutor(max_workers=2)
+    yield PasswordService(executor, max_concurrency=2)
+    executor.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_hash_and_check_password(password_service: PasswordService):
+    """Хеш пароля должен успешно проверяться исходным паролем"""
+    hashed = await password_service.hash_password("password123")
+
+    assert hashed != "password123"
+    assert await password_service.check_password(hashed, "password123")
+    assert not await password_service.check_password(hashed, "wrong_password")
+
+
+@pytest.mark.asyncio
+async def test_concurrency_limit_and_stats(password_service: PasswordService):
+    """Количество одновременных операций ограничено, лишние ожидают в очереди"""
+    tasks = [asyncio.create_task(password_service.hash_password(f"password{i}")) for i in range(5)]
+    await asyncio.sleep(0)
+
+    stats = password_service.stats
+    assert stats.in_flight == 2
+    assert stats.waiting == 3
+
+    await asyncio.gather(*tasks)
+    stats = password_service.stats
+    assert stats.in_flight == 0
+    assert stats.waiting == 0
+    assert stats.completed == 5
+    assert stats.max_wait > 0
+
+
+@pytest.mark.asyncio
+async def test_saturation_logged(mocker):
+    """Операция, ожидавшая в очереди дольше порога, логируется вместе с нагрузкой пула"""
+    logger = mocker.patch("src.infrastructure.services.user.password.logger")
+    executor = ThreadPoolExecutor(max_workers=1)
+    service = PasswordService(executor, max_concurrency=1, wait_warning=0)
+
+    await asyncio.gather(*(service.hash_password(f"password{i}") for i in range(2)))
+    executor.shutdown()
+
+    assert logger.warning.called
+    assert "saturated" in logger.warning.call_args.args[0]
+
+
+def test_create_password_executor_undefined_kind():
+    """Неизвестный тип пула должен вызывать ошибку"""
+    with pytest.raises(ValueError):
+        create_password_executor("fiber", 1)
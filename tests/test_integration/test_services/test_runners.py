@@ -0,0 +1,103 @@
+import pytest
+
+from freezegun import freeze_time
+
+from src.infrastructure.services.runners import InMemoryRunnerRegistry, RunnerConf
+
+
+@pytest.fixture
+def registry():
+    return InMemoryRunnerRegistry([
+        RunnerConf(name="py-1", queue="runs.py-1", langs=["python"]),
+        RunnerConf(name="py-2", queue="runs.py-2", langs=["python"], max_in_flight=1),
+        RunnerConf(name="cpp", queue="runs.cpp", langs=["cpp"]),
+    ], job_timeout=60, cooldown=30)
+
+
+def test_from_yaml(tmp_path):
+    """Раннеры загружаются из yaml конфига"""
+    path = tmp_path / "runners.yaml"
+    path.write_text("runners:\n  - name: any\n    queue: runs.any\n")
+
+    registry = InMemoryRunnerRegistry.from_yaml(str(path))
+
+    assert registry.supports("go")
+    assert registry.acquire("go", "job") == "runs.any"
+
+
+def test_supports(registry: InMemoryRunnerRegistry):
+    """Поддерживаются только языки указанные у раннеров"""
+    assert registry.supports("python")
+    assert not registry.supports("go")
+
+
+def test_acquire_least_loaded(registry: InMemoryRunnerRegistry):
+    """Задача отправляется наименее загруженному раннеру, поддерживающему язык"""
+    assert registry.acquire("python", "1") == "runs.py-1"
+    assert registry.acquire("python", "2") == "runs.py-2"
+    assert registry.acquire("python", "3") == "runs.py-1"
+    assert registry.acquire("cpp", "4") == "runs.cpp"
+
+
+def test_acquire_respects_max_in_flight(registry: InMemoryRunnerRegistry):
+    """Раннер с исчерпанным лимитом задач не выбирается"""
+    registry.acquire("python", "1")
+    registry.acquire("python", "2")
+    registry.acquire("cpp", "3")
+
+    assert registry.acquire("cpp", "4") == "runs.cpp"
+    registry.fail("3")
+    registry.fail("4")
+    assert registry.acquire("cpp", "5") is None
+
+
+def test_latency_affects_dispatching(registry: InMemoryRunnerRegistry):
+    """Раннер с меньшей задержкой получает больше задач"""
+    with freeze_time("2026-01-01 00:00:00") as frozen:
+        registry.acquire("python", "slow")
+        registry.acquire("python", "fast")
+        frozen.tick(1)
+        registry.complete("fast")
+        frozen.tick(9)
+        registry.complete("slow")
+
+        assert [r.latency for r in registry.runners[:2]] == [10, 1]
+        assert registry.acquire("python", "next") == "runs.py-2"
+
+
+def test_failed_runner_excluded_until_cooldown(registry: InMemoryRunnerRegistry):
+    """Раннер, не принявший задачу, исключается из выбора на время cooldown"""
+    with freeze_time("2026-01-01 00:00:00") as frozen:
+        registry.acquire("cpp", "1")
+        registry.fail("1")
+        assert registry.acquire("cpp", "2") is None
+        frozen.tick(31)
+        assert registry.acquire("cpp", "2") == "runs.cpp"
+
+
+def test_expired_job_releases_runner(registry: InMemoryRunnerRegistry):
+    """Задача без результата дольше таймаута освобождает раннер и учитывается в задержке"""
+    with freeze_time("2026-01-01 00:00:00") as frozen:
+        registry.acquire("python", "1")
+        registry.acquire("python", "2")
+        frozen.tick(61)
+        registry.acquire("cpp", "3")
+
+        assert all(not r.in_flight for r in registry.runners[:2])
+        assert registry.runners[0].latency == 60
+        registry.complete("1")
+        assert registry.runners[0].latency == 60
+
+
+def test_acquire_counts_shared_jobs(registry: InMemoryRunnerRegistry):
+    """Нагрузка берется из общих счетчиков, задача другого экземпляра завершается по очереди раннера"""
+    with freeze_time("2026-01-01 00:00:00") as frozen:
+        assert registry.acquire("python", "1", {"runs.py-1": 2}) == "runs.py-2"
+        assert registry.acquire("python", "2", {"runs.py-1": 2, "runs.py-2": 1}) == "runs.py-1"
+        registry.complete("other", "runs.py-2", 5)
+        assert registry.runners[1].latency == 5
+        frozen.tick(61)
+        registry.acquire("cpp", "3", {})
+
+        assert all(not r.in_flight for r in registry.runners[:2])
+        assert registry.runners[0].latency is None
@@ -0,0 +1,172 @@
+import asyncio
+import socket
+
+from email.message import EmailMessage
+
+import pytest
+
+from aiosmtpd.controller import Controller
+
+from src.infrastructure.services import SMTPConnectionPool, EmailOutbox
+
+
+class RecordingHandler:
+    def __init__(self, refused: tuple[str, ...] = ()):
+        self.received: list[tuple[tuple[str, int], list[str]]] = []
+        self.refused = refused
+
+    async def handle_RCPT(self, server, session, envelope, address, rcpt_options):
+        if address in self.refused:
+            return "550 No such user"
+        envelope.rcpt_tos.append(address)
+        return "250 OK"
+
+    async def handle_DATA(self, server, session, envelope):
+        self.received.append((session.peer, list(envelope.rcpt_tos)))
+        return "250 OK"
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+@pytest.fixture
+def smtp_server():
+    handler = RecordingHandler()
+    controller = Controller(handler, hostname="127.0.0.1", port=free_port())
+    controller.start()
+    yield controller, handler
+    controller.stop()
+
+
+def make_pool(controller: Controller, **kwargs) -> SMTPConnectionPool:
+    return SMTPConnectionPool(controller.hostname, controller.port, use_tls=False, **kwargs)
+
+
+def make_message(to: str) -> EmailMessage:
+    message = EmailMessage()
+    message["From"] = "runlet@example.com"
+    message["To"] = to
+    message["Subject"] = "topic"
+    message.set_content("text")
+    return message
+
+
+@pytest.mark.asyncio
+async def test_connection_reused(smtp_server):
+    """
+    Письма отправляются через одно открытое соединение
+    """
+    controller, handler = smtp_server
+    pool = make_pool(controller)
+
+    for num in range(3):
+        await pool.send(make_message(f"user{num}@example.com"))
+    await pool.close()
+
+    assert [rcpt for _, rcpt in handler.received] == [[f"user{num}@example.com"] for num in range(3)]
+    assert len({peer for peer, _ in handler.received}) == 1
+
+
+@pytest.mark.asyncio
+async def test_pool_size_limits_connections(smtp_server):
+    """
+    Одновременно открыто не больше size соединений, освободившиеся соединения используются повторно
+    """
+    controller, handler = smtp_server
+    pool = make_pool(controller, size=2)
+
+    await asyncio.gather(*(pool.send(make_message(f"user{num}@example.com")) for num in range(6)))
+
+    assert len(handler.received) == 6
+    assert len({peer for peer, _ in handler.received}) <= 2
+    assert pool.idle_count <= 2
+    await pool.close()
+    assert pool.idle_count == 0
+
+
+@pytest.mark.asyncio
+async def test_idle_connection_closed(smtp_server):
+    """
+    Соединение, простаивающее дольше idle_timeout, не используется повторно
+    """
+    controller, handler = smtp_server
+    pool = make_pool(controller, idle_timeout=0.05)
+
+    await pool.send(make_message("user1@example.com"))
+    await asyncio.sleep(0.1)
+    await pool.send(make_message("user2@example.com"))
+    await pool.close()
+
+    assert len({peer for peer, _ in handler.received}) == 2
+
+
+@pytest.mark.asyncio
+async def test_reconnect_after_server_restart():
+    """
+    Если сервер разорвал соединение, письмо отправляется повторно через новое соединение
+    """
+    handler = RecordingHandler()
+    port = free_port()
+    controller = Controller(handler, hostname="127.0.0.1", port=port)
+    controller.start()
+    pool = make_pool(controller)
+    try:
+        await pool.send(make_message("user1@example.com"))
+    finally:
+        controller.stop()
+    controller = Controller(handler, hostname="127.0.0.1", port=port)
+    controller.start()
+    try:
+        await pool.send(make_message("user2@example.com"))
+        await pool.close()
+    finally:
+        controller.stop()
+
+    assert [rcpt for _, rcpt in handler.received] == [["user1@example.com"], ["user2@example.com"]]
+    assert handler.received[0][0] != handler.received[1][0]
+
+
+@pytest.mark.asyncio
+async def test_bulk_batches_recipients(smtp_server):
+    """
+    Массовая рассылка отправляет одно письмо на пачку получателей через общие соединения
+    """
+    controller, handler = smtp_server
+    pool = make_pool(controller, size=2)
+    outbox = EmailOutbox(pool, "runlet@example.com", bulk_batch_size=100)
+    recipients = [f"user{num}@example.com" for num in range(250)]
+
+    results = await outbox.send_bulk(recipients, "topic", "text")
+    await pool.close()
+
+    assert results == {recipient: None for recipient in recipients}
+    assert sorted(len(rcpt) for _, rcpt in handler.received) == [50, 100, 100]
+    assert sorted(rcpt for _, batch in handler.received for rcpt in batch) == sorted(recipients)
+    assert len({peer for peer, _ in handler.received}) <= 2
+
+
+@pytest.mark.asyncio
+async def test_bulk_reports_refused_recipients():
+    """
+    Для отклоненных сервером получателей возвращается ошибка, остальным письмо доставляется
+    """
+    handler = RecordingHandler(refused=("bad1@example.com", "bad2@example.com"))
+    controller = Controller(handler, hostname="127.0.0.1", port=free_port())
+    controller.start()
+    try:
+        pool = make_pool(controller)
+        outbox = EmailOutbox(pool, "runlet@example.com", bulk_batch_size=2)
+        results = await outbox.send_bulk(
+            ["ok@example.com", "bad1@example.com", "bad2@example.com"], "topic", "text"
+        )
+        await pool.close()
+    finally:
+        controller.stop()
+
+    assert results["ok@example.com"] is None
+    assert results["bad1@example.com"].startswith("550")  # type: ignore
+    assert results["bad2@example.com"].startswith("550")  # type: ignore
+    assert [rcpt for _, rcpt in handler.received] == [["ok@example.com"]]
@@ -1,7 +1,7 @@
 import pytest
 
-from src.domain.entities import Attempt, Problem
-from src.domain.value_objects import TestCase, TestCases
+from src.domain.entities import Attempt, AttemptStatus, Problem
+from src.domain.value_objects import TestCase, TestCases, TestResult
 from src.domain.entities.exceptions import MismatchTestNumsError, MismatchTestOutputsError, MismatchTestsCountError
 
 
@@ -23,6 +23,13 @@ def problem_with_cases():
     return problem
 
 
+def results(**outputs: str) -> dict[int, TestResult]:
+    """
+    Утилита для создания результатов раннера: results(t1="out1") -> {1: TestResult(...)}
+    """
+    return {int(num[1:]): TestResult.from_output(output) for num, output in outputs.items()}
+
+
 def make_attempt(user_id: int, problem: Problem, provided_data: dict[int, tuple[str, str]]):
     """
     Утилита для создания Attempt с заданными результатами пользователя.
@@ -39,85 +46,224 @@ def make_attempt(user_id: int, problem: Problem, provided_data: dict[int, tuple[
     return attempt
 
 
-def test_mark_as_passed_success(problem_with_cases):
+def test_finish_reports_mismatched_tests(problem_with_cases):
     """
-    Все номера и outputs совпадают — попытка помечается как passed=True.
+    Неверный output одного теста -> MismatchTestOutputsError с номером теста, passed остается False
     """
-    provided = {
-        1: ("in1", "out1"),
-        2: ("in2", "out2"),
-        3: ("in3", "out3"),
-    }
-    attempt = make_attempt(user_id=10, problem=problem_with_cases, provided_data=provided)
+    attempt = make_attempt(user_id=10, problem=problem_with_cases, provided_data={})
+    attempt.start("job-1")
+    attempt.add_results(results(t1="WRONG", t2="out2", t3="out3"))
+
+    with pytest.raises(MismatchTestOutputsError) as exc:
+        attempt.finish()
+
+    assert "1" in str(exc.value)
+    assert attempt.progress == "2/3"
+    assert attempt.passed is False
+
+
+def test_start_resets_previous_results(problem_with_cases):
+    """
+    Новый запуск увеличивает кол-во попыток и сбрасывает результаты прошлого запуска
+    """
+    attempt = make_attempt(user_id=10, problem=problem_with_cases, provided_data={1: ("in1", "out1")})
+    attempt.passed = True
+
+    attempt.start("job-1")
+
+    assert attempt.job_id == "job-1"
+    assert attempt.amount == 1
+    assert attempt.passed is False
+    assert attempt.status == AttemptStatus.PENDING
+    assert attempt.test_cases.count == 0
+
+
+def test_add_result_unknown_test(problem_with_cases):
+    """
+    Результат теста, которого нет в задаче -> MismatchTestNumsError
+    """
+    attempt = make_attempt(user_id=10, problem=problem_with_cases, provided_data={})
 
-    attempt.mark_as_passed()
+    with pytest.raises(MismatchTestNumsError):
+        attempt.add_result(4, "out4")
+
+
+def test_finish_after_all_results(problem_with_cases):
+    """
+    После получения результатов всех тестов попытка завершается со статусом passed
+    """
+    attempt = make_attempt(user_id=10, problem=problem_with_cases, provided_data={})
+    attempt.start("job-1")
+    for num in (1, 2, 3):
+        assert not attempt.is_complete
+        attempt.add_result(num, f"out{num}")
+
+    assert attempt.is_complete
+    attempt.finish()
 
     assert attempt.passed is True
+    assert attempt.status == AttemptStatus.PASSED
+    assert attempt.test_cases.count == 0
 
 
-def test_mark_as_passed_mismatch_count(problem_with_cases):
+def test_finish_failed(problem_with_cases):
     """
-    Кол-во результатов не совпадает с кол-вом тестов в задаче -> MismatchTestsCountError.
+    Неверный output -> статус failed и ошибка проверки
     """
-    provided = {
-        1: ("in1", "out1"),
-        2: ("in2", "out2"),
-        # третий тест не передан
-    }
-    attempt = make_attempt(user_id=10, problem=problem_with_cases, provided_data=provided)
+    attempt = make_attempt(user_id=10, problem=problem_with_cases, provided_data={})
+    attempt.start("job-1")
+    for num in (1, 2, 3):
+        attempt.add_result(num, "WRONG")
 
-    with pytest.raises(MismatchTestsCountError):
-        attempt.mark_as_passed()
+    with pytest.raises(MismatchTestOutputsError):
+        attempt.finish()
+
+    assert attempt.passed is False
+    assert attempt.status == AttemptStatus.FAILED
 
 
-def test_mark_as_passed_mismatching_outputs(problem_with_cases):
+def test_add_results_unknown_test_saves_nothing(problem_with_cases):
     """
-    Номера есть, но хотя бы один output отличается -> MismatchTestOutputsError.
+    Если в пачке есть неизвестный номер теста, ни один результат пачки не сохраняется
     """
-    provided = {
-        1: ("in1", "WRONG"),
-        2: ("in2", "out2"),
-        3: ("in3", "out3"),
-    }
-    attempt = make_attempt(user_id=10, problem=problem_with_cases, provided_data=provided)
+    attempt = make_attempt(user_id=10, problem=problem_with_cases, provided_data={})
+
+    with pytest.raises(MismatchTestNumsError):
+        attempt.add_results(results(t1="out1", t4="out4"))
+
+    assert attempt.test_cases.count == 0
+
+
+def test_add_results_fail_fast(problem_with_cases):
+    """
+    В режиме fail fast попытка проваливается на первом неверном результате, не дожидаясь остальных
+    """
+    attempt = make_attempt(user_id=10, problem=problem_with_cases, provided_data={})
+    attempt.start("job-1")
+    attempt.add_results(results(t1="out1"), fail_fast=True)
+    assert not attempt.is_finished
 
     with pytest.raises(MismatchTestOutputsError) as exc:
-        attempt.mark_as_passed()
+        attempt.add_results(results(t2="WRONG"), fail_fast=True)
 
-    # опционально проверяем, что номер неправильного теста указан в сообщении
-    assert "1" in str(exc.value)
+    assert "2" in str(exc.value)
+    assert attempt.is_finished
+    assert attempt.status == AttemptStatus.FAILED
+    assert attempt.test_cases.get_case(2) == TestCase("in2", "")
 
 
-def test_mark_as_passed_mismatching_nums(problem_with_cases):
+def test_progress_tracked_incrementally(problem_with_cases):
     """
-    Переданы результаты по несуществующему номеру теста -> MismatchTestNumsError.
-    В твоей реализации это случится, когда get_case(num) вернул None.
+    Прогресс попытки обновляется по мере получения результатов
     """
-    provided = {
-        1: ("in1", "out1"),
-        2: ("in2", "out2"),
-        999: ("inX", "outX"),  # в problem нет такого номера
-    }
-    attempt = make_attempt(user_id=10, problem=problem_with_cases, provided_data=provided)
+    attempt = make_attempt(user_id=10, problem=problem_with_cases, provided_data={})
+    attempt.start("job-1")
+    assert attempt.progress == "0/3"
 
-    with pytest.raises(MismatchTestNumsError) as exc:
-        attempt.mark_as_passed()
+    attempt.add_results(results(t1="out1", t2="WRONG"))
 
-    assert "999" in str(exc.value)
+    assert attempt.progress == "1/3"
+    assert attempt.mismatched == {2}
+    assert attempt.missing == {3}
 
 
-def test_mark_as_passed_not_marked_on_error(problem_with_cases):
+def test_resent_result_replaces_previous(problem_with_cases):
     """
-    При любой ошибке passed должен остаться False.
+    Повторно присланный результат теста заменяет предыдущий и не учитывается дважды
     """
-    provided = {
-        1: ("in1", "WRONG"),
-        2: ("in2", "out2"),
-        3: ("in3", "out3"),
-    }
-    attempt = make_attempt(user_id=10, problem=problem_with_cases, provided_data=provided)
+    attempt = make_attempt(user_id=10, problem=problem_with_cases, provided_data={})
+    attempt.start("job-1")
+    attempt.add_results(results(t1="WRONG", t2="out2"))
 
-    with pytest.raises(MismatchTestOutputsError):
-        attempt.mark_as_passed()
+    attempt.add_results(results(t1="out1", t2="out2", t3="out3"))
 
-    assert attempt.passed is False
+    assert attempt.progress == "3/3"
+    assert not attempt.mismatched
+    attempt.finish()
+    assert attempt.passed is True
+
+
+def test_finish_without_all_results(problem_with_cases):
+    """
+    Завершение попытки без результатов всех тестов -> MismatchTestsCountError
+    """
+    attempt = make_attempt(user_id=10, problem=problem_with_cases, provided_data={})
+    attempt.start("job-1")
+    attempt.add_results(results(t1="out1"))
+
+    with pytest.raises(MismatchTestsCountError):
+        attempt.finish()
+
+    assert attempt.status == AttemptStatus.FAILED
+
+
+def test_only_failed_outputs_kept_when_allowed(problem_with_cases):
+    """
+    Сохраняются только неверные результаты, их вывод сохраняется, только если задача разрешает показывать тесты
+    """
+    problem_with_cases.show_test_cases = True
+    attempt = make_attempt(user_id=10, problem=problem_with_cases, provided_data={})
+    attempt.start("job-1")
+
+    attempt.add_results(results(t1="out1", t2="WRONG"))
+
+    assert attempt.test_cases.get_case(1) is None
+    assert attempt.test_cases.get_case(2) == TestCase("in2", "WRONG")
+    assert attempt.failed_results == {2: "WRONG"}
+
+
+def test_results_compared_by_digest(problem_with_cases):
+    """
+    Результаты сравниваются по хешам, вывод раннеру передавать не обязательно
+    """
+    attempt = make_attempt(user_id=10, problem=problem_with_cases, provided_data={})
+    attempt.start("job-1")
+
+    attempt.add_results({num: case.as_result() for num, case in problem_with_cases.test_cases})
+
+    attempt.finish()
+    assert attempt.passed is True
+
+
+def test_ignore_whitespace(problem_with_cases):
+    """
+    Если задача игнорирует пробелы, вывод, отличающийся только пробельными символами, верен
+    """
+    attempt = make_attempt(user_id=10, problem=problem_with_cases, provided_data={})
+    attempt.start("job-1")
+    attempt.add_results(results(t1=" out1\n"))
+    assert attempt.mismatched == {1}
+
+    problem_with_cases.ignore_whitespace = True
+    attempt.add_results(results(t1=" out1\n"))
+    assert not attempt.mismatched
+    assert attempt.passed_count == 1
+
+
+def test_add_cached_results(problem_with_cases):
+    """
+    Вердикт идентичного решения применяется без запуска: все тесты, кроме проваленных, пройдены
+    """
+    attempt = make_attempt(user_id=10, problem=problem_with_cases, provided_data={})
+    attempt.start("job-1")
+
+    attempt.add_cached_results({3: None})
+
+    assert attempt.progress == "2/3"
+    assert attempt.mismatched == {3}
+
+
+def test_start_with_test_nums():
+    """
+    Запуск с номерами тестов не требует загрузки тестов задачи, для проверки результатов достаточно тестов пачки
+    """
+    problem = Problem(name="p1", description="desc", module_id=1)
+    attempt = make_attempt(user_id=10, problem=problem, provided_data={})
+    attempt.start("job-1", test_nums=[1, 2, 3])
+    assert attempt.progress == "0/3"
+
+    problem.test_cases = TestCases({2: TestCase("in2", "out2")})
+    attempt.add_results(results(t2="wrong"))
+
+    assert attempt.mismatched == {2}
+    assert attempt.missing == {1, 3}
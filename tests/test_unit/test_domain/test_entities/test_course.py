@@ -119,10 +119,22 @@ def test_delete_students_removes_from_course_and_tags(
 
     mgr = CourseStudentsManagerService(base_course)
 
-    mgr.delete_students([2])  # удалить только s1
+    deleted = mgr.delete_students([2])  # удалить только s1
 
     assert base_course.students == [s2]
     assert tag.students == [s2]
+    assert deleted == [s1]
+    assert (s1.course_access_version, s2.course_access_version) == (1, 0)
+
+
+def test_add_students_changes_course_access_version(base_course, user_factory):
+    s1 = user_factory(2)
+    mgr = CourseStudentsManagerService(base_course)
+
+    mgr.add_students([s1])
+    mgr.add_students([s1])  # повторное добавление не меняет доступ
+
+    assert s1.course_access_version == 1
 
 
 # ----- CourseModulesManagerService -----
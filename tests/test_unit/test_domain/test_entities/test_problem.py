@@ -0,0 +1,39 @@
+from src.domain.entities import Problem
+from src.domain.value_objects import TestCase, TestCases
+
+
+def make_problem():
+    return Problem(
+        name="p1",
+        description="desc",
+        module_id=1,
+        test_cases=TestCases({1: TestCase("in1", "out1"), 2: TestCase("in2", "out2")})
+    )
+
+
+def test_replace_test_cases_changes_version():
+    """
+    Замена тестов увеличивает версию тестов задачи и сбрасывает загруженные тесты
+    """
+    problem = make_problem()
+
+    problem.replace_test_cases()
+
+    assert problem.test_cases_version == 2
+    assert problem.test_cases.count == 0
+
+
+def test_changed_test_cases_drop_bundle():
+    """
+    Бандл устаревает при замене тестов задачи
+    """
+    problem = make_problem()
+    problem.attach_bundle("v1")
+
+    problem.replace_test_cases()
+    assert problem.bundle_version is None
+
+    problem.attach_bundle("v2")
+    problem.replace_test_cases()
+    assert problem.bundle_version is None
+    assert problem.test_cases_version == 3
@@ -0,0 +1,45 @@
+import pytest
+
+from src.domain.entities import Attempt, AttemptStatus, Problem, Submission
+from src.domain.value_objects import TestCase, TestCases
+from src.domain.entities.exceptions import MismatchTestOutputsError
+
+
+def make_started_attempt():
+    problem = Problem(
+        name="p1",
+        description="desc",
+        module_id=1,
+        test_cases=TestCases({1: TestCase("in1", "out1"), 2: TestCase("in2", "out2")})
+    )
+    attempt = Attempt(10, 1)
+    attempt.problem = problem
+    attempt.start("job-1", "hash")
+    return attempt
+
+
+def test_submission_of_started_attempt():
+    """
+    Запись истории о запущенной попытке ожидает вердикта
+    """
+    submission = Submission.of_attempt(make_started_attempt(), "python", "print(1)")
+
+    assert (submission.job_id, submission.solution_hash, submission.total) == ("job-1", "hash", 2)
+    assert submission.status == AttemptStatus.PENDING
+    assert submission.finished_at is None
+
+
+def test_submission_complete():
+    """
+    Вердикт попытки переносится в запись истории
+    """
+    attempt = make_started_attempt()
+    submission = Submission.of_attempt(attempt, "python", "print(1)")
+    attempt.add_cached_results({2: None})
+    with pytest.raises(MismatchTestOutputsError):
+        attempt.finish()
+
+    submission.complete(attempt)
+
+    assert (submission.status, submission.passed_count, submission.total) == (AttemptStatus.FAILED, 1, 2)
+    assert submission.finished_at is not None
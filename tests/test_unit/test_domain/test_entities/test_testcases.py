@@ -1,6 +1,6 @@
 import pytest
 from src.domain.value_objects.exceptions import DuplicateTestCaseInput, ValidationTestCaseError
-from src.domain.value_objects import TestCase, TestCases
+from src.domain.value_objects import TestCase, TestCases, TestCasesDigestIndex
 
 
 # ============ TestCases Tests ============
@@ -412,3 +412,93 @@ def test_testcases_idempotent_updates():
     # Might be different object but same value
     assert tcs.get_case(1).input == "test1"
     assert tcs.get_case(1).output == "result1"
+
+
+def test_testcases_from_trusted_dict():
+    """Test building TestCases from stored data with string numbers"""
+    tcs = TestCases.from_trusted_dict({
+        "1": {"input": "1+1", "output": "2"},
+        "2": {"input": "2+2", "output": "4"}
+    })
+
+    assert tcs.count == 2
+    assert tcs.get_case(1) == TestCase(input="1+1", output="2")
+    assert tcs.get_case(2) == TestCase(input="2+2", output="4")
+
+
+def test_testcases_from_trusted_dict_skips_validation():
+    """Test trusted data is not revalidated and deduplicated"""
+    tcs = TestCases.from_trusted_dict({
+        1: {"input": "same", "output": "out"},
+        2: {"input": "same", "output": "out"}
+    })
+
+    assert tcs.count == 2
+
+
+def test_testcases_stored_dict_keeps_digests():
+    """Test digests of outputs are stored and restored without recomputing"""
+    tcs = TestCases({1: TestCase(input="1+1", output="2")})
+
+    stored = tcs.as_stored_dict()
+    stored[1]["digest"] = "stored"
+    restored = TestCases.from_trusted_dict(stored)
+
+    assert restored.get_case(1).digest == "stored"  # type: ignore
+    assert tcs.get_case(1).normalized_digest == restored.get_case(1).normalized_digest  # type: ignore
+
+
+def test_testcases_deleted_input_can_be_reused():
+    """Test input of deleted case is free for new cases"""
+    tcs = TestCases(_data={1: TestCase(input="a", output="1")})
+
+    tcs.delete_test_cases([1])
+    tcs.update_test_cases({2: TestCase(input="a", output="2")})
+
+    assert tcs.get_case(2) == TestCase(input="a", output="2")
+
+
+def test_testcases_update_swaps_inputs():
+    """Test inputs freed by replaced cases can be taken in the same update"""
+    tcs = TestCases(_data={1: TestCase(input="a", output="1"), 2: TestCase(input="b", output="2")})
+
+    tcs.update_test_cases({1: TestCase(input="b", output="3"), 2: TestCase(input="a", output="4")})
+
+    assert tcs.get_case(1) == TestCase(input="b", output="3")
+    assert tcs.get_case(2) == TestCase(input="a", output="4")
+    with pytest.raises(DuplicateTestCaseInput):
+        tcs.update_test_cases({3: TestCase(input="a", output="5")})
+
+
+def test_testcases_copy_is_independent():
+    """Test changes of copy do not affect original test cases"""
+    tcs = TestCases(_data={1: TestCase(input="a", output="1")})
+    copy = tcs.copy()
+
+    copy.update_test_cases({1: TestCase(input="b", output="1")})
+    tcs.update_test_cases({2: TestCase(input="b", output="2")})
+
+    assert copy.get_case(1).input == "b"  # type: ignore
+    assert tcs.get_case(1).input == "a"  # type: ignore
+
+
+def test_digest_index_validates_parts():
+    """Test cases added by parts are validated against all previous parts"""
+    index = TestCasesDigestIndex()
+
+    assert index.add({1: TestCase(input="a", output="1"), 2: TestCase(input="b", output="2")}).keys() == {1, 2}
+    assert index.add({3: TestCase(input="a", output="1"), 4: TestCase(input="c", output="3")}).keys() == {4}
+    assert index.count == 3
+    with pytest.raises(DuplicateTestCaseInput):
+        index.add({5: TestCase(input="b", output="5")})
+
+
+def test_digest_index_repeated_num():
+    """Test number cannot be repeated in different parts"""
+    index = TestCasesDigestIndex()
+    index.add({1: TestCase(input="a", output="1")})
+
+    with pytest.raises(ValidationTestCaseError):
+        index.add({1: TestCase(input="b", output="2")})
+    with pytest.raises(ValidationTestCaseError):
+        index.add({0: TestCase(input="c", output="3")})
@@ -0,0 +1,82 @@
+import pytest
+
+from unittest.mock import AsyncMock
+
+from dishka import Provider, Scope, provide, make_async_container
+from dishka.integrations.fastapi import setup_dishka, FastapiProvider
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from src.application.use_cases import AuthenticateRunner, GetProblemBundle
+from src.container import AuthProvider
+from src.domain.exc import HandlingError
+from src.interfaces.http import bundle_router
+from src.main import handle_auth
+
+
+class FakeBundleStorage:
+    def __init__(self, path: str):
+        self._path = path
+
+    def locate(self, version: str):
+        return self._path if version == "abc" else None
+
+
+@pytest.fixture
+def client(tmp_path):
+    bundle = tmp_path / "abc.tar.gz"
+    bundle.write_bytes(b"bundle")
+
+    class TestProvider(Provider):
+        scope = Scope.REQUEST
+
+        @provide
+        def get_problem_bundle(self) -> GetProblemBundle:
+            problem_repo = AsyncMock()
+            problem_repo.get_by_bundle_version.return_value = None
+            return GetProblemBundle(AsyncMock(), problem_repo, AsyncMock(), FakeBundleStorage(str(bundle)))  # type: ignore
+
+        @provide
+        def authenticate_runner(self) -> AuthenticateRunner:
+            return AuthenticateRunner("runner")
+
+    app = FastAPI()
+    app.include_router(bundle_router)
+    app.add_exception_handler(HandlingError, handle_auth)  # type: ignore
+    container = make_async_container(TestProvider(), AuthProvider(), FastapiProvider(), skip_validation=True)
+    setup_dishka(container, app)
+    with TestClient(app) as client:
+        yield client
+
+
+def test_bundle_with_runner_token(client):
+    """
+    Раннер с токеном получает бандл
+    """
+    resp = client.get("/bundles/abc", headers={"Authorization": "Bearer runner"})
+
+    assert resp.status_code == 200
+    assert resp.content == b"bundle"
+
+
+def test_missing_bundle(client):
+    """
+    Несуществующий бандл не найден
+    """
+    resp = client.get("/bundles/def", headers={"Authorization": "Bearer runner"})
+
+    assert resp.status_code == 404
+
+
+@pytest.mark.parametrize("headers, status", [
+    ({}, 401),
+    ({"Authorization": "runner"}, 401),
+    ({"Authorization": "Bearer wrong"}, 403)
+])
+def test_bundle_without_runner_token(client, headers, status):
+    """
+    Без токена раннера или с неверным токеном бандл не отдается
+    """
+    resp = client.get("/bundles/abc", headers=headers)
+
+    assert resp.status_code == status
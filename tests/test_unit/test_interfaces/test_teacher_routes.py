@@ -0,0 +1,84 @@
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from dishka import Provider, Scope, provide, make_async_container
+from dishka.integrations.fastapi import setup_dishka, FastapiProvider
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from src.application.dtos.course import CourseG3, CourseG6
+from src.application.use_cases import ShowTeacherCourseToManageProblems, ShowTeacherCourseToUpdateProblems
+from src.domain.value_objects import AuthenticatedTeacherId
+from src.interfaces.http import teacher_router
+
+
+@pytest.fixture
+def course_queries():
+    queries = AsyncMock()
+    queries.get_course_problems.return_value = CourseG6.model_validate({
+        "id": 1,
+        "name": "course",
+        "modules": [{"id": 2, "name": "module", "problems": [{"id": 3, "name": "p1", "description": "desc"}]}]
+    })
+    queries.get_course_problems_progress.return_value = CourseG3.model_validate({
+        "id": 1,
+        "name": "course",
+        "students_count": 4,
+        "modules": [{"name": "module", "problems": [{"id": 3, "name": "p1", "attempted": 2, "solved": 1, "solve_rate": 0.25}]}]
+    })
+    return queries
+
+
+@pytest.fixture
+def client(course_queries):
+    uow = MagicMock()
+    uow.__aenter__ = AsyncMock(return_value=uow)
+    uow.__aexit__ = AsyncMock(return_value=False)
+
+    class TestProvider(Provider):
+        scope = Scope.REQUEST
+
+        @provide
+        def teacher_id(self) -> AuthenticatedTeacherId:
+            return AuthenticatedTeacherId(1)
+
+        @provide
+        def update_problems(self) -> ShowTeacherCourseToUpdateProblems:
+            return ShowTeacherCourseToUpdateProblems(uow, course_queries)
+
+        @provide
+        def manage_problems(self) -> ShowTeacherCourseToManageProblems:
+            return ShowTeacherCourseToManageProblems(uow, course_queries)
+
+    app = FastAPI()
+    app.include_router(teacher_router)
+    container = make_async_container(TestProvider(), FastapiProvider())
+    setup_dishka(container, app)
+    with TestClient(app) as client:
+        yield client
+
+
+def test_course_to_update_problems(client, course_queries):
+    """
+    Курс для редактирования задач возвращается с id модулей и описаниями задач
+    """
+    resp = client.get("/teaching/course/1/problems")
+
+    assert resp.status_code == 200
+    assert resp.json()["modules"] == [
+        {"id": 2, "name": "module", "problems": [{"id": 3, "name": "p1", "description": "desc"}]}
+    ]
+    course_queries.get_course_problems.assert_called_once_with(1)
+
+
+def test_course_to_manage_problems(client, course_queries):
+    """
+    Курс для управления задачами возвращается с прогрессом студентов по задачам
+    """
+    resp = client.get("/teaching/course/1/manage/problems")
+
+    assert resp.status_code == 200
+    assert resp.json()["students_count"] == 4
+    assert resp.json()["modules"][0]["problems"][0]["solve_rate"] == 0.25
+    course_queries.get_course_problems_progress.assert_called_once_with(1)
@@ -0,0 +1,136 @@
+import io
+import json
+import tarfile
+import zipfile
+
+import pytest
+
+from src.interfaces.http.uploads import read_test_cases, InvalidUploadError
+
+
+MAX_SIZE = 1024 * 1024
+
+
+async def stream(data: bytes, chunk_size: int = 7):
+    for start in range(0, len(data), chunk_size):
+        yield data[start:start + chunk_size]
+
+
+async def collect(content_type: str, data: bytes, max_size: int = MAX_SIZE, max_case_size: int = MAX_SIZE):
+    return [part async for part in read_test_cases(content_type, stream(data), max_size, max_case_size)]
+
+
+def make_zip(files: dict[str, str]) -> bytes:
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as archive:
+        for name, content in files.items():
+            archive.writestr(name, content)
+    return buffer.getvalue()
+
+
+def make_tar(files: dict[str, str]) -> bytes:
+    buffer = io.BytesIO()
+    with tarfile.open(fileobj=buffer, mode="w:gz") as archive:
+        for name, content in files.items():
+            data = content.encode()
+            info = tarfile.TarInfo(name)
+            info.size = len(data)
+            archive.addfile(info, io.BytesIO(data))
+    return buffer.getvalue()
+
+
+@pytest.mark.asyncio
+async def test_ndjson_split_into_chunks():
+    """
+    Строки NDJSON разбираются по мере получения, даже если строка пришла несколькими кусками
+    """
+    data = b"".join(
+        json.dumps({"test_num": num, "input": f"in{num}", "output": f"out{num}"}).encode() + b"\n"
+        for num in range(1, 4)
+    )
+
+    parts = await collect("application/x-ndjson; charset=utf-8", data)
+
+    assert len(parts) == 1
+    assert {num: (case.input, case.output) for num, case in parts[0].items()} == {
+        1: ("in1", "out1"), 2: ("in2", "out2"), 3: ("in3", "out3")
+    }
+
+
+@pytest.mark.asyncio
+async def test_ndjson_invalid_line():
+    """
+    Строка без выходных данных -> InvalidUploadError
+    """
+    with pytest.raises(InvalidUploadError):
+        await collect("application/x-ndjson", b'{"test_num": 1, "input": "a"}\n')
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("num", [b"true", b"false", b'"1"', b"1.5"])
+async def test_ndjson_invalid_test_num(num):
+    """
+    Номер теста не целое число (в том числе true/false) -> InvalidUploadError
+    """
+    with pytest.raises(InvalidUploadError):
+        await collect("application/x-ndjson", b'{"test_num": ' + num + b', "input": "a", "output": "b"}\n')
+
+
+@pytest.mark.asyncio
+async def test_ndjson_case_too_large():
+    """
+    Тест больше допустимого размера отклоняется до получения всей строки
+    """
+    data = json.dumps({"test_num": 1, "input": "a" * 100, "output": "b"}).encode()
+
+    with pytest.raises(InvalidUploadError) as exc:
+        await collect("application/x-ndjson", data, max_case_size=50)
+
+    assert exc.value.status == 413
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("content_type, make_archive", [
+    ("application/zip", make_zip),
+    ("application/gzip", make_tar),
+])
+async def test_archive(content_type, make_archive):
+    """
+    Архив с файлами '<num>.in' и '<num>.out' в любых каталогах, посторонние файлы игнорируются
+    """
+    data = make_archive({"suite/1.in": "a", "suite/1.out": "1", "2.in": "b", "2.out": "2", "README": "text"})
+
+    parts = await collect(content_type, data)
+
+    assert {num: (case.input, case.output) for num, case in parts[0].items()} == {1: ("a", "1"), 2: ("b", "2")}
+
+
+@pytest.mark.asyncio
+async def test_archive_missing_output():
+    """
+    Для теста в архиве нет выходных данных -> InvalidUploadError
+    """
+    with pytest.raises(InvalidUploadError):
+        await collect("application/zip", make_zip({"1.in": "a"}))
+
+
+@pytest.mark.asyncio
+async def test_upload_too_large():
+    """
+    Загрузка больше допустимого размера прерывается со статусом 413
+    """
+    with pytest.raises(InvalidUploadError) as exc:
+        await collect("application/zip", make_zip({"1.in": "a" * 1000, "1.out": "b"}), max_size=100)
+
+    assert exc.value.status == 413
+
+
+@pytest.mark.asyncio
+async def test_unsupported_type():
+    """
+    Неподдерживаемый тип содержимого -> InvalidUploadError со статусом 415
+    """
+    with pytest.raises(InvalidUploadError) as exc:
+        await collect("text/plain", b"1")
+
+    assert exc.value.status == 415
@@ -7,8 +7,14 @@ from src.application.use_cases.auth import (
     AuthenticateUserAsTeacher,
     LoginUser,
     RegisterUserRequest,
-    RegisterUserConfirm
+    RegisterUserConfirm,
+    IssueCourseAccessToken
 )
+from src.application.use_cases.user import ShowMain
+from src.application.use_cases.student import SendProblemSolution, ShowAttemptProgress
+from src.application.use_cases.callback import CodeRunCallbackUseCase
+from src.application.use_cases.teacher import UploadTestCases
+from src.application.use_cases.runner import GetProblemBundle
 
 
 @pytest.fixture
@@ -16,6 +22,7 @@ def mock_uow():
     uow = AsyncMock()
     uow.__aenter__.return_value = uow
     uow.__aexit__.return_value = None
+    uow.save = Mock()
 
     return uow
 
@@ -32,6 +39,21 @@ def mock_auth_service():
     return service
 
 
+@pytest.fixture
+def mock_user_status_cache():
+    cache = Mock()
+    cache.get.return_value = None
+    return cache
+
+
+@pytest.fixture
+def mock_course_access_cache():
+    cache = Mock()
+    cache.get.return_value = None
+    cache.get_claims_version.return_value = 0
+    return cache
+
+
 @pytest.fixture
 def mock_course_repo():
     return AsyncMock()
@@ -39,7 +61,7 @@ def mock_course_repo():
 
 @pytest.fixture
 def mock_password_service():
-    return Mock()
+    return AsyncMock()
 
 
 @pytest.fixture
@@ -52,29 +74,37 @@ def login_user(
     mock_uow,
     mock_user_repo,
     mock_password_service,
-    mock_auth_service
+    mock_auth_service,
+    mock_email_service
 ):
     return LoginUser(
         mock_uow,
         mock_user_repo,
         mock_password_service,
-        mock_auth_service
+        mock_auth_service,
+        mock_email_service,
+        reg_confirm_url="https://example.com/confirm"
     )
 
 
 @pytest.fixture
-def authenticate_user(mock_uow, mock_user_repo, mock_auth_service):
-    return AuthenticateUser(mock_uow, mock_user_repo, mock_auth_service)
+def authenticate_user(mock_uow, mock_user_repo, mock_auth_service, mock_user_status_cache):
+    return AuthenticateUser(mock_uow, mock_user_repo, mock_auth_service, mock_user_status_cache)
 
 
 @pytest.fixture
-def auth_student(mock_uow, mock_course_repo):
-    return AuthenticateUserAsStudent(mock_uow, mock_course_repo)
+def auth_student(mock_uow, mock_course_repo, mock_course_access_cache, mock_auth_service):
+    return AuthenticateUserAsStudent(mock_uow, mock_course_repo, mock_course_access_cache, mock_auth_service)
 
 
 @pytest.fixture
-def auth_teacher(mock_uow, mock_course_repo):
-    return AuthenticateUserAsTeacher(mock_uow, mock_course_repo)
+def auth_teacher(mock_uow, mock_course_repo, mock_course_access_cache, mock_auth_service):
+    return AuthenticateUserAsTeacher(mock_uow, mock_course_repo, mock_course_access_cache, mock_auth_service)
+
+
+@pytest.fixture
+def issue_course_access_token(mock_uow, mock_course_repo, mock_course_access_cache, mock_auth_service):
+    return IssueCourseAccessToken(mock_uow, mock_course_repo, mock_course_access_cache, mock_auth_service)
 
 
 @pytest.fixture
@@ -96,5 +126,156 @@ def register_user_request(
 
 
 @pytest.fixture
-def register_user_confirm(mock_uow, mock_user_repo, mock_auth_service):
-    return RegisterUserConfirm(mock_uow, mock_user_repo, mock_auth_service)
+def register_user_confirm(mock_uow, mock_user_repo, mock_auth_service, mock_user_status_cache):
+    return RegisterUserConfirm(mock_uow, mock_user_repo, mock_auth_service, mock_user_status_cache)
+
+
+@pytest.fixture
+def show_main(mock_uow, mock_course_repo):
+    return ShowMain(mock_uow, mock_course_repo)
+
+
+@pytest.fixture
+def mock_problem_repo():
+    return AsyncMock()
+
+
+@pytest.fixture
+def mock_attempt_repo():
+    return AsyncMock()
+
+
+@pytest.fixture
+def mock_test_case_repo():
+    return AsyncMock()
+
+
+@pytest.fixture
+def mock_submission_repo():
+    return AsyncMock()
+
+
+@pytest.fixture
+def mock_progress_repo():
+    return AsyncMock()
+
+
+@pytest.fixture
+def mock_run_queue():
+    return AsyncMock()
+
+
+@pytest.fixture
+def mock_runner_registry():
+    registry = Mock()
+    registry.supports.return_value = True
+    registry.acquire.return_value = "runlet.runs"
+    return registry
+
+
+@pytest.fixture
+def mock_verdict_cache():
+    cache = Mock()
+    cache.get.return_value = None
+    return cache
+
+
+@pytest.fixture
+def send_problem_solution(
+    mock_uow,
+    mock_problem_repo,
+    mock_attempt_repo,
+    mock_test_case_repo,
+    mock_submission_repo,
+    mock_progress_repo,
+    mock_run_queue,
+    mock_runner_registry,
+    mock_verdict_cache
+):
+    return SendProblemSolution(
+        mock_uow,
+        mock_problem_repo,
+        mock_attempt_repo,
+        mock_test_case_repo,
+        mock_submission_repo,
+        mock_progress_repo,
+        mock_run_queue,
+        mock_runner_registry,
+        mock_verdict_cache
+    )
+
+
+@pytest.fixture
+def code_run_callback(
+    mock_uow,
+    mock_attempt_repo,
+    mock_test_case_repo,
+    mock_submission_repo,
+    mock_progress_repo,
+    mock_runner_registry,
+    mock_verdict_cache,
+    mock_run_queue
+):
+    return CodeRunCallbackUseCase(
+        mock_uow,
+        mock_attempt_repo,
+        mock_test_case_repo,
+        mock_submission_repo,
+        mock_progress_repo,
+        mock_runner_registry,
+        mock_verdict_cache,
+        mock_run_queue
+    )
+
+
+@pytest.fixture
+def fail_fast_code_run_callback(
+    mock_uow,
+    mock_attempt_repo,
+    mock_test_case_repo,
+    mock_submission_repo,
+    mock_progress_repo,
+    mock_runner_registry,
+    mock_verdict_cache,
+    mock_run_queue
+):
+    return CodeRunCallbackUseCase(
+        mock_uow,
+        mock_attempt_repo,
+        mock_test_case_repo,
+        mock_submission_repo,
+        mock_progress_repo,
+        mock_runner_registry,
+        mock_verdict_cache,
+        mock_run_queue,
+        fail_fast=True
+    )
+
+
+@pytest.fixture
+def show_attempt_progress(mock_uow, mock_attempt_repo):
+    return ShowAttemptProgress(mock_uow, mock_attempt_repo)
+
+
+@pytest.fixture
+def mock_bundle_storage():
+    async def build(test_cases):
+        async for _ in test_cases:
+            pass
+        return "bundle-v1"
+
+    storage = AsyncMock()
+    storage.build.side_effect = build
+    storage.locate = Mock(return_value=None)
+    storage.discard = Mock()
+    return storage
+
+
+@pytest.fixture
+def upload_test_cases(mock_uow, mock_problem_repo, mock_test_case_repo, mock_bundle_storage):
+    return UploadTestCases(mock_uow, mock_problem_repo, mock_test_case_repo, mock_bundle_storage)
+
+
+@pytest.fixture
+def get_problem_bundle(mock_uow, mock_problem_repo, mock_test_case_repo, mock_bundle_storage):
+    return GetProblemBundle(mock_uow, mock_problem_repo, mock_test_case_repo, mock_bundle_storage)
@@ -13,7 +13,7 @@ from src.application.use_cases.exceptions import (
     EmailExistsError,
     PasswordsMismatchError
 )
-from src.application.dtos.auth import LoginUserDTO, RegisterUserRequestDTO
+from src.application.dtos.auth import LoginUserDTO, RegisterUserRequestDTO, CourseAccessClaimsDTO
 from src.domain.entities import User, Course
 from src.infrastructure.services.user.exceptions import JWTUnauthorizedError
 
@@ -194,7 +194,67 @@ async def test_authenticate_user_uow_context_usage(
 
 
 @pytest.mark.asyncio
-async def test_successful_student_auth(auth_student, mock_course_repo):
+async def test_authenticate_user_cached_status_skips_db(
+    authenticate_user: AuthenticateUser,
+    mock_uow,
+    mock_auth_service,
+    mock_user_repo,
+    mock_user_status_cache
+):
+    """
+    Закешированный статус пользователя не требует обращения к БД
+    """
+    mock_auth_service.get_user_id_from_token.return_value = 1
+    mock_user_status_cache.get.return_value = True
+
+    result = await authenticate_user.execute("valid_token")
+
+    assert result == 1
+    mock_user_repo.get_by_id.assert_not_called()
+    mock_uow.__aenter__.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_authenticate_user_cached_inactive_status(
+    authenticate_user: AuthenticateUser,
+    mock_auth_service,
+    mock_user_repo,
+    mock_user_status_cache
+):
+    """
+    Закешированный неактивный статус приводит к ошибке без обращения к БД
+    """
+    mock_auth_service.get_user_id_from_token.return_value = 1
+    mock_user_status_cache.get.return_value = False
+
+    with pytest.raises(InactiveUserError):
+        await authenticate_user.execute("valid_token")
+    mock_user_repo.get_by_id.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_authenticate_user_caches_status_after_db_lookup(
+    authenticate_user: AuthenticateUser,
+    mock_auth_service,
+    mock_user_repo,
+    mock_user_status_cache
+):
+    """
+    Статус пользователя сохраняется в кеш после чтения из БД
+    """
+    mock_auth_service.get_user_id_from_token.return_value = 1
+    user = Mock(spec=User)
+    user.id = 1
+    user.is_active = True
+    mock_user_repo.get_by_id.return_value = user
+
+    await authenticate_user.execute("valid_token")
+
+    mock_user_status_cache.set.assert_called_once_with(1, True)
+
+
+@pytest.mark.asyncio
+async def test_successful_student_auth(auth_student, mock_course_repo, mock_course_access_cache):
     """
     Успешная аутентификация студента на курсе
     """
@@ -202,22 +262,19 @@ async def test_successful_student_auth(auth_student, mock_course_repo):
     user_id = 1
     course_id = 100
 
-    # Создаем мок объекта курса
-    course_mock = Mock(spec=Course)
-    mock_course_repo.get_by_id.return_value = course_mock
-    mock_course_repo.check_user_in_course.return_value = True
+    mock_course_repo.get_user_access.return_value = (42, True)
 
     # Act
     result = await auth_student.execute(user_id, course_id)
 
     # Assert
     assert result == user_id
-    mock_course_repo.get_by_id.assert_called_once_with(course_id)
-    mock_course_repo.check_user_in_course.assert_called_once_with(user_id, course_id)
+    mock_course_repo.get_user_access.assert_called_once_with(user_id, course_id)
+    mock_course_access_cache.set.assert_called_once_with(user_id, course_id, (42, True))
 
 
 @pytest.mark.asyncio
-async def test_course_not_found(auth_student, mock_course_repo):
+async def test_course_not_found(auth_student, mock_course_repo, mock_course_access_cache):
     """
     Ошибка: курс не существует
     """
@@ -225,19 +282,19 @@ async def test_course_not_found(auth_student, mock_course_repo):
     user_id = 1
     course_id = 999
 
-    mock_course_repo.get_by_id.return_value = None
+    mock_course_repo.get_user_access.return_value = None
 
     # Act & Assert
     with pytest.raises(UndefinedCourseError) as exc_info:
         await auth_student.execute(user_id, course_id)
 
     assert str(exc_info.value) == "Course does not exist"
-    mock_course_repo.get_by_id.assert_called_once_with(course_id)
-    mock_course_repo.check_user_in_course.assert_not_called()
+    mock_course_repo.get_user_access.assert_called_once_with(user_id, course_id)
+    mock_course_access_cache.set.assert_not_called()
 
 
 @pytest.mark.asyncio
-async def test_user_not_subscribed(auth_student, mock_course_repo):
+async def test_user_not_subscribed(auth_student, mock_course_repo, mock_course_access_cache):
     """
     Ошибка: пользователь не подписан на курс
     """
@@ -245,17 +302,15 @@ async def test_user_not_subscribed(auth_student, mock_course_repo):
     user_id = 1
     course_id = 100
 
-    course_mock = Mock(spec=Course)
-    mock_course_repo.get_by_id.return_value = course_mock
-    mock_course_repo.check_user_in_course.return_value = False
+    mock_course_repo.get_user_access.return_value = (42, False)
 
     # Act & Assert
     with pytest.raises(HasNoAccessError) as exc_info:
         await auth_student.execute(user_id, course_id)
 
     assert str(exc_info.value) == "User not subscribed on course"
-    mock_course_repo.get_by_id.assert_called_once_with(course_id)
-    mock_course_repo.check_user_in_course.assert_called_once_with(user_id, course_id)
+    mock_course_repo.get_user_access.assert_called_once_with(user_id, course_id)
+    mock_course_access_cache.set.assert_not_called()
 
 
 @pytest.mark.asyncio
@@ -267,9 +322,7 @@ async def test_uow_context_used(auth_student, mock_uow, mock_course_repo):
     user_id = 1
     course_id = 100
 
-    course_mock = Mock()
-    mock_course_repo.get_by_id.return_value = course_mock
-    mock_course_repo.check_user_in_course.return_value = True
+    mock_course_repo.get_user_access.return_value = (42, True)
 
     # Act
     await auth_student.execute(user_id, course_id)
@@ -293,23 +346,17 @@ async def test_returns_correct_user_id(auth_student, mock_course_repo):
         (-1, 500),
     ]
 
-    course_mock = Mock()
-    mock_course_repo.get_by_id.return_value = course_mock
-    mock_course_repo.check_user_in_course.return_value = True
-
     for user_id, course_id in test_cases:
         # Reset mock calls for each test case
         mock_course_repo.reset_mock()
-        mock_course_repo.get_by_id.return_value = course_mock
-        mock_course_repo.check_user_in_course.return_value = True
+        mock_course_repo.get_user_access.return_value = (7, True)
 
         # Act
         result = await auth_student.execute(user_id, course_id)
 
         # Assert
         assert result == user_id
-        mock_course_repo.get_by_id.assert_called_once_with(course_id)
-        mock_course_repo.check_user_in_course.assert_called_once_with(user_id, course_id)
+        mock_course_repo.get_user_access.assert_called_once_with(user_id, course_id)
 
 
 @pytest.mark.asyncio
@@ -318,16 +365,14 @@ async def test_exception_status_code_correct(auth_student, mock_course_repo):
     Проверяем, что исключения имеют правильный статус код
     """
     # Тест 1: Курс не найден - статус по умолчанию
-    mock_course_repo.get_by_id.return_value = None
+    mock_course_repo.get_user_access.return_value = None
     with pytest.raises(UndefinedCourseError) as exc_info:
         await auth_student.execute(1, 999)
     assert exc_info.value.status == 400
 
     # Тест 2: Пользователь не подписан - явно указан статус 403
     mock_course_repo.reset_mock()
-    course_mock = Mock()
-    mock_course_repo.get_by_id.return_value = course_mock
-    mock_course_repo.check_user_in_course.return_value = False
+    mock_course_repo.get_user_access.return_value = (42, False)
 
     with pytest.raises(HasNoAccessError) as exc_info:
         await auth_student.execute(1, 100)
@@ -335,36 +380,34 @@ async def test_exception_status_code_correct(auth_student, mock_course_repo):
 
 
 @pytest.mark.asyncio
-async def test_course_object_irrelevant(auth_student, mock_course_repo):
+async def test_student_cached_access_skips_db(auth_student, mock_uow, mock_course_repo, mock_course_access_cache):
     """
-    Проверяем, что содержимое объекта курса не важно - важно только что он не None
+    Закешированный доступ студента не требует обращения к БД
     """
-    # Arrange
-    user_id = 1
-    course_id = 100
+    mock_course_access_cache.get.return_value = (42, True)
 
-    # Разные варианты объектов курса
-    test_courses = [
-        Mock(id=course_id, name="Math"),
-        Mock(),  # Пустой объект
-        Mock(title="Physics"),  # Без id
-        object(),  # Даже простой object
-    ]
+    result = await auth_student.execute(1, 100)
 
-    for course_obj in test_courses:
-        mock_course_repo.reset_mock()
-        mock_course_repo.get_by_id.return_value = course_obj
-        mock_course_repo.check_user_in_course.return_value = True
+    assert result == 1
+    mock_course_repo.get_user_access.assert_not_called()
+    mock_uow.__aenter__.assert_not_called()
 
-        # Act
-        result = await auth_student.execute(user_id, course_id)
 
-        # Assert
-        assert result == user_id
+@pytest.mark.asyncio
+async def test_student_cached_teacher_access_checks_db(auth_student, mock_course_repo, mock_course_access_cache):
+    """
+    Закешированный доступ преподавателя не дает доступа студента без проверки в БД
+    """
+    mock_course_access_cache.get.return_value = (1, False)
+    mock_course_repo.get_user_access.return_value = (1, False)
+
+    with pytest.raises(HasNoAccessError):
+        await auth_student.execute(1, 100)
+    mock_course_repo.get_user_access.assert_called_once_with(1, 100)
 
 
 @pytest.mark.asyncio
-async def test_successful_teacher_auth(auth_teacher, mock_course_repo):
+async def test_successful_teacher_auth(auth_teacher, mock_course_repo, mock_course_access_cache):
     """
     Успешная аутентификация преподавателя курса
     """
@@ -372,17 +415,15 @@ async def test_successful_teacher_auth(auth_teacher, mock_course_repo):
     user_id = 1
     course_id = 100
 
-    # Создаем мок курса с правильным teacher_id
-    course_mock = Mock(spec=Course)
-    course_mock.teacher_id = user_id  # Преподаватель совпадает
-    mock_course_repo.get_by_id.return_value = course_mock
+    mock_course_repo.get_user_access.return_value = (user_id, False)  # Преподаватель совпадает
 
     # Act
     result = await auth_teacher.execute(user_id, course_id)
 
     # Assert
     assert result == user_id
-    mock_course_repo.get_by_id.assert_called_once_with(course_id)
+    mock_course_repo.get_user_access.assert_called_once_with(user_id, course_id)
+    mock_course_access_cache.set.assert_called_once_with(user_id, course_id, (user_id, False))
 
 
 @pytest.mark.asyncio
@@ -394,7 +435,7 @@ async def test_course_not_found(auth_teacher, mock_course_repo):
     user_id = 1
     course_id = 999
 
-    mock_course_repo.get_by_id.return_value = None
+    mock_course_repo.get_user_access.return_value = None
 
     # Act & Assert
     with pytest.raises(UndefinedCourseError) as exc_info:
@@ -402,11 +443,11 @@ async def test_course_not_found(auth_teacher, mock_course_repo):
 
     assert str(exc_info.value) == "Course does not exist"
     assert exc_info.value.status == 400
-    mock_course_repo.get_by_id.assert_called_once_with(course_id)
+    mock_course_repo.get_user_access.assert_called_once_with(user_id, course_id)
 
 
 @pytest.mark.asyncio
-async def test_wrong_teacher_id(auth_teacher, mock_course_repo):
+async def test_wrong_teacher_id(auth_teacher, mock_course_repo, mock_course_access_cache):
     """
     Ошибка: пользователь не является преподавателем курса
     """
@@ -415,9 +456,7 @@ async def test_wrong_teacher_id(auth_teacher, mock_course_repo):
     course_id = 100
     actual_teacher_id = 42  # Другой преподаватель
 
-    course_mock = Mock(spec=Course)
-    course_mock.teacher_id = actual_teacher_id
-    mock_course_repo.get_by_id.return_value = course_mock
+    mock_course_repo.get_user_access.return_value = (actual_teacher_id, True)
 
     # Act & Assert
     with pytest.raises(HasNoAccessError) as exc_info:
@@ -425,7 +464,8 @@ async def test_wrong_teacher_id(auth_teacher, mock_course_repo):
 
     assert str(exc_info.value) == "User cannot manage course"
     assert exc_info.value.status == 403
-    mock_course_repo.get_by_id.assert_called_once_with(course_id)
+    mock_course_repo.get_user_access.assert_called_once_with(user_id, course_id)
+    mock_course_access_cache.set.assert_not_called()
 
 
 @pytest.mark.asyncio
@@ -437,9 +477,7 @@ async def test_uow_context_used(auth_teacher, mock_uow, mock_course_repo):
     user_id = 1
     course_id = 100
 
-    course_mock = Mock()
-    course_mock.teacher_id = user_id
-    mock_course_repo.get_by_id.return_value = course_mock
+    mock_course_repo.get_user_access.return_value = (user_id, False)
 
     # Act
     await auth_teacher.execute(user_id, course_id)
@@ -460,16 +498,14 @@ async def test_teacher_id_comparison(auth_teacher, mock_course_repo):
         (42, 42, True),   # Совпадают - успех
         (0, 0, True),     # Нулевые ID - успех (если такое возможно)
         (-1, -1, True),   # Отрицательные ID - успех
-        (100, 101, False)  # Не совпадают - ошибка
+        (100, 101, False),  # Не совпадают - ошибка
+        (5, None, False)  # Курс без преподавателя - ошибка
     ]
 
     for user_id, course_teacher_id, should_succeed in test_cases:
         # Reset mock для каждого теста
         mock_course_repo.reset_mock()
-
-        course_mock = Mock()
-        course_mock.teacher_id = course_teacher_id
-        mock_course_repo.get_by_id.return_value = course_mock
+        mock_course_repo.get_user_access.return_value = (course_teacher_id, False)
 
         if should_succeed:
             result = await auth_teacher.execute(user_id, 100)
@@ -478,7 +514,7 @@ async def test_teacher_id_comparison(auth_teacher, mock_course_repo):
             with pytest.raises(HasNoAccessError):
                 await auth_teacher.execute(user_id, 100)
 
-        mock_course_repo.get_by_id.assert_called_once_with(100)
+        mock_course_repo.get_user_access.assert_called_once_with(user_id, 100)
 
 
 @pytest.mark.asyncio
@@ -491,9 +527,7 @@ async def test_uow_exits_before_checks(auth_teacher, mock_uow, mock_course_repo)
     user_id = 1
     course_id = 100
 
-    course_mock = Mock(spec=Course)
-    course_mock.teacher_id = user_id
-    mock_course_repo.get_by_id.return_value = course_mock
+    mock_course_repo.get_user_access.return_value = (user_id, False)
 
     # Запоминаем порядок вызовов
     call_order = []
@@ -532,17 +566,28 @@ async def test_returns_same_user_id(auth_teacher, mock_course_repo):
 
     for user_id in test_user_ids:
         mock_course_repo.reset_mock()
-
-        course_mock = Mock()
-        course_mock.teacher_id = user_id
-        mock_course_repo.get_by_id.return_value = course_mock
+        mock_course_repo.get_user_access.return_value = (user_id, False)
 
         # Act
         result = await auth_teacher.execute(user_id, 100)
 
         # Assert
         assert result == user_id
-        mock_course_repo.get_by_id.assert_called_once_with(100)
+        mock_course_repo.get_user_access.assert_called_once_with(user_id, 100)
+
+
+@pytest.mark.asyncio
+async def test_teacher_cached_access_skips_db(auth_teacher, mock_uow, mock_course_repo, mock_course_access_cache):
+    """
+    Закешированный доступ преподавателя не требует обращения к БД
+    """
+    mock_course_access_cache.get.return_value = (1, False)
+
+    result = await auth_teacher.execute(1, 100)
+
+    assert result == 1
+    mock_course_repo.get_user_access.assert_not_called()
+    mock_uow.__aenter__.assert_not_called()
 
 
 @pytest.mark.asyncio
@@ -1151,6 +1196,27 @@ async def test_successful_registration_confirmation(
     mock_uow.__aexit__.assert_called_once()
 
 
+@pytest.mark.asyncio
+async def test_registration_confirmation_invalidates_status_cache(
+    register_user_confirm,
+    mock_user_repo,
+    mock_auth_service,
+    mock_user_status_cache
+):
+    """
+    Подтверждение регистрации сбрасывает закешированный статус пользователя
+    """
+    mock_auth_service.get_user_id_from_token.return_value = 1
+    user_mock = Mock(spec=User)
+    user_mock.id = 1
+    user_mock.is_active = False
+    mock_user_repo.get_by_id.return_value = user_mock
+
+    await register_user_confirm.execute("valid_confirmation_token")
+
+    mock_user_status_cache.invalidate.assert_called_once_with(1)
+
+
 @pytest.mark.asyncio
 async def test_invalid_token_no_user_id(
     register_user_confirm,
@@ -1355,3 +1421,96 @@ async def test_consecutive_activations(
     # Assert
     assert mock_auth_service.get_user_id_from_token.call_count == 3
     assert mock_user_repo.get_by_id.call_count == 3
+
+
+def make_claims(user_id: int = 1, version: int = 3, student_courses=(100,), teacher_courses=()):
+    return CourseAccessClaimsDTO(
+        user_id=user_id,
+        version=version,
+        student_courses=list(student_courses),
+        teacher_courses=list(teacher_courses)
+    )
+
+
+@pytest.mark.asyncio
+async def test_student_claims_skip_db(auth_student, mock_uow, mock_course_repo, mock_auth_service):
+    """
+    Подписанные claims доступа к курсу позволяют аутентифицировать студента без обращения к БД
+    """
+    mock_auth_service.get_course_access_claims.return_value = make_claims()
+
+    result = await auth_student.execute(1, 100, "claims")
+
+    assert result == 1
+    mock_auth_service.get_course_access_claims.assert_called_once_with("claims")
+    mock_course_repo.get_user_access.assert_not_called()
+    mock_uow.__aenter__.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_teacher_claims_skip_db(auth_teacher, mock_course_repo, mock_auth_service):
+    """
+    Claims преподавателя курса не требуют проверки в БД, claims студента не дают прав преподавателя
+    """
+    mock_auth_service.get_course_access_claims.return_value = make_claims(student_courses=(), teacher_courses=(100,))
+
+    assert await auth_teacher.execute(1, 100, "claims") == 1
+    mock_course_repo.get_user_access.assert_not_called()
+
+    mock_auth_service.get_course_access_claims.return_value = make_claims()
+    mock_course_repo.get_user_access.return_value = (42, True)
+    with pytest.raises(HasNoAccessError):
+        await auth_teacher.execute(1, 100, "claims")
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("claims", [
+    make_claims(user_id=2),
+    make_claims(version=2),
+    make_claims(student_courses=(200,)),
+    None
+])
+async def test_student_untrusted_claims_check_db(
+    auth_student,
+    mock_course_repo,
+    mock_course_access_cache,
+    mock_auth_service,
+    claims
+):
+    """
+    Claims другого пользователя, отозванной версии, без курса или невалидные -> доступ проверяется в БД
+    """
+    mock_auth_service.get_course_access_claims.return_value = claims
+    mock_course_access_cache.get_claims_version.return_value = 3
+    mock_course_repo.get_user_access.return_value = (42, False)
+
+    with pytest.raises(HasNoAccessError):
+        await auth_student.execute(1, 100, "claims")
+    mock_course_repo.get_user_access.assert_called_once_with(1, 100)
+
+
+@pytest.mark.asyncio
+async def test_issue_token_not_needed(issue_course_access_token, mock_course_repo, mock_auth_service):
+    """
+    Новый токен не выпускается, если текущие claims содержат курс
+    """
+    mock_auth_service.get_course_access_claims.return_value = make_claims()
+
+    assert await issue_course_access_token.execute(1, 100, "claims") is None
+    mock_course_repo.get_user_courses_access.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_issue_token_with_current_courses(issue_course_access_token, mock_course_repo, mock_auth_service):
+    """
+    Если claims не содержат курс, выпускается токен с текущими курсами и версией доступа пользователя
+    """
+    mock_auth_service.get_course_access_claims.return_value = make_claims(student_courses=(200,))
+    mock_auth_service.generate_course_access_token.return_value = "new-claims"
+    mock_course_repo.get_user_courses_access.return_value = ([100, 200], [300], 4)
+
+    assert await issue_course_access_token.execute(1, 100, "claims") == "new-claims"
+    mock_course_repo.get_user_courses_access.assert_called_once_with(1)
+    mock_auth_service.generate_course_access_token.assert_called_once_with(
+        make_claims(version=4, student_courses=(100, 200), teacher_courses=(300,))
+    )
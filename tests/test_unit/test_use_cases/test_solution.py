@@ -0,0 +1,544 @@
+import pytest
+
+from unittest.mock import ANY
+
+from src.domain.entities import Attempt, AttemptStatus, Problem
+from src.domain.value_objects import TestCase, TestCases
+from src.application.dtos.student import SendProblemSolutionDTO
+from src.application.dtos.callback import CodeRunCallbackDTO
+from src.application.use_cases.student import SendProblemSolution, ShowAttemptProgress, make_solution_hash
+from src.application.use_cases.callback import CodeRunCallbackUseCase
+from src.application.use_cases.exceptions import (
+    UndefinedProblemError,
+    UnsupportedLangError,
+    NoAvailableRunnerError
+)
+
+
+@pytest.fixture
+def problem():
+    problem = Problem(
+        name="p1",
+        description="desc",
+        module_id=1,
+        test_cases=TestCases({1: TestCase("in1", "out1"), 2: TestCase("in2", "out2")})
+    )
+    problem.id = 1
+    return problem
+
+
+@pytest.fixture(autouse=True)
+def stored_test_cases(mock_test_case_repo, problem):
+    """
+    Хранилище тестов отдает тесты задачи по номерам и страницами
+    """
+    suite = problem.test_cases.copy()
+
+    async def get_cases(problem_id, nums, with_output=True):
+        return TestCases.from_trusted_dict({num: suite.get_case(num).to_stored_dict() for num in nums if suite.get_case(num)})
+
+    async def stream(problem_id, page_size=500, with_output=True):
+        nums = sorted(num for num, _ in suite)
+        for start in range(0, len(nums), page_size):
+            yield await get_cases(problem_id, nums[start:start + page_size])
+
+    mock_test_case_repo.get_nums.return_value = sorted(num for num, _ in suite)
+    mock_test_case_repo.get_cases.side_effect = get_cases
+    mock_test_case_repo.stream = stream
+    return suite
+
+
+@pytest.fixture
+def started_attempt(problem):
+    attempt = Attempt(10, problem.id)
+    attempt.problem = problem
+    attempt.start("job-1")
+    attempt.runner = "runlet.runs"
+    return attempt
+
+
+def make_callback(test_num: int, output: str, job_id: str = "job-1"):
+    return CodeRunCallbackDTO(job_id=job_id, user_id=10, problem_id=1, test_num=test_num, output=output)
+
+
+@pytest.mark.asyncio
+async def test_send_solution_enqueues_job(
+    send_problem_solution: SendProblemSolution,
+    mock_problem_repo,
+    mock_attempt_repo,
+    mock_submission_repo,
+    mock_progress_repo,
+    mock_run_queue,
+    mock_runner_registry,
+    problem
+):
+    """
+    Решение записывается в историю, попытка сохраняется без чтения и отправляется раннерам со входными данными тестов.
+    Нагрузка раннеров считается по незавершенным запускам всех экземпляров приложения.
+    Первая попытка студента учитывается в прогрессе курса
+    """
+    mock_problem_repo.get_course_problem.return_value = problem
+    mock_attempt_repo.count_running.return_value = {"runlet.runs": 3}
+
+    job_id = await send_problem_solution.execute(10, 5, 1, SendProblemSolutionDTO(code="print(1)", lang="python"))
+
+    mock_problem_repo.get_course_problem.assert_called_once_with(5, 1)
+    mock_attempt_repo.get.assert_not_called()
+    attempt = mock_attempt_repo.save_started.call_args.args[0]
+    assert attempt.job_id == job_id
+    assert attempt.missing == {1, 2}
+    assert attempt.runner == "runlet.runs"
+    mock_runner_registry.acquire.assert_called_once_with("python", job_id, {"runlet.runs": 3})
+    submission = mock_submission_repo.add.call_args.args[0]
+    assert (submission.job_id, submission.lang, submission.code) == (job_id, "python", "print(1)")
+    assert (submission.status, submission.total, submission.finished_at) == (AttemptStatus.PENDING, 2, None)
+    job, queue = mock_run_queue.enqueue.call_args.args
+    assert job.job_id == job_id
+    assert job.test_cases == {1: "in1", 2: "in2"}
+    assert job.total_tests == 2
+    assert queue == "runlet.runs"
+    mock_progress_repo.add_attempted.assert_called_once_with(1)
+    mock_progress_repo.add_solved.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_send_solution_with_bundle(
+    send_problem_solution: SendProblemSolution,
+    mock_problem_repo,
+    mock_attempt_repo,
+    mock_run_queue,
+    problem
+):
+    """
+    Если бандл тестов собран, задача содержит только решение и ссылку на бандл
+    """
+    problem.attach_bundle("v1")
+    mock_problem_repo.get_course_problem.return_value = problem
+
+    await send_problem_solution.execute(10, 5, 1, SendProblemSolutionDTO(code="print(1)", lang="python"))
+
+    mock_run_queue.enqueue.assert_called_once()
+    job = mock_run_queue.enqueue.call_args.args[0]
+    assert (job.bundle.id, job.bundle.version) == (1, "v1")
+    assert job.test_cases == {}
+    assert job.total_tests == 2
+
+
+@pytest.mark.asyncio
+async def test_send_solution_streams_job_parts(
+    send_problem_solution: SendProblemSolution,
+    mock_problem_repo,
+    mock_attempt_repo,
+    mock_run_queue,
+    mock_runner_registry,
+    problem
+):
+    """
+    Большой набор тестов отправляется раннеру частями одной задачи
+    """
+    mock_problem_repo.get_course_problem.return_value = problem
+    send_problem_solution.job_part_size = 1
+
+    job_id = await send_problem_solution.execute(10, 5, 1, SendProblemSolutionDTO(code="print(1)", lang="python"))
+
+    jobs = [call.args[0] for call in mock_run_queue.enqueue.call_args_list]
+    assert [job.test_cases for job in jobs] == [{1: "in1"}, {2: "in2"}]
+    assert all(job.job_id == job_id and job.total_tests == 2 for job in jobs)
+    mock_runner_registry.acquire.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_send_solution_undefined_problem(
+    send_problem_solution: SendProblemSolution,
+    mock_problem_repo,
+    mock_run_queue,
+    mock_runner_registry
+):
+    """
+    Отправка решения несуществующей задачи -> UndefinedProblemError, раннер не резервируется
+    """
+    mock_problem_repo.get_course_problem.return_value = None
+
+    with pytest.raises(UndefinedProblemError):
+        await send_problem_solution.execute(10, 5, 1, SendProblemSolutionDTO(code="", lang="python"))
+
+    mock_run_queue.enqueue.assert_not_called()
+    mock_runner_registry.acquire.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_send_solution_unsupported_lang(send_problem_solution: SendProblemSolution, mock_runner_registry):
+    """
+    Язык, который не поддерживает ни один раннер -> UnsupportedLangError
+    """
+    mock_runner_registry.supports.return_value = False
+
+    with pytest.raises(UnsupportedLangError):
+        await send_problem_solution.execute(10, 5, 1, SendProblemSolutionDTO(code="", lang="brainfuck"))
+
+    mock_runner_registry.acquire.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_send_solution_no_available_runner(send_problem_solution: SendProblemSolution, mock_runner_registry):
+    """
+    Нет свободного здорового раннера -> NoAvailableRunnerError со статусом 503
+    """
+    mock_runner_registry.acquire.return_value = None
+
+    with pytest.raises(NoAvailableRunnerError) as exc:
+        await send_problem_solution.execute(10, 5, 1, SendProblemSolutionDTO(code="", lang="python"))
+
+    assert exc.value.status == 503
+
+
+@pytest.mark.asyncio
+async def test_send_solution_enqueue_error_marks_runner(
+    send_problem_solution: SendProblemSolution,
+    mock_problem_repo,
+    mock_attempt_repo,
+    mock_run_queue,
+    mock_runner_registry,
+    problem
+):
+    """
+    Ошибка отправки задачи раннеру помечает раннер как нездоровый
+    """
+    mock_problem_repo.get_course_problem.return_value = problem
+    mock_run_queue.enqueue.side_effect = ConnectionError()
+
+    with pytest.raises(ConnectionError):
+        await send_problem_solution.execute(10, 5, 1, SendProblemSolutionDTO(code="", lang="python"))
+
+    mock_runner_registry.fail.assert_called_once_with(mock_runner_registry.acquire.call_args.args[1])
+
+
+@pytest.mark.asyncio
+async def test_send_solution_enqueue_error_aborts_attempt(
+    send_problem_solution: SendProblemSolution,
+    mock_problem_repo,
+    mock_attempt_repo,
+    mock_submission_repo,
+    mock_run_queue,
+    problem
+):
+    """
+    Если задачу не удалось отправить раннеру, уже сохраненные попытка и решение завершаются с ошибкой
+    """
+    mock_problem_repo.get_course_problem.return_value = problem
+    mock_run_queue.enqueue.side_effect = ConnectionError()
+    mock_attempt_repo.get_with_results_for_update.side_effect = (
+        lambda user_id, problem_id: mock_attempt_repo.save_started.call_args.args[0]
+    )
+
+    with pytest.raises(ConnectionError):
+        await send_problem_solution.execute(10, 5, 1, SendProblemSolutionDTO(code="", lang="python"))
+
+    attempt = mock_attempt_repo.save_started.call_args.args[0]
+    mock_attempt_repo.get_with_results_for_update.assert_called_once_with(10, 1)
+    assert attempt.status == AttemptStatus.FAILED
+    assert attempt.passed is False
+    mock_submission_repo.complete.assert_called_once_with(attempt)
+
+
+@pytest.mark.asyncio
+async def test_callback_outdated_job(code_run_callback: CodeRunCallbackUseCase, mock_attempt_repo, started_attempt):
+    """
+    Результат устаревшего запуска игнорируется
+    """
+    mock_attempt_repo.get_with_results_for_update.return_value = started_attempt
+
+    await code_run_callback.execute(10, 1, [make_callback(1, "out1", job_id="job-0")])
+
+    assert started_attempt.test_cases.count == 0
+
+
+@pytest.mark.asyncio
+async def test_callback_skips_unknown_test(
+    code_run_callback: CodeRunCallbackUseCase,
+    mock_attempt_repo,
+    mock_submission_repo,
+    started_attempt
+):
+    """
+    Результат неизвестного теста отбрасывается, остальные результаты пачки сохраняются
+    """
+    mock_attempt_repo.get_with_results_for_update.return_value = started_attempt
+
+    await code_run_callback.execute(10, 1, [make_callback(1, "out1"), make_callback(7, "out7"), make_callback(2, "out2")])
+
+    assert started_attempt.status == AttemptStatus.PASSED
+    assert started_attempt.progress == "2/2"
+    mock_submission_repo.complete.assert_called_once_with(started_attempt)
+
+
+@pytest.mark.asyncio
+async def test_callback_sets_verdict(
+    code_run_callback: CodeRunCallbackUseCase,
+    mock_attempt_repo,
+    mock_runner_registry,
+    mock_verdict_cache,
+    mock_submission_repo,
+    started_attempt
+):
+    """
+    После получения результатов всех тестов попытке выставляется вердикт, вердикт записывается в историю
+    """
+    mock_attempt_repo.get_with_results_for_update.return_value = started_attempt
+
+    await code_run_callback.execute(10, 1, [make_callback(1, "out1")])
+    assert started_attempt.status == AttemptStatus.PENDING
+    assert started_attempt.problem.test_cases.count == 1
+    mock_submission_repo.complete.assert_not_called()
+    await code_run_callback.execute(10, 1, [make_callback(2, "wrong")])
+
+    assert started_attempt.status == AttemptStatus.FAILED
+    assert started_attempt.passed is False
+    mock_runner_registry.complete.assert_called_once_with("job-1", "runlet.runs", ANY)
+    mock_verdict_cache.set.assert_not_called()
+    mock_submission_repo.complete.assert_called_once_with(started_attempt)
+
+
+@pytest.mark.asyncio
+async def test_callback_batch_skips_outdated_results(
+    code_run_callback: CodeRunCallbackUseCase,
+    mock_attempt_repo,
+    started_attempt
+):
+    """
+    Результаты пачки сохраняются за один раз, результаты устаревшего запуска отбрасываются
+    """
+    mock_attempt_repo.get_with_results_for_update.return_value = started_attempt
+
+    await code_run_callback.execute(10, 1, [
+        make_callback(1, "out1", job_id="job-0"),
+        make_callback(1, "out1"),
+        make_callback(2, "out2")
+    ])
+
+    mock_attempt_repo.get_with_results_for_update.assert_called_once_with(10, 1)
+    assert started_attempt.status == AttemptStatus.PASSED
+    assert started_attempt.passed is True
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("first_solve", [True, False])
+async def test_callback_counts_first_solve(
+    code_run_callback: CodeRunCallbackUseCase,
+    mock_attempt_repo,
+    mock_progress_repo,
+    started_attempt,
+    first_solve
+):
+    """
+    В прогрессе курса учитывается только первое решение задачи студентом
+    """
+    mock_attempt_repo.get_with_results_for_update.return_value = started_attempt
+    mock_attempt_repo.mark_solved.return_value = first_solve
+
+    await code_run_callback.execute(10, 1, [make_callback(1, "out1"), make_callback(2, "out2")])
+
+    mock_attempt_repo.mark_solved.assert_called_once_with(10, 1)
+    assert mock_progress_repo.add_solved.called is first_solve
+
+
+@pytest.mark.asyncio
+async def test_callback_failed_not_counted(
+    code_run_callback: CodeRunCallbackUseCase,
+    mock_attempt_repo,
+    mock_progress_repo,
+    started_attempt
+):
+    """
+    Проваленная попытка не учитывается как решение задачи
+    """
+    mock_attempt_repo.get_with_results_for_update.return_value = started_attempt
+
+    await code_run_callback.execute(10, 1, [make_callback(1, "out1"), make_callback(2, "wrong")])
+
+    mock_attempt_repo.mark_solved.assert_not_called()
+    mock_progress_repo.add_solved.assert_not_called()
+
+
+def test_solution_hash_normalizes_code():
+    """
+    Окончания строк не влияют на хеш решения, версия тестов и язык влияют
+    """
+    code = "a = input()\nprint(a)\n"
+
+    assert make_solution_hash(1, 1, "python", code) == make_solution_hash(1, 1, "python", "a = input()\r\nprint(a)\r\n")
+    assert make_solution_hash(1, 1, "python", code) == make_solution_hash(1, 1, "python", "a = input()\rprint(a)\r")
+    assert make_solution_hash(1, 1, "python", code) != make_solution_hash(1, 2, "python", code)
+    assert make_solution_hash(1, 1, "python", code) != make_solution_hash(1, 1, "pypy", code)
+
+
+def test_solution_hash_keeps_whitespace():
+    """
+    Решения, отличающиеся пробелами, получают разные хеши
+    """
+    code = "if True:\n    print('a ')\n"
+
+    assert make_solution_hash(1, 1, "python", code) != make_solution_hash(1, 1, "python", "if True:\n  print('a ')\n")
+    assert make_solution_hash(1, 1, "python", code) != make_solution_hash(1, 1, "python", "if True:\n    print('a ')  \n")
+    assert make_solution_hash(1, 1, "python", code) != make_solution_hash(1, 1, "python", code.strip())
+
+
+@pytest.mark.asyncio
+async def test_send_solution_cached_verdict(
+    send_problem_solution: SendProblemSolution,
+    mock_problem_repo,
+    mock_attempt_repo,
+    mock_run_queue,
+    mock_runner_registry,
+    mock_verdict_cache,
+    mock_progress_repo,
+    problem
+):
+    """
+    Повторно отправленное решение получает вердикт из кеша без отправки раннерам, решение задачи учитывается в прогрессе
+    """
+    mock_problem_repo.get_course_problem.return_value = problem
+    mock_verdict_cache.get.return_value = {}
+
+    job_id = await send_problem_solution.execute(10, 5, 1, SendProblemSolutionDTO(code="print(1)", lang="python"))
+
+    attempt = mock_attempt_repo.save_started.call_args.args[0]
+    mock_verdict_cache.get.assert_called_once_with(make_solution_hash(1, 1, "python", "print(1)"))
+    mock_runner_registry.acquire.assert_not_called()
+    mock_run_queue.enqueue.assert_not_called()
+    assert attempt.job_id == job_id
+    assert attempt.status == AttemptStatus.PASSED
+    mock_attempt_repo.mark_solved.assert_called_once_with(10, 1)
+    mock_progress_repo.add_solved.assert_called_once_with(10, 1)
+
+
+@pytest.mark.asyncio
+async def test_send_solution_cached_failed_verdict(
+    send_problem_solution: SendProblemSolution,
+    mock_problem_repo,
+    mock_attempt_repo,
+    mock_test_case_repo,
+    mock_submission_repo,
+    mock_verdict_cache,
+    problem
+):
+    """
+    Для вердикта из кеша загружаются только проваленные тесты, вердикт сразу записывается в историю
+    """
+    mock_problem_repo.get_course_problem.return_value = problem
+    mock_verdict_cache.get.return_value = {2: None}
+
+    await send_problem_solution.execute(10, 5, 1, SendProblemSolutionDTO(code="print(1)", lang="python"))
+
+    attempt = mock_attempt_repo.save_started.call_args.args[0]
+    submission = mock_submission_repo.add.call_args.args[0]
+    assert (submission.status, submission.passed_count, submission.total) == (AttemptStatus.FAILED, 1, 2)
+    assert submission.finished_at is not None
+    assert list(mock_test_case_repo.get_cases.call_args.args[1]) == [2]
+    assert attempt.status == AttemptStatus.FAILED
+    assert (attempt.passed_count, attempt.mismatched, attempt.progress) == (1, {2}, "1/2")
+    assert attempt.test_cases.get_case(2).input == "in2"
+
+
+@pytest.mark.asyncio
+async def test_callback_caches_complete_results(
+    code_run_callback: CodeRunCallbackUseCase,
+    mock_attempt_repo,
+    mock_verdict_cache,
+    started_attempt
+):
+    """
+    Вердикт полного набора результатов сохраняется в кеш по хешу решения
+    """
+    started_attempt.start("job-1", "hash")
+    mock_attempt_repo.get_with_results_for_update.return_value = started_attempt
+
+    await code_run_callback.execute(10, 1, [make_callback(1, "out1"), make_callback(2, "wrong")])
+
+    mock_verdict_cache.set.assert_called_once_with("hash", {2: None})
+
+
+@pytest.mark.asyncio
+async def test_fail_fast_cancels_job(
+    fail_fast_code_run_callback: CodeRunCallbackUseCase,
+    mock_attempt_repo,
+    mock_run_queue,
+    mock_runner_registry,
+    started_attempt
+):
+    """
+    В режиме fail fast попытка проваливается на первом неверном результате, раннеру отправляется отмена задачи
+    """
+    mock_attempt_repo.get_with_results_for_update.return_value = started_attempt
+
+    await fail_fast_code_run_callback.execute(10, 1, [make_callback(1, "wrong")])
+
+    assert started_attempt.status == AttemptStatus.FAILED
+    mock_runner_registry.complete.assert_called_once_with("job-1", "runlet.runs", ANY)
+    mock_run_queue.cancel.assert_called_once_with("job-1")
+
+
+@pytest.mark.asyncio
+async def test_results_of_finished_attempt_skipped(
+    fail_fast_code_run_callback: CodeRunCallbackUseCase,
+    mock_attempt_repo,
+    mock_run_queue,
+    started_attempt
+):
+    """
+    Результаты, пришедшие после досрочного провала попытки, не сохраняются
+    """
+    mock_attempt_repo.get_with_results_for_update.return_value = started_attempt
+    await fail_fast_code_run_callback.execute(10, 1, [make_callback(1, "wrong")])
+
+    await fail_fast_code_run_callback.execute(10, 1, [make_callback(2, "out2")])
+
+    assert started_attempt.test_cases.get_case(2) is None
+    mock_run_queue.cancel.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_cancel_error_not_raised(
+    fail_fast_code_run_callback: CodeRunCallbackUseCase,
+    mock_attempt_repo,
+    mock_run_queue,
+    started_attempt
+):
+    """
+    Ошибка отправки отмены не мешает сохранению вердикта
+    """
+    mock_attempt_repo.get_with_results_for_update.return_value = started_attempt
+    mock_run_queue.cancel.side_effect = ConnectionError()
+
+    await fail_fast_code_run_callback.execute(10, 1, [make_callback(1, "wrong")])
+
+    assert started_attempt.status == AttemptStatus.FAILED
+
+
+@pytest.mark.asyncio
+async def test_show_attempt_progress(
+    show_attempt_progress: ShowAttemptProgress,
+    mock_attempt_repo,
+    started_attempt
+):
+    """
+    Прогресс попытки возвращается без загрузки тестов задачи
+    """
+    started_attempt.add_result(1, "out1")
+    mock_attempt_repo.get.return_value = started_attempt
+
+    progress = await show_attempt_progress.execute(10, 1)
+
+    assert progress is not None
+    assert (progress.status, progress.passed_count, progress.total, progress.progress) == ("pending", 1, 2, "1/2")
+
+
+def test_callback_digest_without_output():
+    """
+    Результат раннера должен содержать хеш или вывод
+    """
+    with pytest.raises(ValueError):
+        CodeRunCallbackDTO(job_id="job-1", user_id=10, problem_id=1, test_num=1)
+
+    dto = CodeRunCallbackDTO(job_id="job-1", user_id=10, problem_id=1, test_num=1, digest="abc")
+    assert dto.to_result().digest == "abc"
@@ -0,0 +1,70 @@
+import pytest
+
+from src.domain.entities import Course, User, Tag
+from src.application.dtos.teacher import AddStudentsDTO
+from src.application.use_cases.teacher import AddStudents
+
+
+def make_user(id_: int) -> User:
+    user = User(f"user{id_}@example.com", "password")
+    user.id = id_
+    return user
+
+
+@pytest.fixture(autouse=True)
+def mapped_relationships(mocker):
+    """Relationships are class attributes only when tables are mapped"""
+    mocker.patch.object(Course, "_tags", create=True)
+    mocker.patch.object(Course, "_students", create=True)
+    mocker.patch.object(Tag, "students", create=True)
+
+
+@pytest.fixture
+def add_students(mock_uow, mock_course_repo, mock_user_repo, mock_email_service):
+    return AddStudents(mock_uow, mock_course_repo, mock_user_repo, mock_email_service)
+
+
+@pytest.mark.asyncio
+async def test_add_students_notified_by_bulk_email(
+    add_students: AddStudents,
+    mock_course_repo,
+    mock_user_repo,
+    mock_email_service
+):
+    """
+    Новые студенты курса получают одно массовое письмо, уже записанные студенты не уведомляются
+    """
+    course = Course("course", 100)
+    enrolled, first, second = make_user(1), make_user(2), make_user(3)
+    course.students.append(enrolled)
+    mock_course_repo.get_by_id_with_rels.return_value = course
+    mock_user_repo.get_by_ids.return_value = [enrolled, first, second]
+    mock_email_service.send_bulk.return_value = {first.email: None, second.email: "550 No such user"}
+
+    await add_students.execute(5, AddStudentsDTO(student_ids=[1, 2, 3]))
+
+    assert course.students == [enrolled, first, second]
+    mock_email_service.send_bulk.assert_called_once()
+    assert mock_email_service.send_bulk.call_args.args[0] == [first.email, second.email]
+    mock_email_service.send_mail.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_add_enrolled_students_not_notified(
+    add_students: AddStudents,
+    mock_course_repo,
+    mock_user_repo,
+    mock_email_service
+):
+    """
+    Повторное добавление студентов не отправляет писем
+    """
+    course = Course("course", 100)
+    student = make_user(1)
+    course.students.append(student)
+    mock_course_repo.get_by_id_with_rels.return_value = course
+    mock_user_repo.get_by_ids.return_value = [student]
+
+    await add_students.execute(5, AddStudentsDTO(student_ids=[1]))
+
+    mock_email_service.send_bulk.assert_not_called()
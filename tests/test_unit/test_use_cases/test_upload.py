@@ -0,0 +1,179 @@
+import pytest
+
+from src.domain.entities import Problem
+from src.domain.value_objects import TestCase
+from src.domain.value_objects.exceptions import DuplicateTestCaseInput
+from src.application.use_cases.teacher import UploadTestCases
+from src.application.use_cases.runner import GetProblemBundle
+from src.application.use_cases.exceptions import (
+    UndefinedProblemError,
+    ImpossibleOperationError,
+    UndefinedBundleError
+)
+
+
+@pytest.fixture
+def problem():
+    problem = Problem(name="p1", description="desc", module_id=1)
+    problem.id = 1
+    return problem
+
+
+async def parts(*parts_data):
+    for part in parts_data:
+        yield part
+
+
+@pytest.fixture(autouse=True)
+def stored_test_cases(mock_test_case_repo):
+    mock_test_case_repo.stream = lambda problem_id, page_size=500, with_output=True: parts()
+
+
+@pytest.mark.asyncio
+async def test_upload_stores_parts(
+    upload_test_cases: UploadTestCases,
+    mock_problem_repo,
+    mock_test_case_repo,
+    problem
+):
+    """
+    Тесты сохраняются по частям, старый набор удаляется, версия тестов задачи увеличивается
+    """
+    mock_problem_repo.get_course_problem.return_value = problem
+
+    res = await upload_test_cases.execute(5, 1, parts(
+        {1: TestCase("in1", "out1"), 2: TestCase("in2", "out2")},
+        {3: TestCase("in1", "out1"), 4: TestCase("in4", "out4")}
+    ))
+
+    mock_test_case_repo.clear.assert_called_once_with(1)
+    saved = [dict(call.args[1]) for call in mock_test_case_repo.save.call_args_list]
+    assert [sorted(part) for part in saved] == [[1, 2], [4]]
+    assert (res.count, res.test_cases_version) == (3, 2)
+    assert problem.bundle_version == "bundle-v1"
+
+
+@pytest.mark.asyncio
+async def test_upload_invalid_part(upload_test_cases: UploadTestCases, mock_problem_repo, problem):
+    """
+    Конфликт входных данных с тестом из предыдущей части -> DuplicateTestCaseInput, версия не меняется
+    """
+    mock_problem_repo.get_course_problem.return_value = problem
+
+    with pytest.raises(DuplicateTestCaseInput):
+        await upload_test_cases.execute(5, 1, parts({1: TestCase("in1", "out1")}, {2: TestCase("in1", "out2")}))
+
+    assert problem.test_cases_version == 1
+
+
+@pytest.mark.asyncio
+async def test_upload_empty_suite(upload_test_cases: UploadTestCases, mock_problem_repo, problem):
+    """
+    Пустой набор тестов не принимается
+    """
+    mock_problem_repo.get_course_problem.return_value = problem
+
+    with pytest.raises(ImpossibleOperationError):
+        await upload_test_cases.execute(5, 1, parts())
+
+
+@pytest.mark.asyncio
+async def test_upload_undefined_problem(upload_test_cases: UploadTestCases, mock_problem_repo, mock_test_case_repo):
+    """
+    Загрузка тестов несуществующей задачи -> UndefinedProblemError
+    """
+    mock_problem_repo.get_course_problem.return_value = None
+
+    with pytest.raises(UndefinedProblemError):
+        await upload_test_cases.execute(5, 1, parts({1: TestCase("in1", "out1")}))
+
+    mock_test_case_repo.clear.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_upload_read_outside_transaction(
+    upload_test_cases: UploadTestCases,
+    mock_uow,
+    mock_problem_repo,
+    mock_test_case_repo,
+    problem
+):
+    """
+    Загрузка читается и проверяется до открытия транзакции, в которой тесты сохраняются
+    """
+    mock_problem_repo.get_course_problem.return_value = problem
+    opened = []
+    mock_uow.__aenter__.side_effect = lambda: opened.append(True) or mock_uow
+    mock_uow.__aexit__.side_effect = lambda *args: opened.pop() and None
+
+    async def checked_parts():
+        for part in ({1: TestCase("in1", "out1")}, {2: TestCase("in2", "out2")}):
+            assert not opened
+            yield part
+
+    res = await upload_test_cases.execute(5, 1, checked_parts())
+
+    saved = [dict(call.args[1]) for call in mock_test_case_repo.save.call_args_list]
+    assert saved == [{1: TestCase("in1", "out1")}, {2: TestCase("in2", "out2")}]
+    assert res.count == 2
+
+
+@pytest.mark.asyncio
+async def test_upload_bundle_built_after_commit(
+    upload_test_cases: UploadTestCases,
+    mock_uow,
+    mock_problem_repo,
+    mock_bundle_storage,
+    problem
+):
+    """
+    Бандл собирается из сохраненных тестов после коммита набора и не прикрепляется, если набор успели заменить
+    """
+    mock_problem_repo.get_course_problem.return_value = problem
+    committed = []
+    mock_uow.__aexit__.side_effect = lambda *args: committed.append(problem.test_cases_version) and None
+
+    async def build(test_cases):
+        assert committed[-1] == 2
+        problem.replace_test_cases()
+        return "bundle-v1"
+
+    mock_bundle_storage.build.side_effect = build
+
+    await upload_test_cases.execute(5, 1, parts({1: TestCase("in1", "out1")}))
+
+    assert problem.bundle_version is None
+    mock_bundle_storage.discard.assert_called_once_with("bundle-v1")
+
+
+@pytest.mark.asyncio
+async def test_missing_bundle_rebuilt(
+    get_problem_bundle: GetProblemBundle,
+    mock_problem_repo,
+    mock_bundle_storage,
+    problem
+):
+    """
+    Бандл, которого нет в хранилище экземпляра, собирается заново из тестов задачи
+    """
+    mock_problem_repo.get_by_bundle_version.return_value = problem
+    mock_bundle_storage.locate.side_effect = [None, "bundles/bundle-v1.tar.gz"]
+
+    assert await get_problem_bundle.execute("bundle-v1") == "bundles/bundle-v1.tar.gz"
+
+    mock_problem_repo.get_by_bundle_version.assert_called_once_with("bundle-v1")
+    mock_bundle_storage.build.assert_called_once()
+    mock_bundle_storage.discard.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_unknown_bundle(get_problem_bundle: GetProblemBundle, mock_problem_repo, mock_bundle_storage):
+    """
+    Бандл, не прикрепленный ни к одной задаче, не найден
+    """
+    mock_problem_repo.get_by_bundle_version.return_value = None
+
+    with pytest.raises(UndefinedBundleError):
+        await get_problem_bundle.execute("bundle-v2")
+
+    mock_bundle_storage.build.assert_not_called()
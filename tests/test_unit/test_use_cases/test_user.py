@@ -0,0 +1,96 @@
+import pytest
+from unittest.mock import Mock
+
+from src.application.use_cases.user import ShowMain, encode_cursor, decode_cursor
+from src.application.use_cases.exceptions import InvalidCursorError
+
+
+def make_courses(*ids: int):
+    courses = []
+    for id_ in ids:
+        course = Mock()
+        course.id = id_
+        courses.append(course)
+    return courses
+
+
+def test_cursor_roundtrip():
+    """Курсор должен декодироваться в исходный id курса"""
+    assert decode_cursor(encode_cursor(42)) == 42
+
+
+def test_invalid_cursor():
+    """Невалидный курсор должен вызывать ошибку"""
+    with pytest.raises(InvalidCursorError):
+        decode_cursor("not-a-cursor")
+
+
+@pytest.mark.asyncio
+async def test_show_main_page_mode_returns_next_cursor(show_main: ShowMain, mock_course_repo):
+    """
+    Пагинация по номеру страницы возвращает курсор следующей страницы
+    """
+    courses = make_courses(1, 2)
+    mock_course_repo.get_main_page.return_value = ([], [], courses, 5)
+
+    _, _, paginated = await show_main.execute(page=1, size=2)
+
+    mock_course_repo.get_main_page.assert_called_once_with(None, 2, page=1)
+    assert paginated == (courses, 1, 2, 5, encode_cursor(2))
+
+
+@pytest.mark.asyncio
+async def test_show_main_page_mode_last_page(show_main: ShowMain, mock_course_repo):
+    """
+    На последней странице курсор следующей страницы отсутствует
+    """
+    courses = make_courses(5)
+    mock_course_repo.get_main_page.return_value = ([], [], courses, 5)
+
+    _, _, paginated = await show_main.execute(page=3, size=2)
+
+    assert paginated[4] is None
+
+
+@pytest.mark.asyncio
+async def test_show_main_returns_user_courses(show_main: ShowMain, mock_uow, mock_course_repo):
+    """
+    Курсы пользователя и страница каталога получаются одним запросом к репозиторию
+    """
+    as_teacher = make_courses(1)
+    as_student = make_courses(2, 3)
+    mock_course_repo.get_main_page.return_value = (as_teacher, as_student, [], 0)
+
+    teacher_courses, student_courses, _ = await show_main.execute(user_id=7)
+
+    assert teacher_courses == as_teacher
+    assert student_courses == as_student
+    mock_course_repo.get_main_page.assert_called_once_with(7, 10, page=1)
+    mock_uow.__aenter__.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_show_main_cursor_mode(show_main: ShowMain, mock_course_repo):
+    """
+    Пагинация по курсору запрашивает на один курс больше, чтобы определить наличие следующей страницы
+    """
+    courses = make_courses(11, 12, 13)
+    mock_course_repo.get_main_page.return_value = ([], [], courses, 100)
+
+    _, _, paginated = await show_main.execute(size=2, after=encode_cursor(10))
+
+    mock_course_repo.get_main_page.assert_called_once_with(None, 3, after_id=10)
+    assert paginated == (courses[:2], 0, 2, 100, encode_cursor(12))
+
+
+@pytest.mark.asyncio
+async def test_show_main_cursor_mode_last_page(show_main: ShowMain, mock_course_repo):
+    """
+    Если курсов не больше размера страницы, курсор следующей страницы отсутствует
+    """
+    courses = make_courses(11, 12)
+    mock_course_repo.get_main_page.return_value = ([], [], courses, 12)
+
+    _, _, paginated = await show_main.execute(size=2, after=encode_cursor(10))
+
+    assert paginated == (courses, 0, 2, 12, None)